@@ -0,0 +1,39 @@
+"""add hot lookup indexes
+
+Revision ID: 7c2e9a41d5f3
+Revises: 153bdc32d4a8
+Create Date: 2026-10-18 10:12:04.381920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e9a41d5f3'
+down_revision: Union[str, Sequence[str], None] = '153bdc32d4a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # usernames were never unique before this; rename later duplicates
+    # (keeping the oldest account's name) so the unique index can be built
+    op.execute(
+        "UPDATE users SET username = username || '__dup' || CAST(id AS VARCHAR) "
+        "WHERE id NOT IN (SELECT MIN(id) FROM users GROUP BY username)"
+    )
+    # unique index doubles as the username uniqueness constraint (works on SQLite too)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_index(op.f('ix_interview_questions_interview_id'), 'interview_questions', ['interview_id'], unique=False)
+    op.create_index(op.f('ix_answers_session_id'), 'answers', ['session_id'], unique=False)
+    op.create_index(op.f('ix_performance_review_session_id'), 'performance_review', ['session_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_performance_review_session_id'), table_name='performance_review')
+    op.drop_index(op.f('ix_answers_session_id'), table_name='answers')
+    op.drop_index(op.f('ix_interview_questions_interview_id'), table_name='interview_questions')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
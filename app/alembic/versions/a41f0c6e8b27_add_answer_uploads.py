@@ -0,0 +1,46 @@
+"""add answer uploads
+
+Revision ID: a41f0c6e8b27
+Revises: 7c2e9a41d5f3
+Create Date: 2026-10-18 11:02:37.114805
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41f0c6e8b27'
+down_revision: Union[str, Sequence[str], None] = '7c2e9a41d5f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('answer_uploads',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('session_id', sa.Integer(), nullable=True),
+    sa.Column('question_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('object_key', sa.String(), nullable=False),
+    sa.Column('upload_token', sa.String(), nullable=False),
+    sa.Column('total_size', sa.Integer(), nullable=False),
+    sa.Column('chunk_size', sa.Integer(), nullable=False),
+    sa.Column('total_chunks', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('answer_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['answer_id'], ['answers.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['question_id'], ['interview_questions.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['session_id'], ['interview_session.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_answer_uploads_session_id'), 'answer_uploads', ['session_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_answer_uploads_session_id'), table_name='answer_uploads')
+    op.drop_table('answer_uploads')
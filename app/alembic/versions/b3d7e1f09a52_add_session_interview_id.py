@@ -0,0 +1,45 @@
+"""add session interview_id
+
+Revision ID: b3d7e1f09a52
+Revises: f19a7c3d20b4
+Create Date: 2026-10-18 16:02:51.734118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d7e1f09a52'
+down_revision: Union[str, Sequence[str], None] = 'f19a7c3d20b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('interview_session') as batch_op:
+        batch_op.add_column(sa.Column('interview_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_interview_session_interview_id', 'interviews', ['interview_id'], ['id'], ondelete='SET NULL'
+        )
+    # existing sessions: take the interview from whatever they answered
+    # (sessions that never answered anything can't be attributed)
+    op.execute(
+        "UPDATE interview_session SET interview_id = ("
+        "SELECT MIN(q.interview_id) FROM answers a "
+        "JOIN interview_questions q ON q.id = a.question_id "
+        "WHERE a.session_id = interview_session.id) "
+        "WHERE interview_id IS NULL"
+    )
+    op.create_index(op.f('ix_interview_session_interview_id'), 'interview_session', ['interview_id'], unique=False)
+    op.create_index(op.f('ix_answers_question_id'), 'answers', ['question_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_answers_question_id'), table_name='answers')
+    op.drop_index(op.f('ix_interview_session_interview_id'), table_name='interview_session')
+    with op.batch_alter_table('interview_session') as batch_op:
+        batch_op.drop_constraint('fk_interview_session_interview_id', type_='foreignkey')
+        batch_op.drop_column('interview_id')
@@ -0,0 +1,27 @@
+"""add interview version
+
+Revision ID: c5d19e2b7f60
+Revises: a41f0c6e8b27
+Create Date: 2026-10-18 12:21:50.602317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d19e2b7f60'
+down_revision: Union[str, Sequence[str], None] = 'a41f0c6e8b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('interviews', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('interviews') as batch_op:
+        batch_op.drop_column('version')
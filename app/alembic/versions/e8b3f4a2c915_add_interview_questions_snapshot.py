@@ -0,0 +1,28 @@
+"""add interview questions snapshot
+
+Revision ID: e8b3f4a2c915
+Revises: c5d19e2b7f60
+Create Date: 2026-10-18 13:05:12.877431
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b3f4a2c915'
+down_revision: Union[str, Sequence[str], None] = 'c5d19e2b7f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # left NULL for existing rows; built on first read / next question change
+    op.add_column('interviews', sa.Column('questions_snapshot', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('interviews') as batch_op:
+        batch_op.drop_column('questions_snapshot')
@@ -0,0 +1,33 @@
+"""unique review per session
+
+Revision ID: f19a7c3d20b4
+Revises: e8b3f4a2c915
+Create Date: 2026-10-18 14:10:43.218765
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f19a7c3d20b4'
+down_revision: Union[str, Sequence[str], None] = 'e8b3f4a2c915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # webhook retries used to insert duplicates; keep the latest review per session
+    op.execute(
+        "DELETE FROM performance_review WHERE session_id IS NOT NULL AND id NOT IN "
+        "(SELECT MAX(id) FROM performance_review WHERE session_id IS NOT NULL GROUP BY session_id)"
+    )
+    op.drop_index(op.f('ix_performance_review_session_id'), table_name='performance_review')
+    op.create_index(op.f('ix_performance_review_session_id'), 'performance_review', ['session_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_performance_review_session_id'), table_name='performance_review')
+    op.create_index(op.f('ix_performance_review_session_id'), 'performance_review', ['session_id'], unique=False)
@@ -0,0 +1,129 @@
+"""
+Concurrent /login throughput.
+
+In-process (default): runs the app on a throwaway SQLite database and logs in
+with `--concurrency` clients, once with bcrypt run inline on the event loop
+(how an async login behaves without the hashing pool) and once through
+core.security.run_hashing. A /me probe runs alongside to show how long other
+requests wait while logins are in flight.
+
+    python -m benchmarks.login_throughput --requests 200 --concurrency 32
+
+Against a running server (e.g. the commit before and after the change):
+
+    python -m benchmarks.login_throughput --url http://localhost:8000 \\
+        --username bench --password bench
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+import httpx
+
+
+async def _login_storm(client: httpx.AsyncClient, username: str, password: str, total: int, concurrency: int) -> dict:
+    sem = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], {}
+
+    async def one():
+        async with sem:
+            start = time.perf_counter()
+            r = await client.post("/login", data={"username": username, "password": password})
+            latencies.append(time.perf_counter() - start)
+            statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": total,
+        "seconds": round(elapsed, 3),
+        "req_per_s": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(statistics.quantiles(latencies, n=20)[-1] * 1000, 1),
+        "statuses": statuses,
+    }
+
+
+async def _probe(client: httpx.AsyncClient, token: str, stop: asyncio.Event) -> list[float]:
+    """Latency of a cheap authenticated request while logins run."""
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/me", headers={"Authorization": f"Bearer {token}"})
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.01)
+    return latencies
+
+
+async def _run(client, username, password, total, concurrency) -> dict:
+    r = await client.post("/login", data={"username": username, "password": password})
+    r.raise_for_status()
+    token = r.json()["access_token"]
+
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(client, token, stop))
+    result = await _login_storm(client, username, password, total, concurrency)
+    stop.set()
+    probe_latencies = await probe
+    if probe_latencies:
+        result["me_p95_ms"] = round(max(probe_latencies) * 1000 if len(probe_latencies) < 20
+                                    else statistics.quantiles(probe_latencies, n=20)[-1] * 1000, 1)
+    return result
+
+
+async def in_process(total: int, concurrency: int):
+    os.environ.setdefault("SECRET_KEY", "login-benchmark-secret-key-0123456789")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    # measure hashing, not the 503 load shedding
+    os.environ.setdefault("PASSWORD_HASH_QUEUE_LIMIT", str(total + concurrency))
+
+    from main import app
+    from core import security
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        r = await client.post("/register", json={
+            "username": "bench", "password": "bench", "email": "bench@example.com", "userrole": "candidate",
+        })
+        r.raise_for_status()
+
+        offloaded = security.run_hashing
+
+        async def inline(func, *args):
+            return func(*args)
+
+        security.run_hashing = inline
+        try:
+            print("inline bcrypt:   ", await _run(client, "bench", "bench", total, concurrency))
+        finally:
+            security.run_hashing = offloaded
+        print("hashing executor:", await _run(client, "bench", "bench", total, concurrency))
+
+
+async def remote(url: str, username: str, password: str, total: int, concurrency: int):
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        print(url, await _run(client, username, password, total, concurrency))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--url")
+    parser.add_argument("--username", default="bench")
+    parser.add_argument("--password", default="bench")
+    args = parser.parse_args()
+    if args.url:
+        asyncio.run(remote(args.url, args.username, args.password, args.requests, args.concurrency))
+    else:
+        asyncio.run(in_process(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Resume text extraction over a corpus of synthetic PDFs.
+
+Builds PDFs of different page counts, then times each one three ways:
+serial (one process, page by page), through the process pool
+(RESUME_PARSE_WORKERS), and a repeat upload served from the content-hash cache.
+
+    python -m benchmarks.resume_extraction --pages 1 5 20 50 --repeat 3 --workers 4
+"""
+import argparse
+import io
+import os
+import statistics
+import tempfile
+import time
+
+LINE = "Senior backend engineer, Python/FastAPI, Postgres tuning, queue workers #{}"
+
+
+def synthetic_pdf(pages: int, lines_per_page: int = 40) -> bytes:
+    """A minimal text-only PDF; no third-party writer needed."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for p in range(pages):
+        rows = "".join(
+            f"({LINE.format(p * lines_per_page + i)}) Tj T* " for i in range(lines_per_page)
+        )
+        stream = f"BT /F1 10 Tf 14 TL 40 800 Td {rows}ET".encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objects))
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids), pages,
+    )
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for n, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (n, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def _timed(fn, repeat: int) -> tuple[float, str]:
+    times, text = [], ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = fn()
+        times.append(time.perf_counter() - start)
+    return round(statistics.median(times) * 1000, 1), text
+
+
+def run(page_counts: list[int], repeat: int, workers: int):
+    os.environ["RESUME_PARSE_WORKERS"] = str(workers)
+    os.environ.setdefault("RESUME_PARSE_MAX_PAGES", str(max(page_counts)))
+    from services import resume_service
+
+    workdir = tempfile.mkdtemp()
+    print(f"{'pages':>5} {'bytes':>9} {'serial_ms':>10} {'pool_ms':>9} {'cached_ms':>10} {'chars':>7}")
+    for pages in page_counts:
+        path = os.path.join(workdir, f"resume-{pages}.pdf")
+        with open(path, "wb") as fh:
+            fh.write(synthetic_pdf(pages))
+
+        serial_min = resume_service.RESUME_PARSE_PARALLEL_MIN_PAGES
+        resume_service.RESUME_PARSE_PARALLEL_MIN_PAGES = pages + 1
+        try:
+            serial_ms, text = _timed(lambda: resume_service.extract_pdf_text(path), repeat)
+        finally:
+            resume_service.RESUME_PARSE_PARALLEL_MIN_PAGES = serial_min
+
+        resume_service.RESUME_PARSE_PARALLEL_MIN_PAGES = 1
+        try:
+            resume_service.extract_pdf_text(path)  # warm the pool's processes
+            pool_ms, _ = _timed(lambda: resume_service.extract_pdf_text(path), repeat)
+        finally:
+            resume_service.RESUME_PARSE_PARALLEL_MIN_PAGES = serial_min
+
+        def cached():
+            with open(path, "rb") as fh:
+                return resume_service.extract_text(fh, "resume.pdf")
+
+        cached()  # populate
+        cached_ms, _ = _timed(cached, repeat)
+        print(f"{pages:>5} {os.path.getsize(path):>9} {serial_ms:>10} {pool_ms:>9} {cached_ms:>10} {len(text):>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 20, 50])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    args = parser.parse_args()
+    run(args.pages, args.repeat, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, asdict
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from core.cache import TTLCache, get_async_redis, get_sync_redis
+from core.config import AUTH_CACHE_BACKEND, AUTH_CACHE_TTL, AUTH_CACHE_MAX_SIZE
+from database.models import UserRole, Users
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY = "auth:user:{}"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Resolved, session-independent view of an authenticated user."""
+    id: int
+    username: str
+    email: str
+    userrole: UserRole
+
+    @classmethod
+    def from_user(cls, user: Users) -> "Principal":
+        return cls(id=user.id, username=user.username, email=user.email, userrole=user.userrole)
+
+    def to_json(self) -> str:
+        return json.dumps({**asdict(self), "userrole": self.userrole.value})
+
+    @classmethod
+    def from_json(cls, raw: str) -> "Principal":
+        data = json.loads(raw)
+        return cls(**{**data, "userrole": UserRole(data["userrole"])})
+
+
+_local = TTLCache(maxsize=AUTH_CACHE_MAX_SIZE, ttl=AUTH_CACHE_TTL)
+
+
+def _use_redis() -> bool:
+    return AUTH_CACHE_BACKEND == "redis"
+
+
+async def get_principal(username: str) -> Principal | None:
+    if not _use_redis():
+        return _local.get(username)
+    try:
+        raw = await get_async_redis().get(REDIS_KEY.format(username))
+    except Exception:
+        logger.warning("auth cache read failed, falling back to DB", exc_info=True)
+        return None
+    return Principal.from_json(raw) if raw else None
+
+
+async def set_principal(principal: Principal):
+    if not _use_redis():
+        _local.set(principal.username, principal)
+        return
+    try:
+        await get_async_redis().set(REDIS_KEY.format(principal.username), principal.to_json(), ex=int(AUTH_CACHE_TTL))
+    except Exception:
+        logger.warning("auth cache write failed", exc_info=True)
+
+
+def invalidate(username: str):
+    _local.delete(username)
+    if not _use_redis():
+        return
+    key = REDIS_KEY.format(username)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is None:
+        # Celery / scripts: no event loop to block
+        try:
+            get_sync_redis().delete(key)
+        except Exception:
+            logger.warning("auth cache invalidation failed for %s", username, exc_info=True)
+        return
+    task = loop.create_task(_delete_async(key, username))
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+async def _delete_async(key: str, username: str):
+    try:
+        await get_async_redis().delete(key)
+    except Exception:
+        logger.warning("auth cache invalidation failed for %s", username, exc_info=True)
+
+
+# Any role/password/email change (or delete) drops the cached principal,
+# including the old key if the username itself was renamed. Names are
+# collected at flush and invalidated after commit: dropping them at flush
+# would let a concurrent request re-cache the old row before the commit.
+#
+# With the "memory" backend this only clears the committing worker's cache;
+# other workers keep the old principal for up to AUTH_CACHE_TTL. Use "redis"
+# when changes must apply everywhere at once.
+_PENDING_KEY = "auth_cache_invalidate"
+_pending: set[asyncio.Task] = set()
+
+
+@event.listens_for(Users, "after_update")
+@event.listens_for(Users, "after_delete")
+def _collect_changed(mapper, connection, target):
+    state = inspect(target)
+    if state.session is None:
+        return
+    names = state.session.info.setdefault(_PENDING_KEY, set())
+    for name in {target.username, *(state.attrs.username.history.deleted or ())}:
+        if name:
+            names.add(name)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    for name in session.info.pop(_PENDING_KEY, ()):
+        invalidate(name)
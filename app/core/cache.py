@@ -0,0 +1,73 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable
+from core.config import REDIS_URL
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded, thread-safe LRU cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING or item[0] < time.monotonic():
+                if item is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# ------------------------------
+# REDIS CLIENTS (lazy, shared)
+# ------------------------------
+_async_redis = None
+_sync_redis = None
+
+
+def get_async_redis():
+    global _async_redis
+    if _async_redis is None:
+        import redis.asyncio as aioredis
+        _async_redis = aioredis.from_url(REDIS_URL, decode_responses=True)
+    return _async_redis
+
+
+def get_sync_redis():
+    global _sync_redis
+    if _sync_redis is None:
+        import redis
+        _sync_redis = redis.from_url(REDIS_URL, decode_responses=True)
+    return _sync_redis
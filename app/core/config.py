@@ -12,3 +12,161 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app.db")
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", REDIS_URL)
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", REDIS_URL)
+
+ML_SERVICE_URL = os.getenv("ML_SERVICE_URL")
+ML_WEBHOOK_URL = os.getenv("ML_WEBHOOK_URL")  # e.g. https://your-api.com/evaluation/webhook
+ML_TIMEOUT = float(os.getenv("ML_TIMEOUT", 30))
+ML_GENERATE_TIMEOUT = float(os.getenv("ML_GENERATE_TIMEOUT", ML_TIMEOUT))
+ML_EVALUATE_TIMEOUT = float(os.getenv("ML_EVALUATE_TIMEOUT", ML_TIMEOUT))
+ML_MAX_CONNECTIONS = int(os.getenv("ML_MAX_CONNECTIONS", 100))
+ML_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("ML_MAX_KEEPALIVE_CONNECTIONS", 20))
+ML_KEEPALIVE_EXPIRY = float(os.getenv("ML_KEEPALIVE_EXPIRY", 30))
+ML_HTTP2 = os.getenv("ML_HTTP2", "true").lower() == "true"
+ML_MAX_RETRIES = int(os.getenv("ML_MAX_RETRIES", 3))
+ML_RETRY_BACKOFF = float(os.getenv("ML_RETRY_BACKOFF", 0.5))
+
+# "memory" (per worker LRU) or "redis" (shared across workers). User changes
+# invalidate the memory cache only in the worker that made them, so other
+# workers may see the old role/email for up to AUTH_CACHE_TTL seconds.
+AUTH_CACHE_BACKEND = os.getenv("AUTH_CACHE_BACKEND", "memory").lower()
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", 15))
+AUTH_CACHE_MAX_SIZE = int(os.getenv("AUTH_CACHE_MAX_SIZE", 10000))
+
+# bcrypt runs on a dedicated pool; excess waiting hashes get a 503
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", 64))
+
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+MAX_VIDEO_UPLOAD_BYTES = int(os.getenv("MAX_VIDEO_UPLOAD_BYTES", 1024 * 1024 * 1024))
+MAX_RESUME_UPLOAD_BYTES = int(os.getenv("MAX_RESUME_UPLOAD_BYTES", 10 * 1024 * 1024))
+
+# "local" (UPLOAD_DIR) or "s3" (any S3-compatible store, e.g. MinIO via S3_ENDPOINT_URL)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local").lower()
+S3_BUCKET = os.getenv("S3_BUCKET", "interview-uploads")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")
+S3_REGION = os.getenv("S3_REGION")
+S3_ACCESS_KEY_ID = os.getenv("S3_ACCESS_KEY_ID")
+S3_SECRET_ACCESS_KEY = os.getenv("S3_SECRET_ACCESS_KEY")
+PRESIGNED_URL_EXPIRY = int(os.getenv("PRESIGNED_URL_EXPIRY", 900))
+
+# resumable answer uploads (S3 multipart requires parts >= 5 MiB)
+CHUNKED_UPLOAD_DEFAULT_CHUNK_SIZE = int(os.getenv("CHUNKED_UPLOAD_DEFAULT_CHUNK_SIZE", 8 * 1024 * 1024))
+CHUNKED_UPLOAD_MIN_CHUNK_SIZE = int(os.getenv("CHUNKED_UPLOAD_MIN_CHUNK_SIZE", 5 * 1024 * 1024))
+CHUNKED_UPLOAD_MAX_CHUNK_SIZE = int(os.getenv("CHUNKED_UPLOAD_MAX_CHUNK_SIZE", 64 * 1024 * 1024))
+CHUNKED_UPLOAD_EXPIRY = float(os.getenv("CHUNKED_UPLOAD_EXPIRY", 24 * 3600))  # abandoned uploads are swept after this
+
+# resume text extraction
+RESUME_PARSE_MAX_PAGES = int(os.getenv("RESUME_PARSE_MAX_PAGES", 50))
+RESUME_PARSE_TIMEOUT = float(os.getenv("RESUME_PARSE_TIMEOUT", 30))
+RESUME_PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", min(4, os.cpu_count() or 1)))
+RESUME_PARSE_PARALLEL_MIN_PAGES = int(os.getenv("RESUME_PARSE_PARALLEL_MIN_PAGES", 20))
+RESUME_TEXT_CACHE_BACKEND = os.getenv("RESUME_TEXT_CACHE_BACKEND", "memory").lower()
+RESUME_TEXT_CACHE_TTL = float(os.getenv("RESUME_TEXT_CACHE_TTL", 7 * 24 * 3600))
+RESUME_TEXT_CACHE_MAX_SIZE = int(os.getenv("RESUME_TEXT_CACHE_MAX_SIZE", 256))
+
+# question generation cache, keyed by resume + job description + count
+QUESTION_GENERATION_COUNT = int(os.getenv("QUESTION_GENERATION_COUNT", 5))
+QUESTION_CACHE_BACKEND = os.getenv("QUESTION_CACHE_BACKEND", "memory").lower()
+QUESTION_CACHE_TTL = float(os.getenv("QUESTION_CACHE_TTL", 24 * 3600))
+QUESTION_CACHE_MAX_SIZE = int(os.getenv("QUESTION_CACHE_MAX_SIZE", 1024))
+
+BULK_IMPORT_MAX_QUESTIONS = int(os.getenv("BULK_IMPORT_MAX_QUESTIONS", 1000))
+# checked while the body is read, before any JSON/CSV parsing
+BULK_IMPORT_MAX_BYTES = int(os.getenv("BULK_IMPORT_MAX_BYTES", 2 * 1024 * 1024))
+
+QUESTION_PAGE_DEFAULT_LIMIT = int(os.getenv("QUESTION_PAGE_DEFAULT_LIMIT", 50))
+QUESTION_PAGE_MAX_LIMIT = int(os.getenv("QUESTION_PAGE_MAX_LIMIT", 500))
+
+# interview/question read cache. "memory" is per worker, so other workers may
+# serve the previous version for up to INTERVIEW_CACHE_TTL; "redis" is shared.
+INTERVIEW_CACHE_BACKEND = os.getenv("INTERVIEW_CACHE_BACKEND", "memory").lower()
+INTERVIEW_CACHE_TTL = float(os.getenv("INTERVIEW_CACHE_TTL", 30))
+INTERVIEW_CACHE_MAX_SIZE = int(os.getenv("INTERVIEW_CACHE_MAX_SIZE", 10000))
+INTERVIEW_CACHE_MAX_AGE = int(os.getenv("INTERVIEW_CACHE_MAX_AGE", 0))
+
+# batched evaluation dispatch
+EVAL_BATCH_SIZE = int(os.getenv("EVAL_BATCH_SIZE", 25))
+EVAL_BATCH_WINDOW = float(os.getenv("EVAL_BATCH_WINDOW", 5))  # seconds between dispatcher runs
+EVAL_MAX_BATCHES_PER_RUN = int(os.getenv("EVAL_MAX_BATCHES_PER_RUN", 20))
+EVAL_MAX_PENDING = int(os.getenv("EVAL_MAX_PENDING", 20000))
+EVAL_MAX_ATTEMPTS = int(os.getenv("EVAL_MAX_ATTEMPTS", 5))
+EVAL_SLOW_THRESHOLD = float(os.getenv("EVAL_SLOW_THRESHOLD", 10))
+EVAL_FAILURE_COOLDOWN = float(os.getenv("EVAL_FAILURE_COOLDOWN", 30))
+EVAL_JOB_TTL = int(os.getenv("EVAL_JOB_TTL", 24 * 3600))
+
+# evaluation webhook group commits
+REVIEW_WRITER_MAX_BATCH = int(os.getenv("REVIEW_WRITER_MAX_BATCH", 200))
+REVIEW_WRITER_FLUSH_INTERVAL = float(os.getenv("REVIEW_WRITER_FLUSH_INTERVAL", 0.05))
+
+# server-sent events
+EVENTS_HEARTBEAT = float(os.getenv("EVENTS_HEARTBEAT", 15))
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", 100))
+EVENTS_MAX_CHANNELS = int(os.getenv("EVENTS_MAX_CHANNELS", 200))
+EVENTS_SUBSCRIBE_TIMEOUT = float(os.getenv("EVENTS_SUBSCRIBE_TIMEOUT", 5))
+
+TASK_STATUS_CACHE_TTL = float(os.getenv("TASK_STATUS_CACHE_TTL", 60))
+TASK_STATUS_CACHE_MAX_SIZE = int(os.getenv("TASK_STATUS_CACHE_MAX_SIZE", 10000))
+TASK_STATUS_MAX_BATCH = int(os.getenv("TASK_STATUS_MAX_BATCH", 500))
+
+# Celery worker profiles (see services/worker.py). Rate limits use Celery's
+# syntax, e.g. "10/s"; empty means unlimited.
+CELERY_PDF_POOL = os.getenv("CELERY_PDF_POOL", "prefork")
+CELERY_PDF_CONCURRENCY = int(os.getenv("CELERY_PDF_CONCURRENCY", os.cpu_count() or 1))
+CELERY_PDF_PREFETCH = int(os.getenv("CELERY_PDF_PREFETCH", 1))
+CELERY_PDF_TIME_LIMIT = int(os.getenv("CELERY_PDF_TIME_LIMIT", 120))
+CELERY_PDF_RATE_LIMIT = os.getenv("CELERY_PDF_RATE_LIMIT") or None
+CELERY_ML_POOL = os.getenv("CELERY_ML_POOL", "threads")
+CELERY_ML_CONCURRENCY = int(os.getenv("CELERY_ML_CONCURRENCY", 32))
+CELERY_ML_PREFETCH = int(os.getenv("CELERY_ML_PREFETCH", 4))
+CELERY_ML_TIME_LIMIT = int(os.getenv("CELERY_ML_TIME_LIMIT", 300))
+CELERY_ML_RATE_LIMIT = os.getenv("CELERY_ML_RATE_LIMIT") or None
+CELERY_DB_POOL = os.getenv("CELERY_DB_POOL", "threads")
+CELERY_DB_CONCURRENCY = int(os.getenv("CELERY_DB_CONCURRENCY", 4))
+CELERY_DB_PREFETCH = int(os.getenv("CELERY_DB_PREFETCH", 2))
+CELERY_DB_TIME_LIMIT = int(os.getenv("CELERY_DB_TIME_LIMIT", 60))
+CELERY_DB_RATE_LIMIT = os.getenv("CELERY_DB_RATE_LIMIT") or None
+# acks_late tasks whose worker dies are redelivered; past this many deliveries
+# the message is dead-lettered instead (a PDF that kills the parser every time)
+CELERY_MAX_DELIVERIES = int(os.getenv("CELERY_MAX_DELIVERIES", 3))
+
+# Database pools (sync engine for Celery/Alembic, async engine for routes)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 30000))  # 0 disables
+SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", 30))
+SQLITE_WAL = os.getenv("SQLITE_WAL", "true").lower() == "true"
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+
+# Read replica for GET endpoints (async driver URL is derived like the primary's).
+# A user who wrote within READ_YOUR_WRITES_WINDOW seconds reads from the primary,
+# and everyone does while the replica lags by more than REPLICA_MAX_LAG seconds.
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+ASYNC_DATABASE_REPLICA_URL = os.getenv("ASYNC_DATABASE_REPLICA_URL")
+READ_YOUR_WRITES_BACKEND = os.getenv("READ_YOUR_WRITES_BACKEND", "memory").lower()
+READ_YOUR_WRITES_WINDOW = float(os.getenv("READ_YOUR_WRITES_WINDOW", 5))
+REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", 2))
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", 1))
+
+# SQL statements per request: "off", "warn" (log + X-SQL-Queries header) or
+# "raise" (fail the request; meant for test runs). Routes can lower the budget
+# with Depends(query_budget(n)).
+SQL_QUERY_BUDGET_MODE = os.getenv("SQL_QUERY_BUDGET_MODE", "off").lower()
+SQL_QUERY_BUDGET = int(os.getenv("SQL_QUERY_BUDGET", 20))
+
+# Recruiter session-results report (GET /interviews/{id}/results)
+REPORT_CACHE_BACKEND = os.getenv("REPORT_CACHE_BACKEND", "memory").lower()
+REPORT_CACHE_TTL = float(os.getenv("REPORT_CACHE_TTL", 60))
+REPORT_CACHE_MAX_SIZE = int(os.getenv("REPORT_CACHE_MAX_SIZE", 1000))
+REPORT_PAGE_DEFAULT_LIMIT = int(os.getenv("REPORT_PAGE_DEFAULT_LIMIT", 100))
+REPORT_PAGE_MAX_LIMIT = int(os.getenv("REPORT_PAGE_MAX_LIMIT", 1000))
+REPORT_PERCENTILES = [float(p) for p in os.getenv("REPORT_PERCENTILES", "0.25,0.5,0.75,0.9").split(",")]
+
+# Streaming answer/review exports
+EXPORT_YIELD_PER = int(os.getenv("EXPORT_YIELD_PER", 1000))  # rows fetched per cursor round-trip
+EXPORT_CHUNK_BYTES = int(os.getenv("EXPORT_CHUNK_BYTES", 64 * 1024))  # bytes buffered per write
+EXPORT_GZIP_LEVEL = int(os.getenv("EXPORT_GZIP_LEVEL", 6))
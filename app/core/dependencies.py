@@ -1,10 +1,11 @@
 from fastapi import Depends, HTTPException
-from sqlalchemy.orm import Session
-from database.connection import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.connection import get_async_db
 from database.models import Interview
 
-def get_interview_or_404(interview_id: int, db: Session = Depends(get_db)):
-    interview = db.query(Interview).filter(Interview.id == interview_id).first()
+async def get_interview_or_404(interview_id: int, db: AsyncSession = Depends(get_async_db)):
+    interview = await db.scalar(select(Interview).where(Interview.id == interview_id))
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
     return interview
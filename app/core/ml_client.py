@@ -1,10 +1,121 @@
+import asyncio
+import random
 import httpx
 from typing import List, Dict, Any, Optional
+from core.config import (
+    ML_TIMEOUT,
+    ML_GENERATE_TIMEOUT,
+    ML_EVALUATE_TIMEOUT,
+    ML_MAX_CONNECTIONS,
+    ML_MAX_KEEPALIVE_CONNECTIONS,
+    ML_KEEPALIVE_EXPIRY,
+    ML_HTTP2,
+    ML_MAX_RETRIES,
+    ML_RETRY_BACKOFF,
+)
+
+# Errors worth retrying: the request never reached (or never left) the ML service
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout, httpx.RemoteProtocolError)
+
 
 class MLClient:
-    def __init__(self, base_url: str, timeout: int = 30):
+    """
+    Long-lived client for the ML service. One instance is created in the app
+    lifespan and shared by every request, so connections are pooled and kept
+    alive instead of paying a TCP+TLS handshake per call.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = ML_TIMEOUT,
+        generate_timeout: float = ML_GENERATE_TIMEOUT,
+        evaluate_timeout: float = ML_EVALUATE_TIMEOUT,
+        max_connections: int = ML_MAX_CONNECTIONS,
+        max_keepalive_connections: int = ML_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = ML_KEEPALIVE_EXPIRY,
+        http2: bool = ML_HTTP2,
+        max_retries: int = ML_MAX_RETRIES,
+        retry_backoff: float = ML_RETRY_BACKOFF,
+    ):
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
+        self.generate_timeout = generate_timeout
+        self.evaluate_timeout = evaluate_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self._client: httpx.AsyncClient | None = None
+
+        # pool-usage counters
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests_total = 0
+        self.retries_total = 0
+        self.failures_total = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def metrics(self) -> Dict[str, Any]:
+        max_conn = self.limits.max_connections
+        return {
+            "max_connections": max_conn,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "utilization": round(self.in_flight / max_conn, 3) if max_conn else None,
+            "requests_total": self.requests_total,
+            "retries_total": self.retries_total,
+            "failures_total": self.failures_total,
+        }
+
+    def _backoff(self, attempt: int) -> float:
+        # exponential backoff with full jitter
+        return random.uniform(0, self.retry_backoff * (2 ** attempt))
+
+    async def _post(self, path: str, payload: Dict[str, Any], timeout: float) -> Any:
+        attempt = 0
+        while True:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            self.requests_total += 1
+            try:
+                r = await self.client.post(path, json=payload, timeout=timeout)
+                if r.status_code < 500 or attempt >= self.max_retries:
+                    r.raise_for_status()
+                    return r.json()
+            except RETRYABLE_ERRORS:
+                if attempt >= self.max_retries:
+                    self.failures_total += 1
+                    raise
+            except httpx.HTTPError:
+                self.failures_total += 1
+                raise
+            finally:
+                self.in_flight -= 1
+
+            self.retries_total += 1
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
 
     async def generate_resume_questions(
         self,
@@ -26,10 +137,7 @@ class MLClient:
             "job_description": job_description,
             "count": count,
         }
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            r = await client.post(f"{self.base_url}/resume/generate-questions", json=payload)
-            r.raise_for_status()
-            return r.json()
+        return await self._post("/resume/generate-questions", payload, self.generate_timeout)
 
     async def evaluate_session(
         self,
@@ -48,7 +156,18 @@ class MLClient:
             "webhook_url": webhook_url,
             "context": context or {},
         }
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            r = await client.post(f"{self.base_url}/evaluate/session", json=payload)
-            r.raise_for_status()
-            return r.json()
+        return await self._post("/evaluate/session", payload, self.evaluate_timeout)
+
+    async def evaluate_sessions(
+        self,
+        sessions: List[Dict[str, Any]],
+        webhook_url: str,
+    ) -> Dict[str, Any]:
+        """
+        Batch form of evaluate_session:
+        {"sessions": [{"session_id": 1, "answers": [...], "context": {}}, ...]}
+        ML service POSTs one result per session to webhook_url.
+        """
+        payload = {"sessions": sessions, "webhook_url": webhook_url}
+        return await self._post("/evaluate/batch", payload, self.evaluate_timeout)
+
@@ -1,18 +1,24 @@
 from fastapi import Depends, HTTPException, status, APIRouter
 from core.security import get_current_user
+from database.connection import pool_metrics
+from database.replica import replica_status
 
 
 
 router = APIRouter(tags=["Roles in APP"])
 
+def check_role(current_user, allowed_roles: list[str]):
+    """role_required's check, for routes that authenticate on their own session."""
+    if current_user.userrole.value not in allowed_roles:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have access to this resource"
+        )
+    return current_user
+
 def role_required(allowed_roles: list[str]):
     def wrapper(current_user=Depends(get_current_user)):
-        if current_user.userrole.value not in allowed_roles:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You do not have access to this resource"
-            )
-        return current_user
+        return check_role(current_user, allowed_roles)
     return wrapper
 
 @router.post("/job-creater")
@@ -27,4 +33,6 @@ def list_jobs(current_user=Depends(role_required(["candidate"]))):
 def admin_dashboard(current_user=Depends(role_required(["admin"]))):
     return {"message" : f"Welcome Admin {current_user.username}"}
 
-
+@router.get("/admin/db-pool/metrics")
+def db_pool_metrics(current_user=Depends(role_required(["admin"]))):
+    return {**pool_metrics(), "replica_status": replica_status()}
@@ -1,14 +1,26 @@
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 import jwt as pyjwt
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
-from core.config import SECRET_KEY, ACCESS_TOKEN_EXPIRE_MINUTES, ALGORITHM
+from core.config import (
+    SECRET_KEY,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    ALGORITHM,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_QUEUE_LIMIT,
+)
+from core import auth_cache
+from core.auth_cache import Principal
 from schemas.user import TokenData, UserOut, Token, UserCreate
 from datetime import datetime, timedelta, timezone
 from fastapi import HTTPException, status, Depends, APIRouter
 from typing import Annotated
-from database.connection import get_db
+from database.connection import get_async_db, AsyncSessionLocal
+from database.replica import get_read_db, is_replica
 from database.models import UserRole, Users
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(tags=["Authentication and Authorisation"])
 
@@ -26,6 +38,29 @@ def hash_password(plain_password: str):
 def verify_password(plain_password, hashed_password):
     return pwd_cxt.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password, hashed_password):
+    """Returns (valid, new_hash); new_hash is set when CryptContext params changed."""
+    return pwd_cxt.verify_and_update(plain_password, hashed_password)
+
+# bcrypt gets its own small pool so a login spike can't starve the default
+# threadpool; once too many hashes are waiting we shed load with a 503.
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_hash_pending = 0
+
+async def run_hashing(func, *args):
+    global _hash_pending
+    if _hash_pending >= PASSWORD_HASH_QUEUE_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    _hash_pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, func, *args)
+    finally:
+        _hash_pending -= 1
+
 # ------------------------------
 # TOKEN CREATION
 # ------------------------------
@@ -41,7 +76,7 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
 # ------------------------------
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -59,9 +94,18 @@ async def get_current_user(
     except pyjwt.InvalidTokenError:
         raise credentials_exception
 
-    user = db.query(Users).filter(Users.username == token_data.username).first()
-    if not user:
-        raise credentials_exception
+    # cached principal avoids a users lookup on every authenticated request
+    user = await auth_cache.get_principal(token_data.username)
+    if user is None:
+        db_user = await db.scalar(select(Users).where(Users.username == token_data.username))
+        if not db_user and is_replica(db):
+            # just registered and not replicated yet
+            async with AsyncSessionLocal() as primary:
+                db_user = await primary.scalar(select(Users).where(Users.username == token_data.username))
+        if not db_user:
+            raise credentials_exception
+        user = Principal.from_user(db_user)
+        await auth_cache.set_principal(user)
 
     # Enum comparison fix
     if user.userrole.value != role:
@@ -73,12 +117,21 @@ async def get_current_user(
 # LOGIN ROUTE
 # ------------------------------
 @router.post("/login", response_model=Token)
-def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    db_user = db.query(Users).filter(Users.username == form_data.username).first()
+async def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    db_user = await db.scalar(select(Users).where(Users.username == form_data.username))
 
-    if not db_user or not verify_password(form_data.password, db_user.password_hash):
+    if not db_user:
         raise HTTPException(status_code=401, detail="Invalid username or password")
 
+    valid, new_hash = await run_hashing(verify_and_update_password, form_data.password, db_user.password_hash)
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid username or password")
+
+    # transparent rehash when the hashing scheme/rounds changed
+    if new_hash:
+        db_user.password_hash = new_hash
+        await db.commit()
+
     access_token = create_access_token(
         data={"sub": db_user.username, "role": db_user.userrole.value},  # Enum fix
         expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -90,32 +143,32 @@ def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = D
 # GET CURRENT LOGGED-IN USER
 # ------------------------------
 @router.get("/me", response_model=UserOut)
-def read_users_me(current_user: Users = Depends(get_current_user)):
+async def read_users_me(current_user: Principal = Depends(get_current_user)):
     return current_user
 
 # ------------------------------
 # REGISTER ROUTE
 # ------------------------------
 @router.post("/register", response_model=UserOut)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
 
-    existing_user = db.query(Users).filter(Users.username == user.username).first()
+    existing_user = await db.scalar(select(Users).where(Users.username == user.username))
     if existing_user:
         raise HTTPException(status_code=400, detail="Username already exists")
 
-    existing_email = db.query(Users).filter(Users.email == user.email).first()
+    existing_email = await db.scalar(select(Users).where(Users.email == user.email))
     if existing_email:
         raise HTTPException(status_code=400, detail="Email already registered")
 
     new_user = Users(
         username=user.username,
         email=user.email,
-        password_hash=hash_password(user.password),
+        password_hash=await run_hashing(hash_password, user.password),
         userrole=UserRole(user.role)  
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
     return new_user
\ No newline at end of file
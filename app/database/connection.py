@@ -1,26 +1,238 @@
-import os
-from sqlalchemy import create_engine
+import threading
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from core.config import (
+    DATABASE_URL,
+    ASYNC_DATABASE_URL as ASYNC_DATABASE_URL_OVERRIDE,
+    DATABASE_REPLICA_URL,
+    ASYNC_DATABASE_REPLICA_URL as ASYNC_DATABASE_REPLICA_URL_OVERRIDE,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    DB_STATEMENT_TIMEOUT_MS,
+    SQLITE_BUSY_TIMEOUT,
+    SQLITE_WAL,
+    SQLITE_MMAP_SIZE,
+)
 
 
-load_dotenv()
+class PoolMetrics:
+    """Checkout counters and wait times for one engine's pool."""
 
-DATABASE_URL = os.getenv("DATABASE_URL")
-is_sqlite = DATABASE_URL.startswith("sqlite")
-connect_args = {"check_same_thread": False} if is_sqlite else {}
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
 
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def checked_out(self):
+        with self._lock:
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+
+    def checked_in(self):
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+    def connected(self):
+        with self._lock:
+            self.connects += 1
+
+    def snapshot(self, pool=None) -> dict:
+        with self._lock:
+            data = {
+                "name": self.name,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "in_use": self.in_use,
+                "max_in_use": self.max_in_use,
+                "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+        if isinstance(pool, QueuePool):
+            data.update(size=pool.size(), checked_out=pool.checkedout(), overflow=pool.overflow())
+        return data
+
+
+class _MeteredPoolMixin:
+    """Time how long callers wait for a connection (the queue + connect)."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return conn
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class MeteredQueuePool(_MeteredPoolMixin, QueuePool):
+    pass
+
+
+class MeteredAsyncQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def to_async_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its async driver (aiosqlite / asyncpg)."""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    return url
+
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def _connect_args(url) -> dict:
+    backend, driver = url.get_backend_name(), url.get_driver_name()
+    if backend == "sqlite":
+        return {"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT}
+    if backend == "postgresql" and DB_STATEMENT_TIMEOUT_MS:
+        if driver == "asyncpg":
+            return {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+        return {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    if backend == "mysql" and DB_STATEMENT_TIMEOUT_MS:
+        return {"init_command": f"SET SESSION max_execution_time={DB_STATEMENT_TIMEOUT_MS}"}
+    return {}
+
+
+def _set_sqlite_pragmas(dbapi_conn, _record):
+    cursor = dbapi_conn.cursor()
+    try:
+        if SQLITE_WAL:
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA busy_timeout={int(SQLITE_BUSY_TIMEOUT * 1000)}")
+    finally:
+        cursor.close()
+
+
+def build_engine(url: str, *, is_async: bool = False, name: str | None = None):
+    """
+    Create an engine with the pool settings from core.config, per-backend
+    statement timeouts and SQLite pragmas. The pool's metrics are attached
+    to the sync engine as `pool_metrics` (AsyncEngine has __slots__).
+    """
+    parsed = make_url(url)
+    metrics = PoolMetrics(name or ("async" if is_async else "sync"))
+    kwargs = {"connect_args": _connect_args(parsed), "pool_pre_ping": DB_POOL_PRE_PING}
+
+    # in-memory SQLite lives in a single connection; leave SQLAlchemy's default pool alone
+    if not _is_memory_sqlite(parsed):
+        kwargs.update(
+            poolclass=MeteredAsyncQueuePool if is_async else MeteredQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+
+    eng = create_async_engine(url, **kwargs) if is_async else create_engine(url, **kwargs)
+    sync_eng = eng.sync_engine if is_async else eng
+    sync_eng.pool.metrics = metrics
+
+    if parsed.get_backend_name() == "sqlite":
+        event.listen(sync_eng, "connect", _set_sqlite_pragmas)
+    event.listen(sync_eng, "connect", lambda *_: metrics.connected())
+    event.listen(sync_eng, "checkout", lambda *_: metrics.checked_out())
+    event.listen(sync_eng, "checkin", lambda *_: metrics.checked_in())
+
+    sync_eng.pool_metrics = metrics
+    return eng
+
+
+# Sync engine: used by Celery tasks, Alembic and create_all
+engine = build_engine(DATABASE_URL, name="sync")
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+
+# Async engine: used by every FastAPI route
+ASYNC_DATABASE_URL = ASYNC_DATABASE_URL_OVERRIDE or to_async_url(DATABASE_URL)
+async_engine = build_engine(ASYNC_DATABASE_URL, is_async=True, name="async")
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Optional read replica: only read-only routes use it (see database/replica.py)
+ASYNC_DATABASE_REPLICA_URL = ASYNC_DATABASE_REPLICA_URL_OVERRIDE or (
+    to_async_url(DATABASE_REPLICA_URL) if DATABASE_REPLICA_URL else None
+)
+replica_engine = (
+    build_engine(ASYNC_DATABASE_REPLICA_URL, is_async=True, name="replica")
+    if ASYNC_DATABASE_REPLICA_URL else None
+)
+REPLICA_ENABLED = replica_engine is not None
+
+ReplicaSessionLocal = async_sessionmaker(
+    bind=replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False,
+    info={"replica": True},
+) if REPLICA_ENABLED else None
+
 Base = declarative_base()
 
 
+def _engine_metrics(eng) -> dict:
+    sync_eng = getattr(eng, "sync_engine", eng)
+    return sync_eng.pool_metrics.snapshot(sync_eng.pool)
+
+
+def pool_metrics() -> dict:
+    metrics = {"sync": _engine_metrics(engine), "async": _engine_metrics(async_engine)}
+    if REPLICA_ENABLED:
+        metrics["replica"] = _engine_metrics(replica_engine)
+    return metrics
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,42 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, joinedload
+from database.models import Interview, InterviewQuestions, InterviewSession
+
+# Relationships are lazy by default, so walking them in a serializer costs one
+# query per row. These loader options fetch the common shapes up front:
+# collections with selectinload (one extra IN query per level), many-to-one /
+# one-to-one with joinedload (same query).
+INTERVIEW_WITH_QUESTIONS = (selectinload(Interview.questions),)
+INTERVIEW_WITH_QUESTIONS_AND_ANSWERS = (
+    selectinload(Interview.questions).selectinload(InterviewQuestions.answers),
+)
+SESSION_WITH_ANSWERS_AND_REVIEW = (
+    selectinload(InterviewSession.answers),
+    joinedload(InterviewSession.performance_review),
+)
+
+
+def interviews_with_questions():
+    return select(Interview).options(*INTERVIEW_WITH_QUESTIONS)
+
+
+def sessions_with_answers_and_review():
+    return select(InterviewSession).options(*SESSION_WITH_ANSWERS_AND_REVIEW)
+
+
+async def load_interview_with_questions(db: AsyncSession, interview_id: int) -> Interview | None:
+    return await db.scalar(interviews_with_questions().where(Interview.id == interview_id))
+
+
+async def load_session_detail(db: AsyncSession, session_id: int) -> InterviewSession | None:
+    return await db.scalar(sessions_with_answers_and_review().where(InterviewSession.id == session_id))
+
+
+async def load_sessions_detail(db: AsyncSession, session_ids: list[int]) -> list[InterviewSession]:
+    result = await db.scalars(
+        sessions_with_answers_and_review()
+        .where(InterviewSession.id.in_(session_ids))
+        .order_by(InterviewSession.id)
+    )
+    return list(result.unique())
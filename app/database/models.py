@@ -1,6 +1,6 @@
 from database.connection import Base
 from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 import enum
 
@@ -18,7 +18,7 @@ class UserRole(enum.Enum):
 class Users(Base):
     __tablename__ = 'users'
     id = Column(Integer, primary_key=True, index=True)
-    username = Column(String, nullable=False)
+    username = Column(String, nullable=False, unique=True, index=True)
     email = Column(String, nullable=False, unique=True)
     userrole = Column(Enum(UserRole), default=UserRole.candidate, nullable=False)
     password_hash = Column(String, nullable=False)
@@ -57,10 +57,15 @@ class Interview(Base):
     resume_text = Column(Text, nullable=True)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    version = Column(Integer, default=1, server_default="1", nullable=False)  # bumped on question changes (ETags)
+    questions_snapshot = deferred(Column(Text, nullable=True))  # JSON question set, rebuilt on question changes
 
     # Relationships
     creator = relationship("Users", back_populates="interviews")
-    questions = relationship("InterviewQuestions", back_populates="interview", cascade="all, delete-orphan")
+    questions = relationship(
+        "InterviewQuestions", back_populates="interview", cascade="all, delete-orphan",
+        order_by="InterviewQuestions.id",
+    )
 
 # -------------------------------
 # InterviewQuestions Table
@@ -69,7 +74,7 @@ class InterviewQuestions(Base):
     __tablename__ = "interview_questions"
 
     id = Column(Integer, primary_key=True, index=True)
-    interview_id = Column(Integer, ForeignKey("interviews.id", ondelete="CASCADE"))
+    interview_id = Column(Integer, ForeignKey("interviews.id", ondelete="CASCADE"), index=True)
     question_text = Column(String, nullable=False)
     category = Column(String, nullable=True)
     source = Column(String, default="general")  # "manual" | "general" | "resume"
@@ -88,11 +93,12 @@ class InterviewSession(Base):
     __tablename__ = 'interview_session'
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    interview_id = Column(Integer, ForeignKey("interviews.id", ondelete="SET NULL"), index=True)
     start_time = Column(DateTime, default=datetime.utcnow)
     end_time = Column(DateTime, default=datetime.utcnow)
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    answers = relationship("Answers", back_populates="session", cascade="all, delete-orphan")
+    answers = relationship("Answers", back_populates="session", cascade="all, delete-orphan", order_by="Answers.id")
     user = relationship("Users", back_populates="sessions")
     performance_review = relationship("PerformanceReview", back_populates="session", uselist=False)
 
@@ -102,8 +108,8 @@ class InterviewSession(Base):
 class Answers(Base):
     __tablename__ = 'answers'
     id = Column(Integer, primary_key=True)
-    question_id = Column(Integer, ForeignKey("interview_questions.id", ondelete="CASCADE"))
-    session_id = Column(Integer, ForeignKey("interview_session.id", ondelete="CASCADE"))
+    question_id = Column(Integer, ForeignKey("interview_questions.id", ondelete="CASCADE"), index=True)
+    session_id = Column(Integer, ForeignKey("interview_session.id", ondelete="CASCADE"), index=True)
     answer_text = Column(Text, nullable=True)
     video_path = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -111,13 +117,31 @@ class Answers(Base):
     session = relationship("InterviewSession", back_populates="answers")
     question = relationship("InterviewQuestions", back_populates="answers")
 
+# -------------------------------
+# AnswerUploads Table (resumable chunked video uploads)
+# -------------------------------
+class AnswerUpload(Base):
+    __tablename__ = 'answer_uploads'
+    id = Column(String, primary_key=True)
+    session_id = Column(Integer, ForeignKey("interview_session.id", ondelete="CASCADE"), index=True)
+    question_id = Column(Integer, ForeignKey("interview_questions.id", ondelete="CASCADE"))
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    object_key = Column(String, nullable=False)
+    upload_token = Column(String, nullable=False)  # staging dir (local) or S3 UploadId
+    total_size = Column(Integer, nullable=False)
+    chunk_size = Column(Integer, nullable=False)
+    total_chunks = Column(Integer, nullable=False)
+    status = Column(String, default="pending", nullable=False)  # "pending" | "assembling" | "completed" | "aborted" | "expired"
+    answer_id = Column(Integer, ForeignKey("answers.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
 # -------------------------------
 # PerformanceReview Table
 # -------------------------------
 class PerformanceReview(Base):
     __tablename__ = 'performance_review'
     id = Column(Integer, primary_key=True)
-    session_id = Column(Integer, ForeignKey("interview_session.id"))
+    session_id = Column(Integer, ForeignKey("interview_session.id"), unique=True, index=True)  # one review per session (webhook upserts)
     overall_score = Column(Integer, nullable=False)
     strengths = Column(Text, nullable=True)
     weakness = Column(Text, nullable=True)
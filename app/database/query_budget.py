@@ -0,0 +1,79 @@
+import contextvars
+import logging
+from dataclasses import dataclass
+from sqlalchemy import event
+from core.config import SQL_QUERY_BUDGET, SQL_QUERY_BUDGET_MODE
+
+logger = logging.getLogger(__name__)
+
+# Counts SQL statements per HTTP request so N+1 regressions show up: the
+# middleware opens a counter, a cursor-execute listener on each engine
+# increments it, and routes may tighten their budget with query_budget(n).
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+@dataclass
+class _Counter:
+    path: str
+    budget: int = SQL_QUERY_BUDGET
+    count: int = 0
+
+
+_current: contextvars.ContextVar[_Counter | None] = contextvars.ContextVar("sql_query_counter", default=None)
+
+
+def enabled() -> bool:
+    return SQL_QUERY_BUDGET_MODE in ("warn", "raise")
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _current.get()
+    if counter is None:
+        return
+    counter.count += 1
+    if counter.count > counter.budget and SQL_QUERY_BUDGET_MODE == "raise":
+        raise QueryBudgetExceeded(
+            f"{counter.path} ran {counter.count} SQL statements (budget {counter.budget}): {statement[:200]}"
+        )
+
+
+def install(*engines):
+    for eng in engines:
+        if eng is not None:
+            event.listen(getattr(eng, "sync_engine", eng), "before_cursor_execute", _count_statement)
+
+
+def query_budget(limit: int):
+    """Route dependency: Depends(query_budget(3)) caps that route at 3 statements."""
+    def dependency():
+        counter = _current.get()
+        if counter is not None:
+            counter.budget = limit
+    return dependency
+
+
+class QueryBudgetMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        counter = _Counter(path=f'{scope["method"]} {scope["path"]}')
+        token = _current.set(counter)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = [*message["headers"], (b"x-sql-queries", str(counter.count).encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            if counter.count > counter.budget:
+                logger.warning("%s ran %d SQL statements (budget %d)", counter.path, counter.count, counter.budget)
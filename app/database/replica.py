@@ -0,0 +1,166 @@
+import logging
+import math
+import time
+import jwt as pyjwt
+from fastapi import Depends, Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.cache import TTLCache, get_async_redis
+from core.config import (
+    SECRET_KEY,
+    ALGORITHM,
+    READ_YOUR_WRITES_BACKEND,
+    READ_YOUR_WRITES_WINDOW,
+    REPLICA_MAX_LAG,
+    REPLICA_LAG_CHECK_INTERVAL,
+)
+from database.connection import AsyncSessionLocal, ReplicaSessionLocal, REPLICA_ENABLED, replica_engine, get_async_db
+
+logger = logging.getLogger(__name__)
+
+# Read-only routes take get_read_db instead of get_async_db. They read from the
+# replica unless the caller wrote within READ_YOUR_WRITES_WINDOW (sticky to the
+# primary, so they see their own changes) or the replica is lagging/unreachable.
+# On the primary, get_read_db hands back the request's get_async_db session, so
+# get_current_user's lookup never checks out a second pooled connection.
+STICKY_KEY = "db:sticky:{}"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+_sticky = TTLCache(maxsize=100000, ttl=READ_YOUR_WRITES_WINDOW)
+_lag_state = {"checked_at": 0.0, "healthy": True, "lag": None}
+
+# Postgres standby lag; 0 when the standby has replayed everything it received
+# (an idle primary would otherwise look like growing lag). NULL on a non-standby.
+PG_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+def _use_redis() -> bool:
+    return READ_YOUR_WRITES_BACKEND == "redis"
+
+
+def _request_user(request: Request) -> str | None:
+    """Username from the bearer token, or None for anonymous/invalid tokens."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return pyjwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+    except pyjwt.InvalidTokenError:
+        return None
+
+
+# ------------------------------
+# READ-YOUR-WRITES
+# ------------------------------
+async def mark_write(user: str):
+    if not _use_redis():
+        _sticky.set(user, True)
+        return
+    try:
+        await get_async_redis().set(STICKY_KEY.format(user), 1, px=math.ceil(READ_YOUR_WRITES_WINDOW * 1000))
+    except Exception:
+        # can't record it; keep at least this worker consistent
+        logger.warning("read-your-writes marker failed for %s", user, exc_info=True)
+        _sticky.set(user, True)
+
+
+async def wrote_recently(user: str) -> bool:
+    if _sticky.get(user):
+        return True
+    if not _use_redis():
+        return False
+    try:
+        return bool(await get_async_redis().exists(STICKY_KEY.format(user)))
+    except Exception:
+        logger.warning("read-your-writes lookup failed for %s", user, exc_info=True)
+        return True
+
+
+# ------------------------------
+# REPLICA HEALTH
+# ------------------------------
+async def _measure_lag() -> float | None:
+    async with replica_engine.connect() as conn:
+        if replica_engine.dialect.name == "postgresql":
+            lag = await conn.scalar(PG_LAG_SQL)
+            return float(lag) if lag is not None else None
+        # no replication metadata (e.g. two local SQLite files): liveness only
+        await conn.execute(text("SELECT 1"))
+        return None
+
+
+async def replica_healthy() -> bool:
+    """Lag check, run at most once per REPLICA_LAG_CHECK_INTERVAL per worker."""
+    now = time.monotonic()
+    if now - _lag_state["checked_at"] < REPLICA_LAG_CHECK_INTERVAL:
+        return _lag_state["healthy"]
+    _lag_state["checked_at"] = now
+    try:
+        lag = await _measure_lag()
+        healthy = lag is None or lag <= REPLICA_MAX_LAG
+    except Exception:
+        logger.warning("replica lag check failed", exc_info=True)
+        lag, healthy = None, False
+    if healthy != _lag_state["healthy"]:
+        logger.warning("replica %s (lag=%s)", "back in rotation" if healthy else "lagging, reading from primary", lag)
+    _lag_state.update(healthy=healthy, lag=lag)
+    return healthy
+
+
+def replica_status() -> dict:
+    return {"enabled": REPLICA_ENABLED, "healthy": _lag_state["healthy"], "lag": _lag_state["lag"]}
+
+
+# ------------------------------
+# DEPENDENCY
+# ------------------------------
+async def read_session_factory(request: Request):
+    """Session factory for this request's reads; for work that outlives the dependency (streaming)."""
+    use_replica = REPLICA_ENABLED
+    if use_replica:
+        user = _request_user(request)
+        use_replica = not (user and await wrote_recently(user)) and await replica_healthy()
+    return ReplicaSessionLocal if use_replica else AsyncSessionLocal
+
+
+async def get_read_db(request: Request, primary: AsyncSession = Depends(get_async_db)):
+    """
+    Replica session, or - without a replica, or while this caller must read
+    the primary - the request's get_async_db session itself, so a route and
+    get_current_user share one session (and one pooled connection).
+    """
+    factory = await read_session_factory(request)
+    if factory is AsyncSessionLocal:
+        yield primary
+        return
+    async with factory() as db:
+        yield db
+
+
+def is_replica(db) -> bool:
+    return bool(db.info.get("replica"))
+
+
+class ReadYourWritesMiddleware:
+    """Marks the caller sticky to the primary after any successful write request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if not REPLICA_ENABLED or scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            return await self.app(scope, receive, send)
+        user = _request_user(Request(scope))
+        if user is None:
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message):
+            # routes commit before responding, so mark as the response starts
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                await mark_write(user)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,13 +1,33 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from core import security, roles
-from database.connection import Base, engine
-from routes import interview, question, sessions, answers, evaluation
+from database.connection import Base, engine, async_engine, replica_engine
+from database.replica import ReadYourWritesMiddleware
+from database import query_budget
+from routes import interview, question, sessions, answers, evaluation, events
 from services import tasks
+from services.review_writer import review_writer
+from services.events import hub
 
 
 Base.metadata.create_all(bind=engine)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await review_writer.flush()
+    await hub.close()
+    await async_engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(ReadYourWritesMiddleware)
+if query_budget.enabled():
+    query_budget.install(engine, async_engine, replica_engine)
+    app.add_middleware(query_budget.QueryBudgetMiddleware)
 
 app.include_router(security.router)
 app.include_router(roles.router)
@@ -17,5 +37,6 @@ app.include_router(sessions.router)
 app.include_router(answers.router)
 app.include_router(evaluation.router)
 app.include_router(tasks.router)
+app.include_router(events.router)
 
 
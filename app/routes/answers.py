@@ -1,33 +1,95 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from database.connection import get_db
-from database.models import Answers, InterviewSession, InterviewQuestions
+import math
+import uuid
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from database.connection import get_async_db
+from database.models import Answers, AnswerUpload, InterviewSession, InterviewQuestions
+from schemas.response import UploadUrlRequest, ChunkedUploadCreate, ChunkedUploadComplete, ChunkedUploadOut
 from core.roles import role_required
+from core.config import (
+    MAX_VIDEO_UPLOAD_BYTES,
+    PRESIGNED_URL_EXPIRY,
+    CHUNKED_UPLOAD_DEFAULT_CHUNK_SIZE,
+    CHUNKED_UPLOAD_MIN_CHUNK_SIZE,
+    CHUNKED_UPLOAD_MAX_CHUNK_SIZE,
+)
 from datetime import datetime
 from services import storage
 
 router = APIRouter(prefix="/answers", tags=["Answers"])
 
+
+def _video_subdir(session_id: int) -> str:
+    return f"answers/{session_id}"
+
+
+async def _get_own_session(db: AsyncSession, session_id: int, current_user) -> InterviewSession:
+    sess = await db.scalar(select(InterviewSession).where(InterviewSession.id == session_id))
+    if not sess:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if sess.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not your session")
+    return sess
+
+
+@router.post("/upload-url")
+async def create_upload_url(
+    payload: UploadUrlRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(role_required(["candidate"])),
+):
+    """
+    Hand out a presigned POST so the video goes straight to the object store.
+    Send `fields` plus the file as multipart/form-data to `upload_url`; the
+    policy rejects bodies over MAX_VIDEO_UPLOAD_BYTES.
+    """
+    await _get_own_session(db, payload.session_id, current_user)
+
+    key = storage.build_key(payload.filename, subdir=_video_subdir(payload.session_id))
+    post = storage.get_storage().presigned_post(key, MAX_VIDEO_UPLOAD_BYTES, content_type=payload.content_type)
+    return {
+        "key": key,
+        "upload_url": post["url"],
+        "fields": post["fields"],
+        "method": "POST",
+        "max_bytes": MAX_VIDEO_UPLOAD_BYTES,
+        "expires_in": PRESIGNED_URL_EXPIRY,
+    }
+
+
 @router.post("/")
-def submit_answer(
+async def submit_answer(
     session_id: int = Form(...),
     question_id: int = Form(...),
     answer_text: str | None = Form(None),
     video: UploadFile | None = File(None),
-    db: Session = Depends(get_db),
+    video_key: str | None = Form(None),  # key from /answers/upload-url, once the POST upload is done
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(role_required(["candidate"])),
 ):
-    sess = db.query(InterviewSession).filter(InterviewSession.id == session_id).first()
-    if not sess:
-        raise HTTPException(status_code=404, detail="Session not found")
-    if sess.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not your session")
+    await _get_own_session(db, session_id, current_user)
 
-    q = db.query(InterviewQuestions).filter(InterviewQuestions.id == question_id).first()
+    q = await db.scalar(select(InterviewQuestions).where(InterviewQuestions.id == question_id))
     if not q:
         raise HTTPException(status_code=404, detail="Question not found")
 
-    video_path = storage.save_upload_file(video) if video else None
+    video_path = None
+    if video:
+        stored = await storage.save_upload_file(video, subdir=_video_subdir(session_id), max_bytes=MAX_VIDEO_UPLOAD_BYTES)
+        video_path = stored.key
+    elif video_key:
+        backend = storage.get_storage()
+        if not backend.accepts_client_keys:
+            raise HTTPException(status_code=400, detail="video_key needs STORAGE_BACKEND=s3; upload the file instead")
+        video_key = storage.normalize_key(video_key)
+        if not video_key.startswith(_video_subdir(session_id) + "/"):
+            raise HTTPException(status_code=400, detail="video_key does not belong to this session")
+        if not await run_in_threadpool(backend.exists, video_key):
+            raise HTTPException(status_code=400, detail="Video has not been uploaded yet")
+        video_path = video_key
 
     ans = Answers(
         question_id=question_id,
@@ -37,7 +99,200 @@ def submit_answer(
         created_at=datetime.utcnow()
     )
     db.add(ans)
-    db.commit()
-    db.refresh(ans)
+    await db.commit()
+    await db.refresh(ans)
 
     return {"id": ans.id, "message": "Answer saved"}
+
+
+# ------------------------------
+# RESUMABLE CHUNKED UPLOADS
+# init -> PUT chunk 0..N-1 (any order, retry freely) -> complete
+# ------------------------------
+async def _get_own_upload(db: AsyncSession, upload_id: str, current_user) -> AnswerUpload:
+    upload = await db.scalar(select(AnswerUpload).where(AnswerUpload.id == upload_id))
+    if not upload:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    if upload.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not your upload")
+    return upload
+
+
+def _upload_out(upload: AnswerUpload, parts: dict[int, int]) -> ChunkedUploadOut:
+    return ChunkedUploadOut(
+        upload_id=upload.id,
+        status=upload.status,
+        chunk_size=upload.chunk_size,
+        total_chunks=upload.total_chunks,
+        received_chunks=sorted(parts),
+        received_bytes=sum(parts.values()),
+        answer_id=upload.answer_id,
+    )
+
+
+def _expected_chunk_size(upload: AnswerUpload, index: int) -> int:
+    return min(upload.chunk_size, upload.total_size - index * upload.chunk_size)
+
+
+@router.post("/uploads", response_model=ChunkedUploadOut)
+async def init_chunked_upload(
+    payload: ChunkedUploadCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(role_required(["candidate"])),
+):
+    await _get_own_session(db, payload.session_id, current_user)
+    q = await db.scalar(select(InterviewQuestions).where(InterviewQuestions.id == payload.question_id))
+    if not q:
+        raise HTTPException(status_code=404, detail="Question not found")
+
+    if payload.total_size > MAX_VIDEO_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"File exceeds {MAX_VIDEO_UPLOAD_BYTES} bytes")
+    chunk_size = payload.chunk_size or CHUNKED_UPLOAD_DEFAULT_CHUNK_SIZE
+    if not CHUNKED_UPLOAD_MIN_CHUNK_SIZE <= chunk_size <= CHUNKED_UPLOAD_MAX_CHUNK_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"chunk_size must be between {CHUNKED_UPLOAD_MIN_CHUNK_SIZE} and {CHUNKED_UPLOAD_MAX_CHUNK_SIZE}",
+        )
+
+    key = storage.build_key(payload.filename, subdir=_video_subdir(payload.session_id))
+    upload_token = await run_in_threadpool(storage.get_storage().create_multipart, key)
+    upload = AnswerUpload(
+        id=uuid.uuid4().hex,
+        session_id=payload.session_id,
+        question_id=payload.question_id,
+        user_id=current_user.id,
+        object_key=key,
+        upload_token=upload_token,
+        total_size=payload.total_size,
+        chunk_size=chunk_size,
+        total_chunks=math.ceil(payload.total_size / chunk_size),
+    )
+    db.add(upload)
+    await db.commit()
+    return _upload_out(upload, {})
+
+
+@router.get("/uploads/{upload_id}", response_model=ChunkedUploadOut)
+async def get_chunked_upload(
+    upload_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(role_required(["candidate"])),
+):
+    """Progress for resuming after a disconnect: re-send whatever is missing."""
+    upload = await _get_own_upload(db, upload_id, current_user)
+    parts = {}
+    if upload.status == "pending":
+        parts = await run_in_threadpool(storage.get_storage().list_parts, upload.object_key, upload.upload_token)
+    return _upload_out(upload, parts)
+
+
+@router.put("/uploads/{upload_id}/chunks/{index}")
+async def put_chunk(
+    upload_id: str,
+    index: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(role_required(["candidate"])),
+):
+    """Raw chunk bytes in the request body; re-sending a chunk overwrites it."""
+    upload = await _get_own_upload(db, upload_id, current_user)
+    if upload.status != "pending":
+        raise HTTPException(status_code=409, detail=f"Upload is {upload.status}")
+    if not 0 <= index < upload.total_chunks:
+        raise HTTPException(status_code=400, detail=f"Chunk index must be in [0, {upload.total_chunks})")
+
+    expected = _expected_chunk_size(upload, index)
+    size = await storage.get_storage().write_part(
+        upload.object_key, upload.upload_token, index, request.stream(), max_bytes=expected
+    )
+    if size != expected:
+        raise HTTPException(status_code=400, detail=f"Chunk {index} must be {expected} bytes, got {size}")
+    return {"upload_id": upload.id, "index": index, "size": size}
+
+
+async def _transition(db: AsyncSession, upload: AnswerUpload, from_status: str, to_status: str) -> bool:
+    """Compare-and-set on status, committed immediately; False if another request got there first."""
+    result = await db.execute(
+        update(AnswerUpload)
+        .where(AnswerUpload.id == upload.id, AnswerUpload.status == from_status)
+        .values(status=to_status)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    if result.rowcount != 1:
+        return False
+    # mirror the row without marking the attribute dirty; a later commit
+    # would otherwise flush this value over the next transition
+    set_committed_value(upload, "status", to_status)
+    return True
+
+
+@router.post("/uploads/{upload_id}/complete")
+async def complete_chunked_upload(
+    upload_id: str,
+    payload: ChunkedUploadComplete | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(role_required(["candidate"])),
+):
+    upload = await _get_own_upload(db, upload_id, current_user)
+    if upload.status == "completed":
+        return {"id": upload.answer_id, "message": "Answer saved"}
+    if upload.status != "pending":
+        raise HTTPException(status_code=409, detail=f"Upload is {upload.status}")
+
+    # claim the upload before touching its parts: a concurrent complete may
+    # be assembling them (and removing the staging area) right now
+    if not await _transition(db, upload, "pending", "assembling"):
+        await db.refresh(upload)
+        if upload.status == "completed":
+            return {"id": upload.answer_id, "message": "Answer saved"}
+        raise HTTPException(status_code=409, detail=f"Upload is {upload.status}")
+
+    backend = storage.get_storage()
+    try:
+        parts = await run_in_threadpool(backend.list_parts, upload.object_key, upload.upload_token)
+    except BaseException:
+        await _transition(db, upload, "assembling", "pending")
+        raise
+    missing = [
+        i for i in range(upload.total_chunks)
+        if parts.get(i) != _expected_chunk_size(upload, i)
+    ]
+    if missing:
+        await _transition(db, upload, "assembling", "pending")
+        raise HTTPException(status_code=400, detail={"message": "Missing chunks", "missing": missing[:100]})
+
+    try:
+        await run_in_threadpool(backend.complete_multipart, upload.object_key, upload.upload_token, upload.total_chunks)
+    except BaseException:
+        await _transition(db, upload, "assembling", "pending")
+        raise
+
+    ans = Answers(
+        question_id=upload.question_id,
+        session_id=upload.session_id,
+        answer_text=payload.answer_text if payload else None,
+        video_path=upload.object_key,
+        created_at=datetime.utcnow()
+    )
+    db.add(ans)
+    await db.flush()
+    upload.status = "completed"
+    upload.answer_id = ans.id
+    await db.commit()
+
+    return {"id": ans.id, "message": "Answer saved"}
+
+
+@router.delete("/uploads/{upload_id}")
+async def abort_chunked_upload(
+    upload_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(role_required(["candidate"])),
+):
+    upload = await _get_own_upload(db, upload_id, current_user)
+    if not await _transition(db, upload, "pending", "aborted"):
+        await db.refresh(upload)
+        raise HTTPException(status_code=409, detail=f"Upload is {upload.status}")
+    await run_in_threadpool(storage.get_storage().abort_multipart, upload.object_key, upload.upload_token)
+    return {"message": "Upload aborted"}
@@ -1,67 +1,115 @@
 from fastapi import APIRouter, Depends, HTTPException, Body, Request
-from sqlalchemy.orm import Session
-from database.connection import get_db
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.connection import get_async_db
 from database.models import InterviewSession, Answers, PerformanceReview, UserRole
 from core.roles import role_required
-from core.ml_client import MLClient
-import os
+from schemas.response import EvaluationTriggerBatch, EvaluationResult
+from services.review_writer import review_row, review_writer
+from services import evaluation_dispatcher, events, session_report
 
 router = APIRouter(prefix="/evaluation", tags=["Evaluation"])
 
-@router.post("/trigger/{session_id}")
+@router.post("/trigger/{session_id}", status_code=202)
 async def trigger_evaluation(
     session_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(role_required(["recruiter"])),
 ):
-    sess = db.query(InterviewSession).filter(InterviewSession.id == session_id).first()
+    sess = await db.scalar(select(InterviewSession.id).where(InterviewSession.id == session_id))
     if not sess:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    # collect answers
-    answers = db.query(Answers).filter(Answers.session_id == session_id).all()
-    payload = [
-        {"question_id": a.question_id, "answer_text": a.answer_text, "video_path": a.video_path}
-        for a in answers
-    ]
+    # batched into ML calls by the dispatcher task; poll /evaluation/jobs/{job_id}
+    job = await evaluation_dispatcher.enqueue([session_id])
+    return {"status": "queued", **job}
 
-    ml_url = os.getenv("ML_SERVICE_URL")
-    webhook_url = os.getenv("ML_WEBHOOK_URL")  # e.g. https://your-api.com/evaluation/webhook
-    if not ml_url or not webhook_url:
-        raise HTTPException(status_code=500, detail="ML_SERVICE_URL/ML_WEBHOOK_URL missing")
+@router.post("/trigger", status_code=202)
+async def trigger_evaluations(
+    payload: EvaluationTriggerBatch,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(role_required(["recruiter"])),
+):
+    """Queue a whole cohort at once."""
+    session_ids = list(dict.fromkeys(payload.session_ids))
+    found = set((await db.scalars(
+        select(InterviewSession.id).where(InterviewSession.id.in_(session_ids))
+    )).all())
+    missing = [sid for sid in session_ids if sid not in found]
+    if missing:
+        raise HTTPException(status_code=404, detail={"message": "Sessions not found", "missing": missing})
 
-    client = MLClient(ml_url)
-    try:
-        resp = await client.evaluate_session(session_id, payload, webhook_url=webhook_url)
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=f"ML service error: {e}")
+    job = await evaluation_dispatcher.enqueue(session_ids)
+    return {"status": "queued", **job}
 
-    return {"status": "queued", "ml_response": resp}
+@router.get("/jobs/{job_id}")
+async def evaluation_job_status(
+    job_id: str,
+    current_user=Depends(role_required(["recruiter"])),
+):
+    job = await evaluation_dispatcher.job_status(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/ml-client/metrics")
+async def ml_client_metrics(
+    current_user=Depends(role_required(["admin"])),
+):
+    """MLClient metrics of the dispatcher workers, as each last published them to Redis."""
+    return {"dispatchers": await evaluation_dispatcher.worker_metrics()}
 
 # Webhook for ML -> save results
 @router.post("/webhook")
 async def evaluation_webhook(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     body = await request.json()
-    # Expected:
+    # Expected, either a single result:
     # { "session_id": 123, "overall_score": 78, "strengths": ["..."], "weaknesses": ["..."] }
+    # or a batch: { "results": [ {...}, {...} ] }
+    # Reviews are upserted on session_id, so ML retries are idempotent.
 
-    session_id = body.get("session_id")
-    if not session_id:
-        raise HTTPException(status_code=400, detail="session_id missing")
+    batch = isinstance(body, dict) and "results" in body
+    items = body["results"] if batch else [body]
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="results must be a list")
 
-    sess = db.query(InterviewSession).filter(InterviewSession.id == session_id).first()
-    if not sess:
+    results, rejected = [], []
+    for item in items:
+        try:
+            results.append(EvaluationResult.model_validate(item))
+        except ValidationError as e:
+            if not batch:
+                raise HTTPException(status_code=400, detail=e.errors())
+            rejected.append({"session_id": item.get("session_id") if isinstance(item, dict) else None, "reason": "invalid"})
+
+    session_ids = {r.session_id for r in results}
+    found = set((await db.scalars(
+        select(InterviewSession.id).where(InterviewSession.id.in_(session_ids))
+    )).all()) if session_ids else set()
+    if not batch and results and results[0].session_id not in found:
         raise HTTPException(status_code=404, detail="Session not found")
+    rejected += [{"session_id": r.session_id, "reason": "session not found"} for r in results if r.session_id not in found]
+
+    rows = [
+        review_row(r.session_id, r.overall_score, r.strengths, r.weaknesses)
+        for r in results if r.session_id in found
+    ]
+    if rows:
+        await review_writer.submit(rows)
+        await session_report.invalidate_sessions(db, (r["session_id"] for r in rows))
+        await events.publish_many([
+            (events.session_channel(r["session_id"]), {
+                "type": "evaluation.completed",
+                "session_id": r["session_id"],
+                "overall_score": r["overall_score"],
+            })
+            for r in rows
+        ])
 
-    pr = PerformanceReview(
-        session_id=session_id,
-        overall_score=body.get("overall_score"),
-        strengths=", ".join(body.get("strengths", [])),
-        weakness=", ".join(body.get("weaknesses", [])),
-    )
-    db.add(pr)
-    db.commit()
-    return {"status": "saved"}
+    if not batch:
+        return {"status": "saved"}
+    return {"status": "saved", "saved": len(rows), "rejected": rejected}
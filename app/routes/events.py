@@ -0,0 +1,111 @@
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, func
+from database.connection import AsyncSessionLocal
+from database.replica import read_session_factory
+from database.models import InterviewSession, PerformanceReview, UserRole
+from core.roles import check_role
+from core.security import get_current_user, oauth2_scheme
+from core.config import EVENTS_HEARTBEAT, EVENTS_MAX_CHANNELS
+from services import events
+from services.task_status import get_statuses, TERMINAL_STATES
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+
+def _parse_ids(raw: str | None, cast) -> list:
+    if not raw:
+        return []
+    try:
+        return list(dict.fromkeys(cast(v.strip()) for v in raw.split(",") if v.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid id list: {raw}")
+
+
+def _sse(event: dict) -> str:
+    return f"event: {event.get('type', 'message')}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+async def _already_done(session_ids: list[int], task_ids: list[str]) -> list[dict]:
+    """Results that landed before the client subscribed."""
+    done = []
+    if session_ids:
+        async with AsyncSessionLocal() as db:
+            rows = await db.execute(
+                select(PerformanceReview.session_id, PerformanceReview.overall_score)
+                .where(PerformanceReview.session_id.in_(session_ids))
+            )
+            done += [
+                {"type": "evaluation.completed", "session_id": r.session_id, "overall_score": r.overall_score}
+                for r in rows
+            ]
+    if task_ids:
+        done += [
+            {"type": "task.completed", "task_id": t["id"], "state": t["state"], "result": t["result"]}
+            for t in await get_statuses(task_ids)
+            if t["state"] in TERMINAL_STATES
+        ]
+    return done
+
+
+async def _authorize(request: Request, token: str, session_ids: list[int]):
+    """
+    Authenticate and check session ownership on a session of our own, closed
+    before the stream starts; dependency sessions would stay checked out for
+    the life of the connection.
+    """
+    factory = await read_session_factory(request)
+    async with factory() as db:
+        user = check_role(await get_current_user(token, db), ["recruiter", "candidate"])
+        if session_ids and user.userrole == UserRole.candidate:
+            owned = await db.scalar(
+                select(func.count()).select_from(InterviewSession)
+                .where(InterviewSession.id.in_(session_ids), InterviewSession.user_id == user.id)
+            )
+            if owned != len(session_ids):
+                raise HTTPException(status_code=403, detail="Not your session")
+    return user
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    session_ids: str | None = Query(None, description="Comma-separated session ids"),
+    task_ids: str | None = Query(None, description="Comma-separated task ids"),
+    token: str = Depends(oauth2_scheme),
+):
+    """
+    Server-Sent Events stream of evaluation and task completions for the given
+    ids, replacing polling of /tasks/{id} and session results.
+    """
+    sids = _parse_ids(session_ids, int)
+    tids = _parse_ids(task_ids, str)
+    if not sids and not tids:
+        raise HTTPException(status_code=400, detail="Provide session_ids and/or task_ids")
+    if len(sids) + len(tids) > EVENTS_MAX_CHANNELS:
+        raise HTTPException(status_code=400, detail=f"At most {EVENTS_MAX_CHANNELS} ids per stream")
+
+    await _authorize(request, token, sids)
+
+    channels = [events.session_channel(s) for s in sids] + [events.task_channel(t) for t in tids]
+
+    async def event_stream():
+        # subscribe (confirmed by Redis) first, then replay finished work, so nothing falls in between
+        async with events.hub.subscribe(channels) as queue:
+            for event in await _already_done(sids, tids):
+                yield _sse(event)
+            while not await request.is_disconnected():
+                try:
+                    data = await asyncio.wait_for(queue.get(), timeout=EVENTS_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield _sse(json.loads(data))
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,21 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlalchemy.orm import Session
-from services.resume_service import extract_text_from_file
-from core.security import get_current_user
-from database.connection import get_db
-from database.models import Interview, InterviewQuestions, UserRole, Resumes
-from schemas.interview import InterviewCreate, InterviewOut
-from core.roles import role_required
-from services.question_generator import generate_resume_based_questions
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import Literal
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.security import get_current_user, oauth2_scheme
+from database.connection import get_async_db
+from database.replica import get_read_db, read_session_factory
+from database.models import Interview, UserRole, Resumes
+from database.query_budget import query_budget
+from database.loaders import INTERVIEW_WITH_QUESTIONS_AND_ANSWERS, load_interview_with_questions
+from schemas.interview import InterviewCreate, InterviewOut, InterviewDetailOut
+from core.roles import role_required, check_role
+from core.config import MAX_RESUME_UPLOAD_BYTES, REPORT_PAGE_DEFAULT_LIMIT, REPORT_PAGE_MAX_LIMIT
+from services.tasks import process_resume
+from services import interview_cache, session_report, exports
 import secrets
 from services import storage
 
 router = APIRouter(prefix="/interviews", tags=["Interviews"])
 
 @router.post("/", response_model=InterviewOut)
-def create_interview(
+async def create_interview(
     interview: InterviewCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(role_required(["recruiter"]))
 ):
     token = secrets.token_urlsafe(8)
@@ -27,105 +35,158 @@ def create_interview(
         link_token=token,
     )
     db.add(new_interview)
-    db.commit()
-    db.refresh(new_interview)
+    await db.commit()
+    await db.refresh(new_interview)
     return new_interview
 
 @router.get("/{interview_id}", response_model=InterviewOut)
-def get_interview(
+async def get_interview(
     interview_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     current_user=Depends(role_required(["recruiter", "candidate"]))
 ):
-    interview = db.query(Interview).filter(Interview.id == interview_id).first()
-    if not interview:
+    entry = await interview_cache.get_interview_entry(db, interview_id)
+    if not entry:
         raise HTTPException(status_code=404, detail="Interview not found")
-    if current_user.userrole == UserRole.recruiter and interview.created_by != current_user.id:
+    if current_user.userrole == UserRole.recruiter and entry["created_by"] != current_user.id:
         raise HTTPException(status_code=403, detail="Not allowed to access this interview")
-    return interview
+    return interview_cache.cached_response(request, entry["etag"], entry["body"])
 
 @router.get("/token/{link_token}", response_model=InterviewOut)
-def get_interview_by_token(
+async def get_interview_by_token(
     link_token: str,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     current_user=Depends(role_required(["recruiter", "candidate"]))
 ):
-    interview = db.query(Interview).filter(Interview.link_token == link_token).first()
-    if not interview:
+    entry = await interview_cache.get_interview_entry_by_token(db, link_token)
+    if not entry:
         raise HTTPException(status_code=404, detail="Invalid token")
-    if current_user.userrole == UserRole.recruiter and interview.created_by != current_user.id:
+    if current_user.userrole == UserRole.recruiter and entry["created_by"] != current_user.id:
+        raise HTTPException(status_code=403, detail="Not allowed to access this interview")
+    return interview_cache.cached_response(request, entry["etag"], entry["body"])
+
+@router.get(
+    "/{interview_id}/detail",
+    response_model=InterviewDetailOut,
+    dependencies=[Depends(query_budget(5))],
+)
+async def get_interview_detail(
+    interview_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(role_required(["recruiter"]))
+):
+    interview = await load_interview_with_questions(db, interview_id)
+    if not interview:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    if interview.created_by != current_user.id:
+        raise HTTPException(status_code=403, detail="Not allowed to access this interview")
+    return InterviewDetailOut.model_validate(interview)
+
+@router.get("/{interview_id}/results")
+async def get_session_results(
+    interview_id: int,
+    limit: int = Query(REPORT_PAGE_DEFAULT_LIMIT, ge=1, le=REPORT_PAGE_MAX_LIMIT),
+    cursor: int | None = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(role_required(["recruiter"]))
+):
+    """Every candidate session with answer counts, duration and score; cohort summary on the first page."""
+    entry = await interview_cache.get_interview_entry(db, interview_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    if entry["created_by"] != current_user.id:
+        raise HTTPException(status_code=403, detail="Not allowed to access this interview")
+    return await session_report.session_results(db, interview_id, limit=limit, cursor=cursor)
+
+@router.get("/{interview_id}/export/{kind}")
+async def export_interview_data(
+    interview_id: int,
+    kind: Literal["answers", "reviews"],
+    request: Request,
+    format: Literal["csv", "ndjson"] = "csv",
+    gzip: bool = False,
+    token: str = Depends(oauth2_scheme),
+):
+    """Stream every answer (or session review) of the interview's cohort as CSV/NDJSON."""
+    # authorise on a session closed before streaming; dependency sessions
+    # would stay checked out until the last byte is sent
+    session_factory = await read_session_factory(request)
+    async with session_factory() as db:
+        current_user = check_role(await get_current_user(token, db), ["recruiter"])
+        entry = await interview_cache.get_interview_entry(db, interview_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    if entry["created_by"] != current_user.id:
         raise HTTPException(status_code=403, detail="Not allowed to access this interview")
-    return interview
+
+    stmt = exports.answers_query(interview_id) if kind == "answers" else exports.reviews_query(interview_id)
+    media_type, ext = exports.FORMATS[format]
+    filename = f"interview-{interview_id}-{kind}.{ext}"
+    if gzip:
+        media_type, filename = "application/gzip", filename + ".gz"
+    return StreamingResponse(
+        exports.stream_rows(session_factory, stmt, format, gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 @router.delete("/{interview_id}")
-def delete_interview(
+async def delete_interview(
     interview_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user)
 ):
-    interview = db.query(Interview).filter(Interview.id == interview_id).first()
+    # ORM cascade walks questions -> answers, so load them up front
+    interview = await db.scalar(
+        select(Interview)
+        .options(*INTERVIEW_WITH_QUESTIONS_AND_ANSWERS)
+        .where(Interview.id == interview_id)
+    )
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
 
     if interview.created_by != current_user.id or current_user.userrole != UserRole.recruiter:
         raise HTTPException(status_code=403, detail="Not authorized to delete this interview")
-    db.delete(interview)
-    db.commit()
+    await db.delete(interview)
+    await db.commit()
+    await interview_cache.forget(interview_id)
     return {"message": f"Interview {interview_id} deleted successfully"}
 
-@router.post("/{link_token}/upload-resume")
-def upload_resume(
+@router.post("/{link_token}/upload-resume", status_code=202)
+async def upload_resume(
     link_token: str,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(role_required(["candidate", "recruiter"]))
 ):
     # fetch interview via link
-    interview = db.query(Interview).filter(Interview.link_token == link_token).first()
+    interview = await db.scalar(select(Interview).where(Interview.link_token == link_token))
     if not interview:
         raise HTTPException(status_code=404, detail="Invalid interview link")
 
-    # parse text
-    resume_text = extract_text_from_file(file)
-
     # save file to /uploads/resumes
-    saved_path = storage.save_upload_file(file, subdir="uploads/resumes")
+    stored = await storage.save_upload_file(file, subdir="resumes", max_bytes=MAX_RESUME_UPLOAD_BYTES)
+    if not stored.size:
+        await run_in_threadpool(storage.get_storage().delete, stored.key)
+        raise HTTPException(status_code=400, detail="Empty file")
 
-    # persist resume row
+    # persist resume row; text is filled in by the worker
     resume_row = Resumes(
         user_id=current_user.id,
-        interview_id=interview.id,
-        resume_text=resume_text,
-        file_path=saved_path
+        file_path=stored.key,
     )
     db.add(resume_row)
+    await db.commit()
 
-    # mirror into interview.resume_text for quick access
-    interview.resume_text = resume_text
-    db.commit()
-    db.refresh(interview)
-
-    # generate questions via stub/ML
-    questions = generate_resume_based_questions(resume_text)
-
-    created = []
-    for q in questions:
-        new_q = InterviewQuestions(
-            question_text=q.get("question_text"),
-            category=q.get("category", "resume"),
-            difficulty=q.get("difficulty", "medium"),
-            source=q.get("source", "resume"),
-            interview_id=interview.id,
-            created_by=interview.created_by  # recruiter who owns interview
-        )
-        db.add(new_q)
-        created.append(new_q)
-    db.commit()
+    # parse -> store text -> generate questions, off the request path
+    task = await run_in_threadpool(process_resume, resume_row.id, interview.id, stored.sha256)
 
     return {
-        "message": "Resume uploaded, parsed and questions generated.",
+        "message": "Resume uploaded; parsing and question generation queued.",
         "interview_id": interview.id,
         "resume_id": resume_row.id,
-        "file_path": saved_path,
-        "generated_questions": len(created)
+        "file_path": stored.key,
+        "task_id": task.id,
     }
@@ -1,18 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database.connection import get_db
-from schemas.question import QuestionCreate, QuestionOut, QuestionUpdate
+import csv
+import io
+import json
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from database.connection import get_async_db
+from database.replica import get_read_db
+from pydantic import TypeAdapter, ValidationError
+from schemas.question import QuestionCreate, QuestionImport, QuestionOut, QuestionUpdate, QuestionPage
 from database.models import InterviewQuestions, Interview
 from core.roles import role_required
-from services.question_generator import generate_resume_based_questions
+from services.question_generator import get_or_generate_questions, cache_metrics
 from core.dependencies import get_interview_or_404
+from core.config import BULK_IMPORT_MAX_BYTES, BULK_IMPORT_MAX_QUESTIONS, QUESTION_PAGE_DEFAULT_LIMIT, QUESTION_PAGE_MAX_LIMIT
+from services.question_store import build_question_rows, bulk_insert_questions, list_questions, parse_fields
+from services import interview_cache
 
 router = APIRouter(prefix="/interviews", tags=["Questions"])
 
 @router.post("/{interview_id}/generate_questions", response_model=list[QuestionOut])
-def generate_questions_from_resume(
+async def generate_questions_from_resume(
     interview_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(role_required(["recruiter"])),
     interview: Interview = Depends(get_interview_or_404)
 ):
@@ -22,30 +33,32 @@ def generate_questions_from_resume(
     if not interview.resume_text:
         raise HTTPException(status_code=400, detail="Resume not uploaded yet")
 
-    generated_questions = generate_resume_based_questions(interview.resume_text)
-
-    saved_questions = []
-    for q in generated_questions:
-        new_q = InterviewQuestions(
-            question_text=q["question_text"],
-            category=q.get("category", "resume_based"),
-            difficulty=q.get("difficulty", "medium"),
-            interview_id=interview_id,
-            created_by=current_user.id,
-            source="resume",
-        )
-        db.add(new_q)
-        db.flush()
-        saved_questions.append(new_q)
+    generated_questions = await run_in_threadpool(
+        get_or_generate_questions, interview.resume_text, interview.job_description
+    )
 
-    db.commit()
+    rows = build_question_rows(
+        generated_questions,
+        interview_id=interview_id,
+        created_by=current_user.id,
+        source="resume",
+        category="resume_based",
+    )
+    saved_questions = await bulk_insert_questions(db, rows)
+    await interview_cache.questions_changed(db, interview_id)
+    await db.commit()
+    await interview_cache.forget(interview_id)
     return saved_questions
 
+@router.get("/generation-cache/metrics")
+async def generation_cache_metrics(current_user=Depends(role_required(["admin"]))):
+    return cache_metrics()
+
 @router.post("/{interview_id}/questions", response_model=QuestionOut)
-def add_question(
+async def add_question(
     interview_id: int,
     payload: QuestionCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(role_required(["recruiter"])),
     interview: Interview = Depends(get_interview_or_404)
 ):
@@ -61,32 +74,128 @@ def add_question(
         source=payload.source or "manual",  # if your schema supports it; else default manual
     )
     db.add(new_question)
-    db.commit()
-    db.refresh(new_question)
+    await interview_cache.questions_changed(db, interview_id)
+    await db.commit()
+    await interview_cache.forget(interview_id)
+    await db.refresh(new_question)
     return new_question
 
-@router.get("/{interview_id}/questions", response_model=list[QuestionOut])
-def get_questions(
+_question_list = TypeAdapter(list[QuestionImport])
+
+
+async def _read_capped_body(request: Request, max_bytes: int) -> bytes:
+    """Read the request body, refusing it as soon as it grows past max_bytes."""
+    too_large = HTTPException(status_code=413, detail=f"Import body exceeds {max_bytes} bytes")
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > max_bytes:
+        raise too_large
+    chunks, size = [], 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > max_bytes:
+            raise too_large
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+@router.post("/{interview_id}/questions/bulk", response_model=list[QuestionOut])
+async def bulk_import_questions(
     interview_id: int,
-    db: Session = Depends(get_db),
-    current_user=Depends(role_required(["recruiter", "candidate"])),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(role_required(["recruiter"])),
     interview: Interview = Depends(get_interview_or_404)
 ):
-    return db.query(InterviewQuestions).filter(InterviewQuestions.interview_id == interview_id).all()
+    """
+    Import a question bank in one INSERT. Body is either a JSON array of
+    questions or, with Content-Type: text/csv, a CSV with a header row
+    (question_text, category, difficulty, source).
+    """
+    if interview.created_by != current_user.id:
+        raise HTTPException(status_code=403, detail="Not allowed to add questions to this interview")
+
+    body = await _read_capped_body(request, BULK_IMPORT_MAX_BYTES)
+    try:
+        if request.headers.get("content-type", "").startswith("text/csv"):
+            raw = list(csv.DictReader(io.StringIO(body.decode("utf-8-sig"))))
+            raw = [{k: v for k, v in r.items() if v not in (None, "")} for r in raw]
+        else:
+            raw = json.loads(body)
+        questions = _question_list.validate_python(raw)
+    except (ValueError, ValidationError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid question payload: {e}")
+
+    if not questions:
+        raise HTTPException(status_code=400, detail="No questions to import")
+    if len(questions) > BULK_IMPORT_MAX_QUESTIONS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_IMPORT_MAX_QUESTIONS} questions per import")
+
+    rows = build_question_rows(
+        (q.model_dump() for q in questions),
+        interview_id=interview_id,
+        created_by=current_user.id,
+        source="manual",
+        difficulty=None,
+    )
+    saved_questions = await bulk_insert_questions(db, rows)
+    await interview_cache.questions_changed(db, interview_id)
+    await db.commit()
+    await interview_cache.forget(interview_id)
+    return saved_questions
+
+@router.get(
+    "/{interview_id}/questions",
+    response_model=QuestionPage,
+    response_model_exclude_unset=True,
+)
+async def get_questions(
+    interview_id: int,
+    request: Request,
+    limit: int = Query(QUESTION_PAGE_DEFAULT_LIMIT, ge=1, le=QUESTION_PAGE_MAX_LIMIT),
+    cursor: int | None = Query(None, description="next_cursor from the previous page"),
+    fields: str | None = Query(None, description="Comma-separated columns to return, e.g. id,question_text"),
+    category: str | None = None,
+    difficulty: str | None = None,
+    source: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(role_required(["recruiter", "candidate"])),
+):
+    entry = await interview_cache.get_interview_entry(db, interview_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Interview not found")
+
+    etag = interview_cache.page_etag(entry, request)
+    if interview_cache.is_not_modified(request, etag):
+        return interview_cache.cached_response(request, etag)
+
+    body = await interview_cache.get_page(entry, request)
+    if body is None:
+        items, next_cursor = await list_questions(
+            db,
+            interview_id,
+            fields=parse_fields(fields),
+            limit=limit,
+            cursor=cursor,
+            category=category,
+            difficulty=difficulty,
+            source=source,
+        )
+        body = QuestionPage(items=items, next_cursor=next_cursor).model_dump_json(exclude_unset=True)
+        await interview_cache.set_page(db, entry, request, body)
+    return interview_cache.cached_response(request, etag, body)
 
 @router.patch("/{interview_id}/questions/{question_id}", response_model=QuestionOut)
-def update_question(
+async def update_question(
     interview_id: int,
     question_id: int,
     payload: QuestionUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(role_required(["recruiter"])),
     interview: Interview = Depends(get_interview_or_404)
 ):
-    question = db.query(InterviewQuestions).filter(
+    question = await db.scalar(select(InterviewQuestions).where(
         InterviewQuestions.id == question_id,
         InterviewQuestions.interview_id == interview_id
-    ).first()
+    ))
 
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
@@ -101,22 +210,28 @@ def update_question(
     if payload.difficulty is not None:
         question.difficulty = payload.difficulty
 
-    db.commit()
-    db.refresh(question)
+    await interview_cache.questions_changed(db, interview_id)
+    await db.commit()
+    await interview_cache.forget(interview_id)
+    await db.refresh(question)
     return question
 
 @router.delete("/{interview_id}/questions/{question_id}")
-def delete_question(
+async def delete_question(
     interview_id: int,
     question_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(role_required(["recruiter"])),
     interview: Interview = Depends(get_interview_or_404)
 ):
-    question = db.query(InterviewQuestions).filter(
-        InterviewQuestions.id == question_id,
-        InterviewQuestions.interview_id == interview_id
-    ).first()
+    question = await db.scalar(
+        select(InterviewQuestions)
+        .options(selectinload(InterviewQuestions.answers))  # ORM cascade needs them loaded
+        .where(
+            InterviewQuestions.id == question_id,
+            InterviewQuestions.interview_id == interview_id
+        )
+    )
 
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
@@ -124,6 +239,8 @@ def delete_question(
     if interview.created_by != current_user.id:
         raise HTTPException(status_code=403, detail="Not allowed to delete questions for this interview")
 
-    db.delete(question)
-    db.commit()
+    await db.delete(question)
+    await interview_cache.questions_changed(db, interview_id)
+    await db.commit()
+    await interview_cache.forget(interview_id)
     return {"message": "Question deleted successfully"}
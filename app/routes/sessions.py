@@ -1,56 +1,68 @@
 # routes/sessions.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database.connection import get_db
-from database.models import Interview, InterviewSession, InterviewQuestions, Users
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.connection import get_async_db
+from database.models import Interview, InterviewSession, InterviewQuestions, Users, UserRole
+from database.query_budget import query_budget
+from database.loaders import load_session_detail
+from database.replica import get_read_db
+from schemas.response import SessionDetailOut
 from core.roles import role_required
+from core.config import QUESTION_PAGE_DEFAULT_LIMIT, QUESTION_PAGE_MAX_LIMIT
+from services import interview_cache
 from datetime import datetime
 
 router = APIRouter(prefix="/sessions", tags=["Sessions"])
 
 @router.post("/start/{interview_id}")
-def start_session(
+async def start_session(
     interview_id: int,
-    db: Session = Depends(get_db),
+    limit: int = Query(QUESTION_PAGE_DEFAULT_LIMIT, ge=1, le=QUESTION_PAGE_MAX_LIMIT),
+    category: str | None = None,
+    difficulty: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(role_required(["candidate"])),
 ):
-    interview = db.query(Interview).filter(Interview.id == interview_id).first()
-    if not interview:
+    # precomputed question set: a cache read instead of a query per start
+    snapshot = await interview_cache.get_snapshot(db, interview_id)
+    if snapshot is None:
         raise HTTPException(status_code=404, detail="Interview not found")
 
     # Create session
     sess = InterviewSession(
         user_id=current_user.id,
-        # interview_id=interview.id,
+        interview_id=interview_id,
         start_time=datetime.utcnow(),
     )
     db.add(sess)
-    db.commit()
-    db.refresh(sess)
+    await db.commit()
 
-    # Return questions for this interview
-    questions = db.query(InterviewQuestions).filter(
-        InterviewQuestions.interview_id == interview.id
-    ).all()
+    # First page of questions; the rest via GET /interviews/{id}/questions?cursor=...
+    matching = [
+        q for q in snapshot
+        if (category is None or q["category"] == category)
+        and (difficulty is None or q["difficulty"] == difficulty)
+    ]
+    page = matching[:limit]
+    next_cursor = page[-1]["id"] if len(matching) > limit else None
 
     return {
         "session_id": sess.id,
         "questions": [
-            {
-                "id": q.id,
-                "question_text": q.question_text,
-                "source": getattr(q, "source", "general")
-            } for q in questions
-        ]
+            {"id": q["id"], "question_text": q["question_text"], "source": q["source"]}
+            for q in page
+        ],
+        "next_cursor": next_cursor,
     }
 
 @router.post("/finish/{session_id}")
-def finish_session(
+async def finish_session(
     session_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(role_required(["candidate", "recruiter"])),
 ):
-    sess = db.query(InterviewSession).filter(InterviewSession.id == session_id).first()
+    sess = await db.scalar(select(InterviewSession).where(InterviewSession.id == session_id))
     if not sess:
         raise HTTPException(status_code=404, detail="Session not found")
 
@@ -59,6 +71,23 @@ def finish_session(
         raise HTTPException(status_code=403, detail="Not allowed")
 
     sess.end_time = datetime.utcnow()
-    db.commit()
-    db.refresh(sess)
+    await db.commit()
+    await db.refresh(sess)
     return {"message": "Session finished", "session_id": sess.id}
+
+@router.get(
+    "/{session_id}",
+    response_model=SessionDetailOut,
+    dependencies=[Depends(query_budget(5))],
+)
+async def get_session(
+    session_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(role_required(["candidate", "recruiter"])),
+):
+    sess = await load_session_detail(db, session_id)
+    if not sess:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if current_user.userrole == UserRole.candidate and sess.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not allowed")
+    return SessionDetailOut.model_validate(sess)
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional
+from schemas.question import QuestionOut
 
 class InterviewBase(BaseModel):
     title: str
@@ -17,4 +18,7 @@ class InterviewOut(InterviewBase):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class InterviewDetailOut(InterviewOut):
+    questions: list[QuestionOut] = []
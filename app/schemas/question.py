@@ -12,6 +12,13 @@ class QuestionCreate(BaseModel):
     source: Optional[str] = Field(None, min_length=1)  # e.g., "manual", "resume", "ml" 
 
 
+class QuestionImport(BaseModel):
+    question_text: str = Field(..., min_length=1, max_length=500)
+    category: Optional[str] = None
+    difficulty: Optional[str] = None
+    source: Optional[str] = None
+
+
 class QuestionOut(BaseModel):
     id: int
     question_text: str
@@ -23,6 +30,20 @@ class QuestionOut(BaseModel):
     class Config:
         from_attributes = True
 
+# Projection-friendly shape: only the requested fields are set/serialised
+class QuestionFields(BaseModel):
+    id: Optional[int] = None
+    question_text: Optional[str] = None
+    category: Optional[str] = None
+    difficulty: Optional[str] = None
+    source: Optional[str] = None
+    created_at: Optional[datetime] = None
+    interview_id: Optional[int] = None
+
+class QuestionPage(BaseModel):
+    items: list[QuestionFields]
+    next_cursor: Optional[int] = None
+
 class QuestionUpdate(BaseModel):
     question_text: Optional[str] = None
     category: Optional[str] = None
@@ -7,9 +7,75 @@ class AnswerCreate(BaseModel):
     answer_text: Optional[Annotated[str, Field(min_length=1)]] = None
     video_path: str
 
+class UploadUrlRequest(BaseModel):
+    session_id: int
+    question_id: int
+    filename: str
+    content_type: Optional[str] = None
+
+class ChunkedUploadCreate(BaseModel):
+    session_id: int
+    question_id: int
+    filename: str
+    total_size: int = Field(..., gt=0)
+    chunk_size: Optional[int] = None
+
+class ChunkedUploadComplete(BaseModel):
+    answer_text: Optional[str] = None
+
+class ChunkedUploadOut(BaseModel):
+    upload_id: str
+    status: str
+    chunk_size: int
+    total_chunks: int
+    received_chunks: list[int]
+    received_bytes: int
+    answer_id: Optional[int] = None
+
+class EvaluationTriggerBatch(BaseModel):
+    session_ids: list[int] = Field(..., min_length=1, max_length=1000)
+
+class EvaluationResult(BaseModel):
+    session_id: int
+    overall_score: int
+    strengths: list[str] = []
+    weaknesses: list[str] = []
+
+class TaskStatusRequest(BaseModel):
+    ids: list[str] = Field(..., min_length=1)
+    include_result: bool = True
+    max_result_bytes: Optional[int] = Field(None, gt=0)
+
 class PerformanceReviewOut(BaseModel):
     id: int
     overall_score: int
+    strengths: Optional[str] = None
+    weakness: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class AnswerOut(BaseModel):
+    id: int
+    question_id: int
+    answer_text: Optional[str] = None
+    video_path: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class SessionDetailOut(BaseModel):
+    id: int
+    user_id: int
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    answers: list[AnswerOut] = []
+    performance_review: Optional[PerformanceReviewOut] = None
+
+    class Config:
+        from_attributes = True
 
 
 class CandidateResponse(BaseModel):
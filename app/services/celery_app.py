@@ -1,11 +1,86 @@
 from celery import Celery
-from core.config import CELERY_BROKER_URL, CELERY_RESULT_BACKEND
+from kombu import Queue
+from core.config import (
+    CELERY_BROKER_URL,
+    CELERY_RESULT_BACKEND,
+    EVAL_BATCH_WINDOW,
+    CELERY_PDF_TIME_LIMIT,
+    CELERY_PDF_RATE_LIMIT,
+    CELERY_ML_TIME_LIMIT,
+    CELERY_ML_RATE_LIMIT,
+    CELERY_DB_TIME_LIMIT,
+    CELERY_DB_RATE_LIMIT,
+    CELERY_PDF_POOL,
+    CELERY_PDF_CONCURRENCY,
+    CELERY_PDF_PREFETCH,
+    CELERY_ML_POOL,
+    CELERY_ML_CONCURRENCY,
+    CELERY_ML_PREFETCH,
+    CELERY_DB_POOL,
+    CELERY_DB_CONCURRENCY,
+    CELERY_DB_PREFETCH,
+)
 
 celery = Celery(
     "app",
     broker=CELERY_BROKER_URL,
     backend=CELERY_RESULT_BACKEND,
+    include=["services.tasks"],
 )
+
+# One queue per workload so a slow PDF never sits in front of ML dispatch:
+#   pdf - CPU-bound parsing     (prefork)
+#   ml  - IO-bound ML calls     (threads/gevent, high concurrency)
+#   db  - bulk DB writes        (small thread pool, bounded by the DB pool)
+celery.conf.task_queues = [Queue("pdf"), Queue("ml"), Queue("db"), Queue("default")]
+celery.conf.task_default_queue = "default"
 celery.conf.task_routes = {
+    "services.tasks.parse_resume": {"queue": "pdf"},
+    "services.tasks.generate_questions_for_interview": {"queue": "ml"},
+    "services.tasks.dispatch_evaluations": {"queue": "ml"},
+    "services.tasks.save_generated_questions": {"queue": "db"},
+    "services.tasks.expire_chunked_uploads": {"queue": "db"},
     "services.tasks.*": {"queue": "default"},
 }
+
+
+def _limits(time_limit: int, rate_limit: str | None, pool: str) -> dict:
+    limits = {
+        # ack after the task finishes so a crashed worker's task is redelivered
+        "acks_late": True,
+        "reject_on_worker_lost": True,
+        "rate_limit": rate_limit,
+    }
+    # only prefork can interrupt a running task; other pools ignore these, so
+    # tasks routed there bound themselves (dispatch_pending's deadline, ML
+    # client timeouts, DB_STATEMENT_TIMEOUT_MS)
+    if pool == "prefork":
+        limits.update(time_limit=time_limit, soft_time_limit=int(time_limit * 0.8))
+    return limits
+
+
+celery.conf.task_annotations = {
+    "services.tasks.parse_resume": _limits(CELERY_PDF_TIME_LIMIT, CELERY_PDF_RATE_LIMIT, CELERY_PDF_POOL),
+    "services.tasks.generate_questions_for_interview": _limits(CELERY_ML_TIME_LIMIT, CELERY_ML_RATE_LIMIT, CELERY_ML_POOL),
+    "services.tasks.dispatch_evaluations": _limits(CELERY_ML_TIME_LIMIT, None, CELERY_ML_POOL),
+    "services.tasks.save_generated_questions": _limits(CELERY_DB_TIME_LIMIT, CELERY_DB_RATE_LIMIT, CELERY_DB_POOL),
+}
+
+# worker settings per queue, used by services/worker.py
+WORKER_PROFILES = {
+    "pdf": {"queues": ["pdf"], "pool": CELERY_PDF_POOL, "concurrency": CELERY_PDF_CONCURRENCY, "prefetch": CELERY_PDF_PREFETCH},
+    "ml": {"queues": ["ml"], "pool": CELERY_ML_POOL, "concurrency": CELERY_ML_CONCURRENCY, "prefetch": CELERY_ML_PREFETCH},
+    "db": {"queues": ["db", "default"], "pool": CELERY_DB_POOL, "concurrency": CELERY_DB_CONCURRENCY, "prefetch": CELERY_DB_PREFETCH},
+}
+
+# time window for evaluation batches (run `celery -A services.celery_app beat`)
+celery.conf.beat_schedule = {
+    "dispatch-evaluations": {
+        "task": "services.tasks.dispatch_evaluations",
+        "schedule": EVAL_BATCH_WINDOW,
+    },
+    "expire-chunked-uploads": {
+        "task": "services.tasks.expire_chunked_uploads",
+        "schedule": 3600,
+    },
+}
@@ -0,0 +1,296 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import defaultdict
+from celery.signals import worker_process_shutdown
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from core.cache import get_async_redis, get_sync_redis
+from core.config import (
+    ML_SERVICE_URL,
+    ML_WEBHOOK_URL,
+    EVAL_BATCH_SIZE,
+    EVAL_MAX_BATCHES_PER_RUN,
+    EVAL_MAX_PENDING,
+    EVAL_MAX_ATTEMPTS,
+    EVAL_SLOW_THRESHOLD,
+    EVAL_FAILURE_COOLDOWN,
+    EVAL_JOB_TTL,
+    CELERY_ML_TIME_LIMIT,
+)
+from core.ml_client import MLClient
+from database.connection import SessionLocal
+from database.models import Answers
+from services.celery_app import celery
+
+logger = logging.getLogger(__name__)
+
+# Sessions wait in a Redis list and a periodic Celery task drains them in
+# batches of EVAL_BATCH_SIZE into one ML call each. A batch is moved to a
+# processing list before the call and only removed (acknowledged) once the ML
+# service has accepted it and the job counters are stored; a dispatcher that
+# dies mid-batch leaves it there for the next run to put back. A cooldown key
+# pauses draining while the ML service is slow or failing.
+PENDING_KEY = "eval:pending"
+PROCESSING_KEY = "eval:processing"
+COOLDOWN_KEY = "eval:cooldown"
+LOCK_KEY = "eval:dispatch:lock"
+LOCK_TTL = 300
+JOB_KEY = "eval:job:{}"
+# per-process dispatcher MLClient metrics, field = host:pid
+METRICS_KEY = "eval:ml-client"
+METRICS_STALE_AFTER = 3600
+
+# depth check and push in one step, so concurrent enqueues can't overshoot
+# EVAL_MAX_PENDING. Returns the new depth, or -1 when the queue is full.
+ENQUEUE_SCRIPT = """
+local n = #ARGV - 2
+if redis.call("llen", KEYS[1]) + n > tonumber(ARGV[1]) then
+    return -1
+end
+redis.call("hset", KEYS[2], "total", n, "dispatched", 0, "failed", 0)
+redis.call("expire", KEYS[2], ARGV[2])
+local depth = 0
+for i = 3, #ARGV do
+    depth = redis.call("rpush", KEYS[1], ARGV[i])
+end
+return depth
+"""
+
+# only the holder of the token may extend or release the lock
+EXTEND_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("expire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# leftovers from a dispatcher that died mid-batch go back to the front
+RECOVER_SCRIPT = """
+local n = 0
+while redis.call("lmove", KEYS[1], KEYS[2], "RIGHT", "LEFT") do
+    n = n + 1
+end
+return n
+"""
+
+
+# ------------------------------
+# ENQUEUE (API side)
+# ------------------------------
+async def enqueue(session_ids: list[int]) -> dict:
+    """Queue sessions for evaluation; returns the job and the pending depth."""
+    if not ML_SERVICE_URL or not ML_WEBHOOK_URL:
+        raise HTTPException(status_code=500, detail="ML_SERVICE_URL/ML_WEBHOOK_URL missing")
+
+    job_id = uuid.uuid4().hex
+    items = [json.dumps({"job_id": job_id, "session_id": sid, "attempt": 0}) for sid in session_ids]
+    depth = await get_async_redis().eval(
+        ENQUEUE_SCRIPT, 2, PENDING_KEY, JOB_KEY.format(job_id), EVAL_MAX_PENDING, EVAL_JOB_TTL, *items,
+    )
+    if depth < 0:
+        raise HTTPException(
+            status_code=503,
+            detail="Evaluation queue is full, retry shortly",
+            headers={"Retry-After": str(int(EVAL_FAILURE_COOLDOWN))},
+        )
+
+    # size window: a full batch goes out now instead of waiting for the next beat
+    if depth >= EVAL_BATCH_SIZE:
+        await run_in_threadpool(celery.send_task, "services.tasks.dispatch_evaluations")
+    return {"job_id": job_id, "queued": len(session_ids), "pending": depth}
+
+
+async def job_status(job_id: str) -> dict | None:
+    job = await get_async_redis().hgetall(JOB_KEY.format(job_id))
+    if not job:
+        return None
+    counts = {k: int(v) for k, v in job.items()}
+    done = counts["dispatched"] + counts["failed"]
+    if done < counts["total"]:
+        state = "queued" if done == 0 else "dispatching"
+    else:
+        state = "failed" if counts["failed"] == counts["total"] else "dispatched"
+    return {"job_id": job_id, "state": state, **counts}
+
+
+# ------------------------------
+# DISPATCH (Celery side)
+# ------------------------------
+def _claim_batch(redis, size: int) -> list[dict]:
+    """Move up to `size` items from pending to processing; they stay there until acknowledged."""
+    with redis.pipeline(transaction=True) as pipe:
+        for _ in range(size):
+            pipe.lmove(PENDING_KEY, PROCESSING_KEY, "LEFT", "RIGHT")
+        items = pipe.execute()
+    return [json.loads(i) for i in items if i is not None]
+
+
+def _build_sessions(session_ids: list[int]) -> list[dict]:
+    """All answers for the batch in one query, grouped per session."""
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            select(Answers.session_id, Answers.question_id, Answers.answer_text, Answers.video_path)
+            .where(Answers.session_id.in_(session_ids))
+        )
+        answers = defaultdict(list)
+        for r in rows:
+            answers[r.session_id].append(
+                {"question_id": r.question_id, "answer_text": r.answer_text, "video_path": r.video_path}
+            )
+    finally:
+        db.close()
+    return [{"session_id": sid, "answers": answers[sid], "context": {}} for sid in session_ids]
+
+
+def _record(pipe, items: list[dict], field: str):
+    counts = defaultdict(int)
+    for item in items:
+        counts[item["job_id"]] += 1
+    for job_id, n in counts.items():
+        pipe.hincrby(JOB_KEY.format(job_id), field, n)
+
+
+def _ack_dispatched(redis, items: list[dict]):
+    with redis.pipeline(transaction=True) as pipe:
+        _record(pipe, items, "dispatched")
+        pipe.delete(PROCESSING_KEY)
+        pipe.execute()
+
+
+def _requeue_or_fail(redis, items: list[dict]):
+    retry = [i for i in items if i["attempt"] + 1 < EVAL_MAX_ATTEMPTS]
+    failed = [i for i in items if i["attempt"] + 1 >= EVAL_MAX_ATTEMPTS]
+    with redis.pipeline(transaction=True) as pipe:
+        if retry:
+            # back to the front so they go out before newer work
+            pipe.lpush(PENDING_KEY, *[json.dumps({**i, "attempt": i["attempt"] + 1}) for i in reversed(retry)])
+        _record(pipe, failed, "failed")
+        pipe.delete(PROCESSING_KEY)
+        pipe.execute()
+
+
+# ------------------------------
+# WORKER ML CLIENT
+# ------------------------------
+# One MLClient and event loop per worker process, reused by every run so the
+# connection pool stays warm (created lazily, i.e. after a prefork fork).
+_worker_client: MLClient | None = None
+_worker_loop: asyncio.AbstractEventLoop | None = None
+_worker_lock = threading.Lock()  # the loop is not shared across pool threads
+
+
+def _worker_ml_client() -> tuple[MLClient, asyncio.AbstractEventLoop]:
+    global _worker_client, _worker_loop
+    if _worker_client is None:
+        _worker_client = MLClient(ML_SERVICE_URL)
+        _worker_loop = asyncio.new_event_loop()
+    return _worker_client, _worker_loop
+
+
+@worker_process_shutdown.connect
+def _close_worker_ml_client(**kwargs):
+    global _worker_client, _worker_loop
+    if _worker_client is not None:
+        _worker_loop.run_until_complete(_worker_client.aclose())
+        _worker_loop.close()
+        _worker_client = _worker_loop = None
+
+
+def _publish_metrics(redis, client: MLClient):
+    try:
+        redis.hset(METRICS_KEY, f"{socket.gethostname()}:{os.getpid()}",
+                   json.dumps({**client.metrics(), "updated_at": time.time()}))
+    except Exception:
+        logger.warning("ML client metrics publish failed", exc_info=True)
+
+
+async def worker_metrics() -> dict:
+    """Dispatcher MLClient metrics per worker process, skipping ones not heard from recently."""
+    raw = await get_async_redis().hgetall(METRICS_KEY)
+    cutoff = time.time() - METRICS_STALE_AFTER
+    workers = {worker: json.loads(v) for worker, v in raw.items()}
+    return {worker: m for worker, m in workers.items() if m["updated_at"] >= cutoff}
+
+
+# ------------------------------
+# RUN
+# ------------------------------
+def dispatch_pending(time_limit: float = CELERY_ML_TIME_LIMIT) -> dict:
+    """
+    Drain up to EVAL_MAX_BATCHES_PER_RUN batches, backing off when the ML
+    service struggles. Runs on a thread pool, where Celery can't enforce time
+    limits, so the run stops itself after `time_limit` seconds.
+    """
+    redis = get_sync_redis()
+    if redis.exists(COOLDOWN_KEY):
+        return {"dispatched": 0, "reason": "cooldown"}
+    if not _worker_lock.acquire(blocking=False):
+        return {"dispatched": 0, "reason": "locked"}
+    try:
+        # one dispatcher at a time, so backpressure decisions aren't raced
+        token = uuid.uuid4().hex
+        if not redis.set(LOCK_KEY, token, nx=True, ex=LOCK_TTL):
+            return {"dispatched": 0, "reason": "locked"}
+        try:
+            return _drain(redis, token, time.monotonic() + time_limit)
+        finally:
+            redis.eval(RELEASE_LOCK_SCRIPT, 1, LOCK_KEY, token)
+    finally:
+        _worker_lock.release()
+
+
+def _drain(redis, token: str, deadline: float) -> dict:
+    recovered = redis.eval(RECOVER_SCRIPT, 2, PROCESSING_KEY, PENDING_KEY)
+    if recovered:
+        logger.warning("requeued %s evaluations left by an interrupted dispatcher", recovered)
+
+    client, loop = _worker_ml_client()
+    dispatched = 0
+    try:
+        for _ in range(EVAL_MAX_BATCHES_PER_RUN):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if not redis.eval(EXTEND_LOCK_SCRIPT, 1, LOCK_KEY, token, LOCK_TTL):
+                logger.warning("dispatcher lock lost, stopping")
+                break
+            items = _claim_batch(redis, EVAL_BATCH_SIZE)
+            if not items:
+                break
+            sessions = _build_sessions([i["session_id"] for i in items])
+
+            started = time.monotonic()
+            try:
+                loop.run_until_complete(asyncio.wait_for(
+                    client.evaluate_sessions(sessions, webhook_url=ML_WEBHOOK_URL), timeout=remaining,
+                ))
+            except Exception:
+                logger.warning("ML batch of %s sessions failed", len(items), exc_info=True)
+                _requeue_or_fail(redis, items)
+                redis.set(COOLDOWN_KEY, "1", ex=int(EVAL_FAILURE_COOLDOWN))
+                break
+            elapsed = time.monotonic() - started
+
+            _ack_dispatched(redis, items)
+            dispatched += len(items)
+            if elapsed > EVAL_SLOW_THRESHOLD:
+                # ML is struggling: pause for as long as the last batch took
+                redis.set(COOLDOWN_KEY, "1", ex=max(int(elapsed), 1))
+                break
+    finally:
+        _publish_metrics(redis, client)
+    return {"dispatched": dispatched, "pending": redis.llen(PENDING_KEY)}
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from core.cache import get_async_redis, get_sync_redis
+from core.config import EVENTS_QUEUE_SIZE, EVENTS_SUBSCRIBE_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# Events are published on Redis channels ("events:session:<id>", "events:task:<id>").
+# Each API worker holds a single pattern subscription and fans messages out to
+# its local SSE subscribers, so N open streams cost one Redis connection.
+PREFIX = "events:"
+
+
+def session_channel(session_id: int) -> str:
+    return f"{PREFIX}session:{session_id}"
+
+
+def task_channel(task_id: str) -> str:
+    return f"{PREFIX}task:{task_id}"
+
+
+def publish(channel: str, event: dict):
+    """Sync publish, for Celery tasks. Best effort: a lost event only costs a poll."""
+    try:
+        get_sync_redis().publish(channel, json.dumps(event, default=str))
+    except Exception:
+        logger.warning("event publish to %s failed", channel, exc_info=True)
+
+
+async def publish_many(events: list[tuple[str, dict]]):
+    if not events:
+        return
+    try:
+        async with get_async_redis().pipeline(transaction=False) as pipe:
+            for channel, event in events:
+                pipe.publish(channel, json.dumps(event, default=str))
+            await pipe.execute()
+    except Exception:
+        logger.warning("event publish of %s events failed", len(events), exc_info=True)
+
+
+class EventHub:
+    def __init__(self):
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+        self._task: asyncio.Task | None = None
+        # set while the pattern subscription is live; cleared on every reconnect
+        self._ready = asyncio.Event()
+
+    async def _listen(self):
+        while True:
+            pubsub = get_async_redis().pubsub()
+            try:
+                await pubsub.psubscribe(f"{PREFIX}*")
+                self._ready.set()
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    for queue in self._subscribers.get(message["channel"], ()):
+                        try:
+                            queue.put_nowait(message["data"])
+                        except asyncio.QueueFull:
+                            pass  # slow consumer; it can fall back to polling
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._ready.clear()
+                logger.warning("event hub lost Redis, reconnecting", exc_info=True)
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    @asynccontextmanager
+    async def subscribe(self, channels: list[str]):
+        """
+        Registers a queue for channels and returns once Redis has confirmed the
+        pattern subscription, so a caller replaying finished work afterwards
+        cannot miss an event published in between.
+        """
+        if self._task is None or self._task.done():
+            self._ready = asyncio.Event()
+            self._task = asyncio.create_task(self._listen())
+        queue: asyncio.Queue = asyncio.Queue(maxsize=EVENTS_QUEUE_SIZE)
+        for channel in channels:
+            self._subscribers[channel].add(queue)
+        try:
+            try:
+                await asyncio.wait_for(self._ready.wait(), EVENTS_SUBSCRIBE_TIMEOUT)
+            except asyncio.TimeoutError:
+                # Redis unreachable; the replay (and the client's polling) still covers it
+                logger.warning("event hub not subscribed after %ss", EVENTS_SUBSCRIBE_TIMEOUT)
+            yield queue
+        finally:
+            for channel in channels:
+                self._subscribers[channel].discard(queue)
+                if not self._subscribers[channel]:
+                    del self._subscribers[channel]
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+hub = EventHub()
@@ -0,0 +1,129 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import AsyncIterator, Callable
+from sqlalchemy import select
+from core.config import EXPORT_YIELD_PER, EXPORT_CHUNK_BYTES, EXPORT_GZIP_LEVEL
+from database.models import Answers, InterviewQuestions, InterviewSession, PerformanceReview, Users
+
+# Exports stream straight from a server-side cursor (yield_per) into the
+# response: rows are encoded into ~EXPORT_CHUNK_BYTES chunks, optionally
+# gzipped on the fly, and nothing holds more than one chunk and one fetch batch.
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+
+ANSWER_COLUMNS = (
+    Answers.id.label("answer_id"),
+    Answers.session_id,
+    InterviewSession.user_id,
+    Users.username,
+    Users.email,
+    Answers.question_id,
+    InterviewQuestions.question_text,
+    Answers.answer_text,
+    Answers.video_path,
+    Answers.created_at,
+)
+
+REVIEW_COLUMNS = (
+    InterviewSession.id.label("session_id"),
+    InterviewSession.user_id,
+    Users.username,
+    Users.email,
+    InterviewSession.start_time,
+    InterviewSession.end_time,
+    PerformanceReview.overall_score,
+    PerformanceReview.strengths,
+    PerformanceReview.weakness,
+    PerformanceReview.created_at.label("reviewed_at"),
+)
+
+
+def answers_query(interview_id: int):
+    return (
+        select(*ANSWER_COLUMNS)
+        .join(InterviewQuestions, InterviewQuestions.id == Answers.question_id)
+        .join(InterviewSession, InterviewSession.id == Answers.session_id)
+        .join(Users, Users.id == InterviewSession.user_id, isouter=True)
+        .where(InterviewQuestions.interview_id == interview_id)
+        .order_by(Answers.session_id, Answers.id)
+    )
+
+
+def reviews_query(interview_id: int):
+    # every session started for the interview, answered or not
+    return (
+        select(*REVIEW_COLUMNS)
+        .join(Users, Users.id == InterviewSession.user_id, isouter=True)
+        .join(PerformanceReview, PerformanceReview.session_id == InterviewSession.id, isouter=True)
+        .where(InterviewSession.interview_id == interview_id)
+        .order_by(InterviewSession.id)
+    )
+
+
+def _value(v):
+    return v.isoformat() if isinstance(v, datetime) else v
+
+
+def _csv_encoder(columns: list[str]) -> tuple[str, Callable[[list], str]]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+
+    def encode(rows: list) -> str:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows([_value(v) for v in row] for row in rows)
+        return buf.getvalue()
+
+    return encode([columns]), encode
+
+
+def _ndjson_encoder(columns: list[str]) -> tuple[str, Callable[[list], str]]:
+    def encode(rows: list) -> str:
+        return "".join(
+            json.dumps({c: _value(v) for c, v in zip(columns, row)}, default=str) + "\n"
+            for row in rows
+        )
+    return "", encode
+
+
+async def stream_rows(
+    session_factory,
+    stmt,
+    fmt: str = "csv",
+    gzip: bool = False,
+) -> AsyncIterator[bytes]:
+    """
+    Encode `stmt`'s rows as CSV/NDJSON bytes. Opens its own session, since a
+    StreamingResponse outlives the request's dependencies.
+    """
+    columns = [c.name for c in stmt.selected_columns]
+    header, encode = (_csv_encoder if fmt == "csv" else _ndjson_encoder)(columns)
+    compressor = zlib.compressobj(EXPORT_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if gzip else None
+
+    def out(text: str) -> bytes:
+        data = text.encode()
+        return compressor.compress(data) if compressor else data
+
+    pending, size = [header], len(header)
+    async with session_factory() as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_YIELD_PER))
+        async for partition in result.partitions():
+            text = encode(partition)
+            pending.append(text)
+            size += len(text)
+            if size >= EXPORT_CHUNK_BYTES:
+                data = out("".join(pending))
+                pending, size = [], 0
+                if data:  # gzip may still be buffering
+                    yield data
+
+    data = out("".join(pending))
+    if compressor:
+        data += compressor.flush()
+    if data:
+        yield data
@@ -0,0 +1,249 @@
+import hashlib
+import json
+import logging
+from urllib.parse import urlencode
+from fastapi import Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from core.cache import TTLCache, get_async_redis, get_sync_redis
+from core.config import (
+    INTERVIEW_CACHE_BACKEND,
+    INTERVIEW_CACHE_TTL,
+    INTERVIEW_CACHE_MAX_SIZE,
+    INTERVIEW_CACHE_MAX_AGE,
+    REPLICA_MAX_LAG,
+)
+from database.connection import REPLICA_ENABLED
+from database.replica import is_replica
+from database.models import Interview, InterviewQuestions
+from schemas.interview import InterviewOut
+
+logger = logging.getLogger(__name__)
+
+# Interview reads are cached per interview *version*. Every question mutation
+# calls questions_changed() in its transaction, which bumps Interview.version
+# (changing ETags and orphaning old page entries) and rebuilds the stored
+# question snapshot; forget() then drops the interview and snapshot entries.
+INTERVIEW_KEY = "itv:{}"
+TOKEN_KEY = "itv:token:{}"
+PAGE_KEY = "itv:{}:v{}:q:{}"
+SNAPSHOT_KEY = "itv:{}:snapshot"
+# set by forget() while a replica may still serve the pre-write rows
+HOLD_KEY = "itv:{}:hold"
+
+_local = TTLCache(maxsize=INTERVIEW_CACHE_MAX_SIZE, ttl=INTERVIEW_CACHE_TTL)
+
+
+def _use_redis() -> bool:
+    return INTERVIEW_CACHE_BACKEND == "redis"
+
+
+async def _get(key: str):
+    if not _use_redis():
+        return _local.get(key)
+    try:
+        raw = await get_async_redis().get(key)
+    except Exception:
+        logger.warning("interview cache read failed", exc_info=True)
+        return None
+    return json.loads(raw) if raw is not None else None
+
+
+async def _set(key: str, value):
+    if not _use_redis():
+        _local.set(key, value)
+        return
+    try:
+        await get_async_redis().set(key, json.dumps(value), ex=int(INTERVIEW_CACHE_TTL))
+    except Exception:
+        logger.warning("interview cache write failed", exc_info=True)
+
+
+async def _cacheable(db: AsyncSession, interview_id: int) -> bool:
+    """Rows read from a replica right after a write may predate it; don't cache those."""
+    if not is_replica(db):
+        return True
+    return await _get(HOLD_KEY.format(interview_id)) is None
+
+
+# ------------------------------
+# INVALIDATION
+# ------------------------------
+SNAPSHOT_COLUMNS = (
+    InterviewQuestions.id,
+    InterviewQuestions.question_text,
+    InterviewQuestions.source,
+    InterviewQuestions.category,
+    InterviewQuestions.difficulty,
+)
+
+
+def _snapshot_stmt(interview_id: int):
+    return (
+        select(*SNAPSHOT_COLUMNS)
+        .where(InterviewQuestions.interview_id == interview_id)
+        .order_by(InterviewQuestions.id)
+    )
+
+
+def _bump_stmt(interview_id: int):
+    return update(Interview).where(Interview.id == interview_id).values(version=Interview.version + 1)
+
+
+def _store_snapshot_stmt(interview_id: int, questions: list[dict]):
+    return update(Interview).where(Interview.id == interview_id).values(questions_snapshot=json.dumps(questions))
+
+
+async def questions_changed(db: AsyncSession, interview_id: int):
+    """
+    Call inside the mutating transaction, before commit. Bumps the version
+    first (taking the interview row lock, so concurrent writers serialise) and
+    then rebuilds the question snapshot from the flushed state.
+    """
+    await db.execute(_bump_stmt(interview_id))
+    await db.flush()
+    questions = [dict(r._mapping) for r in await db.execute(_snapshot_stmt(interview_id))]
+    await db.execute(_store_snapshot_stmt(interview_id, questions))
+
+
+def questions_changed_sync(db: Session, interview_id: int):
+    db.execute(_bump_stmt(interview_id))
+    db.flush()
+    questions = [dict(r._mapping) for r in db.execute(_snapshot_stmt(interview_id))]
+    db.execute(_store_snapshot_stmt(interview_id, questions))
+
+
+def _forget_local(interview_id: int) -> tuple[tuple[str, str], str]:
+    keys = (INTERVIEW_KEY.format(interview_id), SNAPSHOT_KEY.format(interview_id))
+    hold = HOLD_KEY.format(interview_id)
+    for key in keys:
+        _local.delete(key)
+    if REPLICA_ENABLED:
+        _local.set(hold, True, ttl=REPLICA_MAX_LAG)
+    return keys, hold
+
+
+def _forget_pipeline(pipe, keys: tuple[str, str], hold: str):
+    pipe.delete(*keys)
+    if REPLICA_ENABLED:
+        pipe.set(hold, 1, px=int(REPLICA_MAX_LAG * 1000))
+    return pipe
+
+
+async def forget(interview_id: int):
+    """Call after commit so readers reload the new version."""
+    keys, hold = _forget_local(interview_id)
+    if _use_redis():
+        try:
+            await _forget_pipeline(get_async_redis().pipeline(), keys, hold).execute()
+        except Exception:
+            logger.warning("interview cache invalidation failed for %s", interview_id, exc_info=True)
+
+
+def forget_sync(interview_id: int):
+    """forget() for Celery tasks and other sync callers."""
+    keys, hold = _forget_local(interview_id)
+    if _use_redis():
+        try:
+            _forget_pipeline(get_sync_redis().pipeline(), keys, hold).execute()
+        except Exception:
+            logger.warning("interview cache invalidation failed for %s", interview_id, exc_info=True)
+
+
+# ------------------------------
+# LOOKUPS
+# ------------------------------
+def _entry(interview: Interview) -> dict:
+    return {
+        "id": interview.id,
+        "version": interview.version,
+        "created_by": interview.created_by,
+        "etag": f'W/"itv{interview.id}-v{interview.version}"',
+        "body": InterviewOut.model_validate(interview).model_dump_json(),
+    }
+
+
+async def get_interview_entry(db: AsyncSession, interview_id: int) -> dict | None:
+    entry = await _get(INTERVIEW_KEY.format(interview_id))
+    if entry is None:
+        interview = await db.scalar(select(Interview).where(Interview.id == interview_id))
+        if not interview:
+            return None
+        entry = _entry(interview)
+        if await _cacheable(db, interview_id):
+            await _set(INTERVIEW_KEY.format(interview_id), entry)
+    return entry
+
+
+async def get_interview_entry_by_token(db: AsyncSession, link_token: str) -> dict | None:
+    interview_id = await _get(TOKEN_KEY.format(link_token))
+    if interview_id is None:
+        interview_id = await db.scalar(select(Interview.id).where(Interview.link_token == link_token))
+        if interview_id is None:
+            return None
+        await _set(TOKEN_KEY.format(link_token), interview_id)
+    return await get_interview_entry(db, interview_id)
+
+
+async def get_snapshot(db: AsyncSession, interview_id: int) -> list[dict] | None:
+    """
+    The interview's full question set as plain dicts, ordered by id.
+    None if the interview does not exist.
+    """
+    snapshot = await _get(SNAPSHOT_KEY.format(interview_id))
+    if snapshot is None:
+        row = (await db.execute(
+            select(Interview.questions_snapshot).where(Interview.id == interview_id)
+        )).first()
+        if row is None:
+            return None
+        if row.questions_snapshot is not None:
+            snapshot = json.loads(row.questions_snapshot)
+        else:
+            # interview predates snapshots; build it on the fly until the next mutation
+            snapshot = [dict(r._mapping) for r in await db.execute(_snapshot_stmt(interview_id))]
+        if await _cacheable(db, interview_id):
+            await _set(SNAPSHOT_KEY.format(interview_id), snapshot)
+    return snapshot
+
+
+def _query_digest(request: Request) -> str:
+    query = urlencode(sorted(request.query_params.multi_items()))
+    return hashlib.sha1(query.encode()).hexdigest()[:16]
+
+
+def page_etag(entry: dict, request: Request) -> str:
+    return f'W/"itv{entry["id"]}-v{entry["version"]}-{_query_digest(request)}"'
+
+
+async def get_page(entry: dict, request: Request) -> str | None:
+    return await _get(PAGE_KEY.format(entry["id"], entry["version"], _query_digest(request)))
+
+
+async def set_page(db: AsyncSession, entry: dict, request: Request, body: str):
+    # entry may be newer than what a lagging replica just returned
+    if await _cacheable(db, entry["id"]):
+        await _set(PAGE_KEY.format(entry["id"], entry["version"], _query_digest(request)), body)
+
+
+# ------------------------------
+# CONDITIONAL RESPONSES
+# ------------------------------
+def _headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": f"private, max-age={INTERVIEW_CACHE_MAX_AGE}, must-revalidate"}
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {t.strip() for t in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates or etag.removeprefix("W/") in candidates
+
+
+def cached_response(request: Request, etag: str, body: str | None = None) -> Response:
+    """304 when the client already has `etag`, else the JSON body with caching headers."""
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers=_headers(etag))
+    return Response(content=body, media_type="application/json", headers=_headers(etag))
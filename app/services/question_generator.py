@@ -1,4 +1,25 @@
-def generate_resume_based_questions(resume_text: str) -> list[dict]:
+import hashlib
+import json
+import logging
+import re
+from concurrent.futures import Future
+from threading import Lock
+from core.cache import TTLCache, get_sync_redis
+from core.config import (
+    QUESTION_GENERATION_COUNT,
+    QUESTION_CACHE_BACKEND,
+    QUESTION_CACHE_TTL,
+    QUESTION_CACHE_MAX_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def generate_resume_based_questions(
+    resume_text: str,
+    job_description: str | None = None,
+    count: int = QUESTION_GENERATION_COUNT,
+) -> list[dict]:
     # Dummy logic; replace with your HF model output later
     base = [
         {"question_text": "Walk me through your most impactful project.", "category": "projects", "difficulty": "medium"},
@@ -8,4 +29,103 @@ def generate_resume_based_questions(resume_text: str) -> list[dict]:
         {"question_text": "How do you stay updated with industry trends?", "category": "general", "difficulty": "easy"},
     ]
     # You can parse resume_text to tweak categories later
-    return base
+    return base[:count]
+
+
+# ------------------------------
+# GENERATION CACHE
+# ------------------------------
+REDIS_KEY = "questions:{}"
+
+_local = TTLCache(maxsize=QUESTION_CACHE_MAX_SIZE, ttl=QUESTION_CACHE_TTL)
+_inflight: dict[str, Future] = {}
+_inflight_lock = Lock()
+_stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+
+
+def _normalize(text: str | None) -> str:
+    return re.sub(r"\s+", " ", text or "").strip().lower()
+
+
+def fingerprint(resume_text: str, job_description: str | None, count: int) -> str:
+    raw = "\x1f".join([_normalize(resume_text), _normalize(job_description), str(count)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _cache_get(key: str) -> list[dict] | None:
+    questions = _local.get(key)
+    if questions is not None:
+        _stats["local_hits"] += 1
+        return questions
+    if QUESTION_CACHE_BACKEND == "redis":
+        try:
+            raw = get_sync_redis().get(REDIS_KEY.format(key))
+        except Exception:
+            logger.warning("question cache read failed", exc_info=True)
+            raw = None
+        if raw is not None:
+            questions = json.loads(raw)
+            _local.set(key, questions)
+            _stats["redis_hits"] += 1
+            return questions
+    return None
+
+
+def _cache_set(key: str, questions: list[dict]):
+    _local.set(key, questions)
+    if QUESTION_CACHE_BACKEND == "redis":
+        try:
+            get_sync_redis().set(REDIS_KEY.format(key), json.dumps(questions), ex=int(QUESTION_CACHE_TTL))
+        except Exception:
+            logger.warning("question cache write failed", exc_info=True)
+
+
+def get_or_generate_questions(
+    resume_text: str,
+    job_description: str | None = None,
+    count: int = QUESTION_GENERATION_COUNT,
+) -> list[dict]:
+    """
+    Cached generate_resume_based_questions. Identical concurrent calls in this
+    process share one in-flight generation (single-flight) instead of each
+    hitting the generator.
+    """
+    key = fingerprint(resume_text, job_description, count)
+    questions = _cache_get(key)
+    if questions is None:
+        with _inflight_lock:
+            future = _inflight.get(key)
+            leader = future is None
+            if leader:
+                future = _inflight[key] = Future()
+
+        if not leader:
+            _stats["coalesced"] += 1
+            questions = future.result()
+        else:
+            _stats["misses"] += 1
+            try:
+                questions = generate_resume_based_questions(resume_text, job_description, count)
+                _cache_set(key, questions)
+                future.set_result(questions)
+            except BaseException as e:
+                _stats["errors"] += 1
+                future.set_exception(e)
+                raise
+            finally:
+                with _inflight_lock:
+                    _inflight.pop(key, None)
+
+    # callers get their own dicts so they can't mutate the cached copy
+    return [dict(q) for q in questions]
+
+
+def cache_metrics() -> dict:
+    lookups = _stats["local_hits"] + _stats["redis_hits"] + _stats["misses"] + _stats["coalesced"]
+    hits = lookups - _stats["misses"]
+    return {
+        **_stats,
+        "hit_ratio": round(hits / lookups, 3) if lookups else None,
+        "local_size": len(_local),
+        "backend": QUESTION_CACHE_BACKEND,
+    }
@@ -0,0 +1,116 @@
+from datetime import datetime
+from typing import Iterable
+from fastapi import HTTPException
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.compiler import InsertmanyvaluesSentinelOpts
+from database.models import InterviewQuestions
+from schemas.question import QuestionOut
+
+# columns QuestionOut needs back from the INSERT ... RETURNING
+_RETURNING = (
+    InterviewQuestions.id,
+    InterviewQuestions.question_text,
+    InterviewQuestions.category,
+    InterviewQuestions.difficulty,
+    InterviewQuestions.created_at,
+    InterviewQuestions.interview_id,
+)
+
+
+def build_question_rows(
+    questions: Iterable[dict],
+    interview_id: int,
+    created_by: int,
+    source: str = "resume",
+    category: str | None = None,
+    difficulty: str | None = "medium",
+) -> list[dict]:
+    """Normalise generator/import dicts into insert parameter rows."""
+    now = datetime.utcnow()
+    return [
+        {
+            "interview_id": interview_id,
+            "question_text": q["question_text"],
+            "category": q.get("category") or category,
+            "difficulty": q.get("difficulty") or difficulty,
+            "source": q.get("source") or source,
+            "created_by": created_by,
+            "created_at": now,
+        }
+        for q in questions
+    ]
+
+
+async def bulk_insert_questions(db: AsyncSession, rows: list[dict]) -> list[QuestionOut]:
+    """Insert all rows in one executemany round-trip; caller commits. Output is in `rows` order."""
+    if not rows:
+        return []
+    stmt = insert(InterviewQuestions)
+    if db.get_bind().dialect.insertmanyvalues_implicit_sentinel & InsertmanyvaluesSentinelOpts.AUTOINCREMENT:
+        result = list(await db.execute(stmt.returning(*_RETURNING, sort_by_parameter_order=True), rows))
+    else:
+        # e.g. SQLite, where sort_by_parameter_order falls back to one INSERT
+        # per row; ids are assigned in VALUES order there, so sort on them
+        result = sorted(await db.execute(stmt.returning(*_RETURNING), rows), key=lambda r: r.id)
+    return [QuestionOut.model_validate(dict(r._mapping)) for r in result]
+
+
+def bulk_insert_questions_sync(db: Session, rows: list[dict]) -> int:
+    """Sync variant for Celery tasks; caller commits."""
+    if rows:
+        db.execute(insert(InterviewQuestions), rows)
+    return len(rows)
+
+
+# ------------------------------
+# KEYSET LISTING
+# ------------------------------
+QUESTION_FIELDS = ("id", "question_text", "category", "difficulty", "source", "created_at", "interview_id")
+
+
+def parse_fields(fields: str | None, default: Iterable[str] = QUESTION_FIELDS) -> list[str]:
+    """Validate a comma-separated `fields=` projection; `id` is always included for the cursor."""
+    if not fields:
+        return list(default)
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = set(requested) - set(QUESTION_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return ["id"] + [f for f in dict.fromkeys(requested) if f != "id"]
+
+
+async def list_questions(
+    db: AsyncSession,
+    interview_id: int,
+    fields: list[str],
+    limit: int,
+    cursor: int | None = None,
+    category: str | None = None,
+    difficulty: str | None = None,
+    source: str | None = None,
+) -> tuple[list[dict], int | None]:
+    """
+    One page of an interview's questions ordered by id, selecting only `fields`.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    stmt = select(*(getattr(InterviewQuestions, f) for f in fields)).where(
+        InterviewQuestions.interview_id == interview_id
+    )
+    if cursor is not None:
+        stmt = stmt.where(InterviewQuestions.id > cursor)
+    if category is not None:
+        stmt = stmt.where(InterviewQuestions.category == category)
+    if difficulty is not None:
+        stmt = stmt.where(InterviewQuestions.difficulty == difficulty)
+    if source is not None:
+        stmt = stmt.where(InterviewQuestions.source == source)
+    # fetch one extra row to learn whether another page exists
+    stmt = stmt.order_by(InterviewQuestions.id).limit(limit + 1)
+
+    rows = [dict(r._mapping) for r in await db.execute(stmt)]
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1]["id"]
+    return rows, None
@@ -1,20 +1,159 @@
-from fastapi import UploadFile, HTTPException
+import hashlib
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import BinaryIO
 from PyPDF2 import PdfReader
-import io
+from core.cache import TTLCache, get_sync_redis
+from core.config import (
+    RESUME_PARSE_MAX_PAGES,
+    RESUME_PARSE_TIMEOUT,
+    RESUME_PARSE_WORKERS,
+    RESUME_PARSE_PARALLEL_MIN_PAGES,
+    RESUME_TEXT_CACHE_BACKEND,
+    RESUME_TEXT_CACHE_TTL,
+    RESUME_TEXT_CACHE_MAX_SIZE,
+)
 
-def extract_text_from_file(file: UploadFile) -> str:
-    filename = (file.filename or "").lower()
-    data = file.file.read()
-    if not data:
-        raise HTTPException(status_code=400, detail="Empty file")
+logger = logging.getLogger(__name__)
 
-    if filename.endswith(".pdf"):
-        reader = PdfReader(io.BytesIO(data))
-        texts = []
-        for page in reader.pages:
-            texts.append(page.extract_text() or "")
-        return "\n".join(texts).strip()
+CHUNK_SIZE = 1024 * 1024
+REDIS_KEY = "resume_text:{}"
+
+# ------------------------------
+# TEXT CACHE (keyed by sha256 of the file bytes)
+# ------------------------------
+_local = TTLCache(maxsize=RESUME_TEXT_CACHE_MAX_SIZE, ttl=RESUME_TEXT_CACHE_TTL)
+
+
+def get_cached_text(sha256: str) -> str | None:
+    text = _local.get(sha256)
+    if text is not None or RESUME_TEXT_CACHE_BACKEND != "redis":
+        return text
+    try:
+        text = get_sync_redis().get(REDIS_KEY.format(sha256))
+    except Exception:
+        logger.warning("resume text cache read failed", exc_info=True)
+        return None
+    if text is not None:
+        _local.set(sha256, text)
+    return text
+
+
+def set_cached_text(sha256: str, text: str):
+    _local.set(sha256, text)
+    if RESUME_TEXT_CACHE_BACKEND == "redis":
+        try:
+            get_sync_redis().set(REDIS_KEY.format(sha256), text, ex=int(RESUME_TEXT_CACHE_TTL))
+        except Exception:
+            logger.warning("resume text cache write failed", exc_info=True)
+
+
+# ------------------------------
+# PDF EXTRACTION
+# ------------------------------
+def _extract_page_range(path: str, start: int, stop: int, deadline: float) -> list[str]:
+    """Extract pages [start, stop) one at a time, giving up once the deadline passes."""
+    reader = PdfReader(path)
+    texts = []
+    for i in range(start, stop):
+        if time.time() > deadline:
+            break
+        texts.append(reader.pages[i].extract_text() or "")
+    return texts
+
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def _get_pool() -> ProcessPoolExecutor | None:
+    global _pool
+    # daemonic processes (e.g. Celery prefork children) may not spawn their own
+    if RESUME_PARSE_WORKERS <= 1 or multiprocessing.current_process().daemon:
+        return None
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=RESUME_PARSE_WORKERS)
+    return _pool
 
+
+def extract_pdf_text(path: str) -> str:
+    deadline = time.time() + RESUME_PARSE_TIMEOUT
+    num_pages = min(len(PdfReader(path).pages), RESUME_PARSE_MAX_PAGES)
+
+    pool = _get_pool() if num_pages >= RESUME_PARSE_PARALLEL_MIN_PAGES else None
+    if pool is None:
+        texts = _extract_page_range(path, 0, num_pages, deadline)
     else:
-        # treat as plain text
-        return data.decode("utf-8", errors="ignore").strip()
+        step = -(-num_pages // RESUME_PARSE_WORKERS)
+        futures = [
+            pool.submit(_extract_page_range, path, start, min(start + step, num_pages), deadline)
+            for start in range(0, num_pages, step)
+        ]
+        texts = []
+        for i, f in enumerate(futures):
+            try:
+                texts.extend(f.result(timeout=max(deadline - time.time(), 0) + 5))
+            except FutureTimeoutError:
+                # a worker that overran the deadline truncates, it doesn't fail the document
+                logger.warning("pdf extraction timed out after %d of %d chunks: %s", i, len(futures), path)
+                for pending in futures[i:]:
+                    pending.cancel()
+                break
+    return "\n".join(texts).strip()
+
+
+def _materialize(fileobj: BinaryIO) -> tuple[str, str, bool]:
+    """
+    Hash the file in chunks and make sure it is on disk (PdfReader needs a
+    seekable source). Returns (path, sha256, is_temp).
+    """
+    digest = hashlib.sha256()
+    name = getattr(fileobj, "name", None)
+    if isinstance(name, str) and os.path.isfile(name):
+        while chunk := fileobj.read(CHUNK_SIZE):
+            digest.update(chunk)
+        return name, digest.hexdigest(), False
+
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".upload")
+    with tmp:
+        while chunk := fileobj.read(CHUNK_SIZE):
+            digest.update(chunk)
+            tmp.write(chunk)
+    return tmp.name, digest.hexdigest(), True
+
+
+def extract_text(fileobj: BinaryIO, filename: str | None, sha256: str | None = None) -> str:
+    """
+    Extract text from a resume. Results are cached by content hash, so the same
+    file uploaded to several interviews is parsed once. Pass `sha256` when it is
+    already known (computed at upload) to skip reading the file on a cache hit.
+    """
+    if sha256:
+        cached = get_cached_text(sha256)
+        if cached is not None:
+            return cached
+
+    path, digest, is_temp = _materialize(fileobj)
+    try:
+        cached = get_cached_text(digest)
+        if cached is not None:
+            return cached
+
+        if os.path.getsize(path) == 0:
+            raise ValueError("Empty file")
+
+        if (filename or "").lower().endswith(".pdf"):
+            text = extract_pdf_text(path)
+        else:
+            # treat as plain text
+            with open(path, "rb") as fh:
+                text = fh.read().decode("utf-8", errors="ignore").strip()
+    finally:
+        if is_temp:
+            os.remove(path)
+
+    set_cached_text(digest, text)
+    return text
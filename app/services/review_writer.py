@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from datetime import datetime
+from sqlalchemy.dialects import postgresql, sqlite
+from database.connection import AsyncSessionLocal
+from database.models import PerformanceReview
+from core.config import REVIEW_WRITER_MAX_BATCH, REVIEW_WRITER_FLUSH_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+_UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class ReviewWriter:
+    """
+    Group-commits PerformanceReview upserts. Webhook calls submit() and wait
+    until their rows are committed, but rows arriving within the same
+    flush interval share one INSERT ... ON CONFLICT and one commit.
+    """
+
+    def __init__(self, max_batch: int = REVIEW_WRITER_MAX_BATCH, flush_interval: float = REVIEW_WRITER_FLUSH_INTERVAL):
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._buffer: list[tuple[dict, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._lock = asyncio.Lock()
+
+    async def submit(self, rows: list[dict]):
+        loop = asyncio.get_running_loop()
+        futures = []
+        for row in rows:
+            fut = loop.create_future()
+            self._buffer.append((row, fut))
+            futures.append(fut)
+
+        if len(self._buffer) >= self.max_batch:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.flush_interval, lambda: asyncio.ensure_future(self.flush()))
+        await asyncio.gather(*futures)
+
+    async def flush(self):
+        async with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            batch, self._buffer = self._buffer, []
+            if not batch:
+                return
+            # last result per session wins (ON CONFLICT can't touch a row twice)
+            rows = {row["session_id"]: row for row, _ in batch}
+            try:
+                await self._upsert(list(rows.values()))
+            except Exception as e:
+                logger.exception("review upsert of %s rows failed", len(rows))
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                return
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_result(None)
+
+    async def _upsert(self, rows: list[dict]):
+        async with AsyncSessionLocal() as db:
+            insert = _UPSERT_DIALECTS[db.bind.dialect.name]
+            stmt = insert(PerformanceReview)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[PerformanceReview.session_id],
+                set_={
+                    "overall_score": stmt.excluded.overall_score,
+                    "strengths": stmt.excluded.strengths,
+                    "weakness": stmt.excluded.weakness,
+                    "created_at": stmt.excluded.created_at,
+                },
+            )
+            await db.execute(stmt, rows)
+            await db.commit()
+
+
+def review_row(session_id: int, overall_score: int, strengths: list[str], weaknesses: list[str]) -> dict:
+    return {
+        "session_id": session_id,
+        "overall_score": overall_score,
+        "strengths": ", ".join(strengths),
+        "weakness": ", ".join(weaknesses),
+        "created_at": datetime.utcnow(),
+    }
+
+
+review_writer = ReviewWriter()
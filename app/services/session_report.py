@@ -0,0 +1,246 @@
+import itertools
+import json
+import logging
+from sqlalchemy import Integer, cast, distinct, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.cache import TTLCache, get_async_redis
+from core.config import (
+    REPORT_CACHE_BACKEND,
+    REPORT_CACHE_TTL,
+    REPORT_CACHE_MAX_SIZE,
+    REPORT_PERCENTILES,
+)
+from database.models import Answers, InterviewSession, PerformanceReview, Users
+
+logger = logging.getLogger(__name__)
+
+# Per-interview session results, computed entirely in SQL. An interview's
+# cohort is every session started for it (InterviewSession.interview_id),
+# including ones with no answers yet. Cached pages are keyed by a
+# per-interview generation that invalidate_sessions() bumps when new reviews
+# arrive. In memory, generations come from one process-wide counter, so an
+# interview whose entry expired or was evicted gets a fresh generation rather
+# than reusing an old one with pages still cached under it.
+GEN_KEY = "report:{}:gen"
+PAGE_KEY = "report:{}:g{}:{}"
+
+_local = TTLCache(maxsize=REPORT_CACHE_MAX_SIZE, ttl=REPORT_CACHE_TTL)
+_generations = TTLCache(maxsize=REPORT_CACHE_MAX_SIZE, ttl=REPORT_CACHE_TTL)
+_generation_counter = itertools.count(1)
+
+
+def _use_redis() -> bool:
+    return REPORT_CACHE_BACKEND == "redis"
+
+
+# ------------------------------
+# CACHE
+# ------------------------------
+async def _generation(interview_id: int) -> int:
+    if not _use_redis():
+        gen = _generations.get(interview_id)
+        if gen is None:
+            gen = next(_generation_counter)
+            _generations.set(interview_id, gen)
+        return gen
+    try:
+        return int(await get_async_redis().get(GEN_KEY.format(interview_id)) or 0)
+    except Exception:
+        logger.warning("report generation read failed", exc_info=True)
+        return -1  # don't cache when we can't tell what's current
+
+
+async def _get(key: str):
+    if not _use_redis():
+        return _local.get(key)
+    try:
+        raw = await get_async_redis().get(key)
+    except Exception:
+        logger.warning("report cache read failed", exc_info=True)
+        return None
+    return json.loads(raw) if raw is not None else None
+
+
+async def _set(key: str, value):
+    if not _use_redis():
+        _local.set(key, value)
+        return
+    try:
+        await get_async_redis().set(key, json.dumps(value), ex=int(REPORT_CACHE_TTL))
+    except Exception:
+        logger.warning("report cache write failed", exc_info=True)
+
+
+async def invalidate_sessions(db: AsyncSession, session_ids) -> list[int]:
+    """Bump the report generation of every interview these sessions belong to."""
+    session_ids = list(session_ids)
+    if not session_ids:
+        return []
+    interview_ids = list((await db.scalars(
+        select(InterviewSession.interview_id)
+        .where(InterviewSession.id.in_(session_ids), InterviewSession.interview_id.is_not(None))
+        .distinct()
+    )).all())
+    if not _use_redis():
+        for interview_id in interview_ids:
+            _generations.set(interview_id, next(_generation_counter))
+        return interview_ids
+    try:
+        pipe = get_async_redis().pipeline()
+        for interview_id in interview_ids:
+            pipe.incr(GEN_KEY.format(interview_id))
+        await pipe.execute()
+    except Exception:
+        logger.warning("report invalidation failed for %s", interview_ids, exc_info=True)
+    return interview_ids
+
+
+# ------------------------------
+# QUERIES
+# ------------------------------
+def _duration_seconds(dialect: str):
+    if dialect == "postgresql":
+        return func.extract("epoch", InterviewSession.end_time - InterviewSession.start_time)
+    # sqlite (and anything else with julianday)
+    return (func.julianday(InterviewSession.end_time) - func.julianday(InterviewSession.start_time)) * 86400
+
+
+def _answer_counts():
+    """Per-session answer counts, correlated so each is an ix_answers_session_id lookup."""
+    def count(expr, name):
+        return (
+            select(expr)
+            .where(Answers.session_id == InterviewSession.id)
+            .correlate(InterviewSession)
+            .scalar_subquery()
+            .label(name)
+        )
+    return (
+        count(func.count(Answers.id), "answer_count"),
+        count(func.count(distinct(Answers.question_id)), "questions_answered"),
+    )
+
+
+def _rows(interview_id: int, dialect: str):
+    """One row per session, with rank/percentile windows over the whole cohort."""
+    score = PerformanceReview.overall_score
+    return (
+        select(
+            InterviewSession.id.label("session_id"),
+            InterviewSession.user_id,
+            Users.username,
+            Users.email,
+            InterviewSession.start_time,
+            InterviewSession.end_time,
+            _duration_seconds(dialect).label("duration_seconds"),
+            *_answer_counts(),
+            score.label("overall_score"),
+            # NULL scores (not evaluated yet) get no rank
+            func.rank().over(partition_by=score.is_(None), order_by=score.desc()).label("score_rank"),
+            func.percent_rank().over(partition_by=score.is_(None), order_by=score).label("score_percentile"),
+        )
+        .join(Users, Users.id == InterviewSession.user_id, isouter=True)
+        .join(PerformanceReview, PerformanceReview.session_id == InterviewSession.id, isouter=True)
+        .where(InterviewSession.interview_id == interview_id)
+        .subquery("results")
+    )
+
+
+async def _percentiles(db: AsyncSession, rows, column, dialect: str) -> dict:
+    col = rows.c[column]
+    if dialect == "postgresql":
+        values = (await db.execute(select(*[
+            func.percentile_cont(p).within_group(col).label(f"p{int(p * 100)}")
+            for p in REPORT_PERCENTILES
+        ]).where(col.is_not(None)))).one()
+        return {f"p{int(p * 100)}": _num(v) for p, v in zip(REPORT_PERCENTILES, values)}
+
+    # no percentile_cont: nearest-rank, picking every requested rank in one pass
+    ranked = (
+        select(
+            col.label("value"),
+            func.row_number().over(order_by=col).label("rn"),
+            func.count().over().label("n"),
+        )
+        .where(col.is_not(None))
+        .subquery("ranked")
+    )
+    picked = (await db.execute(select(ranked).where(or_(*[
+        ranked.c.rn - 1 == cast(p * (ranked.c.n - 1), Integer) for p in REPORT_PERCENTILES
+    ])))).all()
+    if not picked:
+        return {f"p{int(p * 100)}": None for p in REPORT_PERCENTILES}
+    n = picked[0].n
+    by_rank = {r.rn - 1: r.value for r in picked}
+    return {f"p{int(p * 100)}": _num(by_rank.get(int(p * (n - 1)))) for p in REPORT_PERCENTILES}
+
+
+async def _summary(db: AsyncSession, rows, dialect: str) -> dict:
+    stats = (await db.execute(select(
+        func.count().label("sessions"),
+        func.count(rows.c.overall_score).label("evaluated"),
+        func.avg(rows.c.overall_score).label("avg_score"),
+        func.min(rows.c.overall_score).label("min_score"),
+        func.max(rows.c.overall_score).label("max_score"),
+        func.avg(rows.c.duration_seconds).label("avg_duration_seconds"),
+        func.avg(rows.c.answer_count).label("avg_answer_count"),
+    ))).one()
+    summary = {k: _num(v) for k, v in stats._mapping.items()}
+    summary["score_percentiles"] = await _percentiles(db, rows, "overall_score", dialect)
+    summary["duration_percentiles"] = await _percentiles(db, rows, "duration_seconds", dialect)
+    return summary
+
+
+def _num(value):
+    # Decimal/float from avg() and friends, rounded so the cache can hold it as JSON
+    return round(float(value), 4) if value is not None and not isinstance(value, int) else value
+
+
+def _jsonable(row) -> dict:
+    data = dict(row._mapping)
+    for key in ("start_time", "end_time"):
+        if data[key] is not None:
+            data[key] = data[key].isoformat()
+    for key in ("duration_seconds", "score_percentile"):
+        data[key] = _num(data[key])
+    if data["overall_score"] is None:
+        data["score_rank"] = data["score_percentile"] = None
+    return data
+
+
+async def session_results(
+    db: AsyncSession,
+    interview_id: int,
+    *,
+    limit: int,
+    cursor: int | None = None,
+) -> dict:
+    """
+    One page of sessions ordered by session id (keyset on `cursor`), plus
+    cohort-wide aggregates on the first page.
+    """
+    gen = await _generation(interview_id)
+    key = PAGE_KEY.format(interview_id, gen, f"{cursor}:{limit}")
+    if gen >= 0:
+        cached = await _get(key)
+        if cached is not None:
+            return cached
+
+    dialect = db.get_bind().dialect.name
+    rows = _rows(interview_id, dialect)
+    page_q = select(rows).order_by(rows.c.session_id).limit(limit + 1)
+    if cursor is not None:
+        page_q = page_q.where(rows.c.session_id > cursor)
+    page = [_jsonable(r) for r in await db.execute(page_q)]
+    next_cursor = page[limit - 1]["session_id"] if len(page) > limit else None
+
+    report = {
+        "interview_id": interview_id,
+        "items": page[:limit],
+        "next_cursor": next_cursor,
+    }
+    if cursor is None:
+        report["summary"] = await _summary(db, rows, dialect)
+    if gen >= 0:
+        await _set(key, report)
+    return report
@@ -1,12 +1,321 @@
-import os, uuid
+import os, uuid, hashlib, shutil, tempfile, time
+from dataclasses import dataclass
+from typing import AsyncIterator, BinaryIO
+import aiofiles
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from core.config import (
+    UPLOAD_DIR,
+    UPLOAD_CHUNK_SIZE,
+    STORAGE_BACKEND,
+    S3_BUCKET,
+    S3_ENDPOINT_URL,
+    S3_REGION,
+    S3_ACCESS_KEY_ID,
+    S3_SECRET_ACCESS_KEY,
+    PRESIGNED_URL_EXPIRY,
+)
 
-UPLOAD_DIR = "uploads"
 
-def save_upload_file(file):
-    os.makedirs(UPLOAD_DIR, exist_ok=True)
-    filename = f"{uuid.uuid4()}_{file.filename}"
-    filepath = os.path.join(UPLOAD_DIR, filename)
+@dataclass
+class StoredFile:
+    key: str
+    size: int
+    sha256: str | None = None
 
-    with open(filepath, "wb") as buffer:
-        buffer.write(file.file.read())
-    return filepath
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"File exceeds {max_bytes} bytes")
+
+
+def normalize_key(key: str) -> str:
+    """
+    Canonical object key: "/"-separated, relative, no empty/"."/".." segments.
+    Anything else is rejected rather than cleaned up, since keys can come
+    from clients.
+    """
+    parts = key.split("/") if key else []
+    if not parts or "\\" in key or any(p in ("", ".", "..") for p in parts):
+        raise HTTPException(status_code=400, detail="Invalid storage key")
+    return "/".join(parts)
+
+
+def build_key(filename: str | None, subdir: str | None = None) -> str:
+    name = f"{uuid.uuid4()}_{os.path.basename(filename or 'upload')}"
+    return f"{subdir.strip('/')}/{name}" if subdir else name
+
+
+# ------------------------------
+# LOCAL DISK
+# ------------------------------
+class LocalStorage:
+    # keys for this backend are only ever minted server-side
+    accepts_client_keys = False
+
+    def __init__(self, root: str = UPLOAD_DIR):
+        self.root = root
+
+    def path(self, key: str) -> str:
+        root = os.path.realpath(self.root)
+        path = os.path.realpath(os.path.join(root, *normalize_key(key).split("/")))
+        if os.path.commonpath([root, path]) != root:
+            raise HTTPException(status_code=400, detail="Invalid storage key")
+        return path
+
+    async def save(self, file: UploadFile, key: str, max_bytes: int | None = None) -> StoredFile:
+        """
+        Stream an upload to disk in fixed-size chunks, hashing as it goes.
+        Aborts with 413 (and removes the partial file) once max_bytes is exceeded.
+        """
+        filepath = self.path(key)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+        # the file may already have been read (e.g. for text extraction)
+        await file.seek(0)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async with aiofiles.open(filepath, "wb") as buffer:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise _too_large(max_bytes)
+                    digest.update(chunk)
+                    await buffer.write(chunk)
+        except BaseException:
+            if os.path.exists(filepath):
+                os.remove(filepath)
+            raise
+        return StoredFile(key=key, size=size, sha256=digest.hexdigest())
+
+    def open(self, key: str) -> BinaryIO:
+        return open(self.path(key), "rb")
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self.path(key))
+
+    def delete(self, key: str):
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def presigned_post(self, key: str, max_bytes: int, content_type: str | None = None) -> dict:
+        raise HTTPException(status_code=501, detail="Direct uploads need STORAGE_BACKEND=s3")
+
+    # -- resumable uploads: parts are staged on disk and concatenated on completion --
+    def _parts_dir(self, upload_token: str) -> str:
+        return os.path.join(self.root, ".parts", upload_token)
+
+    def create_multipart(self, key: str) -> str:
+        upload_token = uuid.uuid4().hex
+        os.makedirs(self._parts_dir(upload_token), exist_ok=True)
+        return upload_token
+
+    async def write_part(
+        self, key: str, upload_token: str, index: int, stream: AsyncIterator[bytes], max_bytes: int
+    ) -> int:
+        parts_dir = self._parts_dir(upload_token)
+        part_path = os.path.join(parts_dir, f"{index}.part")
+        # unique temp per write: concurrent retries of one part must not share a file
+        fd, tmp_path = tempfile.mkstemp(dir=parts_dir, prefix=f"{index}.", suffix=".tmp")
+        os.close(fd)
+        size = 0
+        try:
+            async with aiofiles.open(tmp_path, "wb") as buffer:
+                async for chunk in stream:
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise _too_large(max_bytes)
+                    await buffer.write(chunk)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        # rename so a half-written retry never counts as a received part
+        os.replace(tmp_path, part_path)
+        return size
+
+    def list_parts(self, key: str, upload_token: str) -> dict[int, int]:
+        parts_dir = self._parts_dir(upload_token)
+        if not os.path.isdir(parts_dir):
+            return {}
+        return {
+            int(name.removesuffix(".part")): os.path.getsize(os.path.join(parts_dir, name))
+            for name in os.listdir(parts_dir)
+            if name.endswith(".part")
+        }
+
+    def complete_multipart(self, key: str, upload_token: str, total_parts: int) -> StoredFile:
+        parts_dir = self._parts_dir(upload_token)
+        filepath = self.path(key)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        with open(filepath, "wb") as out:
+            for index in range(total_parts):
+                with open(os.path.join(parts_dir, f"{index}.part"), "rb") as part:
+                    while chunk := part.read(UPLOAD_CHUNK_SIZE):
+                        size += len(chunk)
+                        digest.update(chunk)
+                        out.write(chunk)
+        shutil.rmtree(parts_dir, ignore_errors=True)
+        return StoredFile(key=key, size=size, sha256=digest.hexdigest())
+
+    def abort_multipart(self, key: str, upload_token: str):
+        shutil.rmtree(self._parts_dir(upload_token), ignore_errors=True)
+
+    def expire_parts(self, max_age: float) -> int:
+        """Remove staging dirs untouched for max_age seconds (abandoned uploads)."""
+        parts_root = os.path.join(self.root, ".parts")
+        if not os.path.isdir(parts_root):
+            return 0
+        cutoff, removed = time.time() - max_age, 0
+        for entry in os.scandir(parts_root):
+            if entry.is_dir(follow_symlinks=False) and entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+        return removed
+
+
+# ------------------------------
+# S3-COMPATIBLE (AWS / MinIO)
+# ------------------------------
+class _HashingReader:
+    """File-like wrapper that hashes and size-checks bytes as boto3 pulls them."""
+
+    def __init__(self, fileobj: BinaryIO, max_bytes: int | None):
+        self.fileobj = fileobj
+        self.max_bytes = max_bytes
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.fileobj.read(size)
+        self.size += len(chunk)
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            raise _too_large(self.max_bytes)
+        self.digest.update(chunk)
+        return chunk
+
+
+class S3Storage:
+    # presigned uploads: the client reports the key it uploaded to
+    accepts_client_keys = True
+
+    def __init__(
+        self,
+        bucket: str = S3_BUCKET,
+        endpoint_url: str | None = S3_ENDPOINT_URL,
+        region: str | None = S3_REGION,
+        access_key_id: str | None = S3_ACCESS_KEY_ID,
+        secret_access_key: str | None = S3_SECRET_ACCESS_KEY,
+    ):
+        import boto3
+        from botocore.config import Config
+
+        self.bucket = bucket
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,  # set for MinIO / other S3-compatible stores
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+            config=Config(signature_version="s3v4"),
+        )
+
+    async def save(self, file: UploadFile, key: str, max_bytes: int | None = None) -> StoredFile:
+        await file.seek(0)
+        reader = _HashingReader(file.file, max_bytes)
+        # boto3 streams the body as a multipart upload; run it off the event loop
+        await run_in_threadpool(self.client.upload_fileobj, reader, self.bucket, key)
+        return StoredFile(key=key, size=reader.size, sha256=reader.digest.hexdigest())
+
+    def open(self, key: str) -> BinaryIO:
+        return self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError:
+            return False
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def presigned_post(self, key: str, max_bytes: int, content_type: str | None = None) -> dict:
+        """Presigned POST policy; unlike a presigned PUT it can cap the object size."""
+        fields, conditions = {}, [["content-length-range", 1, max_bytes]]
+        if content_type:
+            fields["Content-Type"] = content_type
+            conditions.append({"Content-Type": content_type})
+        return self.client.generate_presigned_post(
+            self.bucket, key, Fields=fields, Conditions=conditions, ExpiresIn=PRESIGNED_URL_EXPIRY
+        )
+
+    # -- resumable uploads: native S3 multipart (part numbers are index + 1) --
+    def create_multipart(self, key: str) -> str:
+        return self.client.create_multipart_upload(Bucket=self.bucket, Key=key)["UploadId"]
+
+    async def write_part(
+        self, key: str, upload_token: str, index: int, stream: AsyncIterator[bytes], max_bytes: int
+    ) -> int:
+        # upload_part needs a sized body; a part is at most max_bytes so buffering is bounded
+        body = bytearray()
+        async for chunk in stream:
+            body.extend(chunk)
+            if len(body) > max_bytes:
+                raise _too_large(max_bytes)
+        await run_in_threadpool(
+            self.client.upload_part,
+            Bucket=self.bucket, Key=key, UploadId=upload_token, PartNumber=index + 1, Body=bytes(body),
+        )
+        return len(body)
+
+    def list_parts(self, key: str, upload_token: str) -> dict[int, int]:
+        return {p["PartNumber"] - 1: p["Size"] for p in self._parts(key, upload_token)}
+
+    def _parts(self, key: str, upload_token: str) -> list[dict]:
+        paginator = self.client.get_paginator("list_parts")
+        parts = []
+        for page in paginator.paginate(Bucket=self.bucket, Key=key, UploadId=upload_token):
+            parts.extend(page.get("Parts", []))
+        return parts
+
+    def complete_multipart(self, key: str, upload_token: str, total_parts: int) -> StoredFile:
+        parts = sorted(self._parts(key, upload_token), key=lambda p: p["PartNumber"])
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=upload_token,
+            MultipartUpload={"Parts": [{"PartNumber": p["PartNumber"], "ETag": p["ETag"]} for p in parts]},
+        )
+        return StoredFile(key=key, size=sum(p["Size"] for p in parts))
+
+    def abort_multipart(self, key: str, upload_token: str):
+        self.client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_token)
+
+    def expire_parts(self, max_age: float) -> int:
+        # abandoned multipart uploads are aborted per row; use a bucket lifecycle rule
+        # (AbortIncompleteMultipartUpload) for ones the database no longer knows about
+        return 0
+
+
+_backend = None
+
+
+def get_storage():
+    global _backend
+    if _backend is None:
+        _backend = S3Storage() if STORAGE_BACKEND == "s3" else LocalStorage()
+    return _backend
+
+
+async def save_upload_file(
+    file: UploadFile,
+    subdir: str | None = None,
+    max_bytes: int | None = None,
+) -> StoredFile:
+    return await get_storage().save(file, build_key(file.filename, subdir), max_bytes)
@@ -0,0 +1,91 @@
+import json
+from celery import states
+from fastapi.concurrency import run_in_threadpool
+from core.cache import TTLCache
+from core.config import CELERY_RESULT_BACKEND, TASK_STATUS_CACHE_TTL, TASK_STATUS_CACHE_MAX_SIZE
+from services.celery_app import celery
+
+TERMINAL_STATES = states.READY_STATES
+
+# finished tasks never change state, so their metas can be served from memory
+_terminal = TTLCache(maxsize=TASK_STATUS_CACHE_MAX_SIZE, ttl=TASK_STATUS_CACHE_TTL)
+_redis = None
+
+
+def _uses_redis_backend() -> bool:
+    return CELERY_RESULT_BACKEND.startswith(("redis://", "rediss://", "unix://"))
+
+
+def _get_redis():
+    global _redis
+    if _redis is None:
+        import redis.asyncio as aioredis
+        _redis = aioredis.from_url(CELERY_RESULT_BACKEND)
+    return _redis
+
+
+def _meta_from_raw(raw) -> dict:
+    if raw is None:
+        return {"state": "PENDING", "result": None}
+    meta = celery.backend.decode_result(raw)
+    state = meta["status"]
+    result = meta.get("result")
+    if state in states.EXCEPTION_STATES:
+        result = str(celery.backend.exception_to_python(result))
+    return {"state": state, "result": result}
+
+
+def _meta_from_async_result(task_id: str) -> dict:
+    res = celery.AsyncResult(task_id)
+    return {"state": res.state, "result": res.result if res.ready() else None}
+
+
+async def _fetch(task_ids: list[str]) -> dict[str, dict]:
+    if _uses_redis_backend():
+        # one MGET round-trip for the whole batch
+        keys = [celery.backend.get_key_for_task(t) for t in task_ids]
+        raws = await _get_redis().mget(keys)
+        return {t: _meta_from_raw(raw) for t, raw in zip(task_ids, raws)}
+    return {t: await run_in_threadpool(_meta_from_async_result, t) for t in task_ids}
+
+
+def _shape_result(result, include_result: bool, max_result_bytes: int | None):
+    if not include_result:
+        return None
+    if max_result_bytes is None:
+        return result
+    encoded = json.dumps(result, default=str)
+    if len(encoded) <= max_result_bytes:
+        return result
+    return {"truncated": True, "size": len(encoded), "preview": encoded[:max_result_bytes]}
+
+
+async def get_statuses(
+    task_ids: list[str],
+    include_result: bool = True,
+    max_result_bytes: int | None = None,
+) -> list[dict]:
+    metas = {}
+    missing = []
+    for task_id in task_ids:
+        cached = _terminal.get(task_id)
+        if cached is not None:
+            metas[task_id] = cached
+        else:
+            missing.append(task_id)
+
+    if missing:
+        fetched = await _fetch(missing)
+        for task_id, meta in fetched.items():
+            if meta["state"] in TERMINAL_STATES:
+                _terminal.set(task_id, meta)
+        metas.update(fetched)
+
+    return [
+        {
+            "id": task_id,
+            "state": metas[task_id]["state"],
+            "result": _shape_result(metas[task_id]["result"], include_result, max_result_bytes),
+        }
+        for task_id in task_ids
+    ]
@@ -1,22 +1,134 @@
-from services.celery_app import celery
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from celery import chain
+from celery.exceptions import Reject
+from celery.signals import task_postrun
 from sqlalchemy.orm import Session
 from database.connection import SessionLocal
-from database.models import Interview, InterviewQuestions
+from database.models import Interview, Resumes, AnswerUpload
 from services.celery_app import celery
-from fastapi import APIRouter
-from services.question_generator import generate_resume_based_questions
+from fastapi import APIRouter, HTTPException, Query
+from core.cache import get_sync_redis
+from core.config import TASK_STATUS_MAX_BATCH, CHUNKED_UPLOAD_EXPIRY, CELERY_MAX_DELIVERIES
+from schemas.response import TaskStatusRequest
+from services.question_generator import get_or_generate_questions
+from services.question_store import build_question_rows, bulk_insert_questions_sync
+from services import interview_cache
+from services.evaluation_dispatcher import dispatch_pending
+from services.resume_service import extract_text
+from services.storage import get_storage
+from services import events
+from services.task_status import get_statuses
+
+logger = logging.getLogger(__name__)
 
+# delivery counts per task id, and the messages given up on
+DELIVERIES_KEY = "celery:deliveries:{}"
+DELIVERIES_TTL = 24 * 3600
+DEAD_LETTER_KEY = "celery:dead-letter"
+DEAD_LETTER_MAX = 1000
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
+@router.post("/status")
+async def task_statuses(payload: TaskStatusRequest):
+    """Many task states in one pipelined backend lookup."""
+    if len(payload.ids) > TASK_STATUS_MAX_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {TASK_STATUS_MAX_BATCH} ids per request")
+    return await get_statuses(
+        list(dict.fromkeys(payload.ids)),
+        include_result=payload.include_result,
+        max_result_bytes=payload.max_result_bytes,
+    )
+
 @router.get("/{task_id}")
-def task_status(task_id: str):
-    res = celery.AsyncResult(task_id)
-    return {
-        "id": task_id,
-        "state": res.state,
-        "result": res.result if res.ready() else None,
-    }
+async def task_status(
+    task_id: str,
+    include_result: bool = True,
+    max_result_bytes: int | None = Query(None, gt=0),
+):
+    [status] = await get_statuses([task_id], include_result=include_result, max_result_bytes=max_result_bytes)
+    return status
+
+@task_postrun.connect
+def publish_task_completion(task_id=None, task=None, retval=None, state=None, **kwargs):
+    """Push every finished task to SSE subscribers of its id."""
+    events.publish(events.task_channel(task_id), {
+        "type": "task.completed",
+        "task_id": task_id,
+        "task": task.name if task else None,
+        "state": state,
+        "result": retval if state == "SUCCESS" else str(retval),
+    })
+
+def process_resume(resume_id: int, interview_id: int, sha256: str | None = None):
+    """
+    Queue parse (pdf queue) -> generate (ml queue) -> persist (db queue);
+    the chain's id tracks the last step.
+    """
+    return chain(
+        parse_resume.si(resume_id, interview_id, sha256),
+        generate_questions_for_interview.si(interview_id),
+        save_generated_questions.s(),
+    ).apply_async()
+
+def _guard_redelivery(task, **details):
+    """
+    Count this delivery of an acks_late task. A message whose worker died
+    CELERY_MAX_DELIVERIES times is parked on the dead-letter list and
+    rejected without requeue, instead of taking down a worker forever.
+    """
+    key = DELIVERIES_KEY.format(task.request.id)
+    try:
+        with get_sync_redis().pipeline() as pipe:
+            pipe.incr(key)
+            pipe.expire(key, DELIVERIES_TTL)
+            deliveries, _ = pipe.execute()
+    except Exception:
+        logger.warning("delivery count failed for %s", task.request.id, exc_info=True)
+        return
+    if deliveries <= CELERY_MAX_DELIVERIES:
+        return
+
+    logger.error("%s[%s] dead-lettered after %s deliveries", task.name, task.request.id, deliveries - 1)
+    try:
+        with get_sync_redis().pipeline() as pipe:
+            pipe.lpush(DEAD_LETTER_KEY, json.dumps({
+                "task": task.name,
+                "task_id": task.request.id,
+                "deliveries": deliveries - 1,
+                "at": time.time(),
+                **details,
+            }))
+            pipe.ltrim(DEAD_LETTER_KEY, 0, DEAD_LETTER_MAX - 1)
+            pipe.execute()
+    except Exception:
+        logger.warning("dead-letter write failed for %s", task.request.id, exc_info=True)
+    raise Reject(f"gave up after {deliveries - 1} deliveries", requeue=False)
+
+@celery.task(bind=True, name="services.tasks.parse_resume")
+def parse_resume(self, resume_id: int, interview_id: int, sha256: str | None = None):
+    _guard_redelivery(self, resume_id=resume_id, interview_id=interview_id)
+    db: Session = SessionLocal()
+    try:
+        resume = db.query(Resumes).filter(Resumes.id == resume_id).first()
+        if not resume:
+            raise ValueError(f"Resume {resume_id} not found")
+
+        with get_storage().open(resume.file_path) as fh:
+            text = extract_text(fh, resume.file_path, sha256=sha256)
+
+        resume.parsed_text = text
+        # mirror into interview.resume_text for quick access
+        itv = db.query(Interview).filter(Interview.id == interview_id).first()
+        if itv:
+            itv.resume_text = text
+        db.commit()
+        return {"ok": True, "resume_id": resume_id, "chars": len(text)}
+    finally:
+        db.close()
 
 @celery.task(name="services.tasks.generate_questions_for_interview")
 def generate_questions_for_interview(interview_id: int):
@@ -25,22 +137,69 @@ def generate_questions_for_interview(interview_id: int):
         itv = db.query(Interview).filter(Interview.id == interview_id).first()
         if not itv or not itv.resume_text:
             return {"ok": False, "reason": "resume missing or interview not found"}
+        resume_text, job_description = itv.resume_text, itv.job_description
+    finally:
+        db.close()
 
-        qs = generate_resume_based_questions(itv.resume_text)
-        for q in qs:
-            db.add(InterviewQuestions(
-                interview_id=itv.id,
-                question_text=q.get("question_text"),
-                category=q.get("category", "resume"),
-                difficulty=q.get("difficulty", "medium"),
-                source="resume",
-                created_by=itv.created_by,
-            ))
+    qs = get_or_generate_questions(resume_text, job_description)
+    return {"ok": True, "interview_id": interview_id, "questions": qs}
+
+@celery.task(name="services.tasks.save_generated_questions")
+def save_generated_questions(generated: dict):
+    if not generated.get("ok"):
+        return generated
+
+    interview_id = generated["interview_id"]
+    db: Session = SessionLocal()
+    try:
+        itv = db.query(Interview).filter(Interview.id == interview_id).first()
+        if not itv:
+            return {"ok": False, "reason": "interview not found"}
+
+        qs = generated["questions"]
+        bulk_insert_questions_sync(db, build_question_rows(
+            qs,
+            interview_id=itv.id,
+            created_by=itv.created_by,
+            source="resume",
+            category="resume",
+        ))
+        interview_cache.questions_changed_sync(db, itv.id)
         db.commit()
-        return {"ok": True, "count": len(qs)}
+        interview_cache.forget_sync(itv.id)
+        return {"ok": True, "interview_id": interview_id, "count": len(qs)}
     finally:
         db.close()
 
+@celery.task(name="services.tasks.dispatch_evaluations")
+def dispatch_evaluations():
+    return dispatch_pending()
 
-
+@celery.task(name="services.tasks.expire_chunked_uploads")
+def expire_chunked_uploads():
+    """Abort uploads left pending past CHUNKED_UPLOAD_EXPIRY and sweep orphaned staging dirs."""
+    backend = get_storage()
+    cutoff = datetime.utcnow() - timedelta(seconds=CHUNKED_UPLOAD_EXPIRY)
+    db: Session = SessionLocal()
+    expired = 0
+    try:
+        stale = db.query(AnswerUpload).filter(
+            AnswerUpload.status == "pending", AnswerUpload.created_at < cutoff
+        ).all()
+        for upload in stale:
+            # same compare-and-set as the routes, so a racing complete wins cleanly
+            claimed = db.query(AnswerUpload).filter(
+                AnswerUpload.id == upload.id, AnswerUpload.status == "pending"
+            ).update({"status": "expired"}, synchronize_session=False)
+            db.commit()
+            if not claimed:
+                continue
+            try:
+                backend.abort_multipart(upload.object_key, upload.upload_token)
+            except Exception:
+                logger.warning("abort of upload %s failed", upload.id, exc_info=True)
+            expired += 1
+    finally:
+        db.close()
+    return {"expired": expired, "orphaned_dirs": backend.expire_parts(CHUNKED_UPLOAD_EXPIRY)}
 
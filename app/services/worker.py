@@ -0,0 +1,34 @@
+"""
+Start a Celery worker tuned for one workload:
+
+    python -m services.worker pdf
+    python -m services.worker ml
+    python -m services.worker db
+
+Extra arguments are passed through to `celery worker` (e.g. --loglevel=info).
+"""
+import sys
+from services.celery_app import celery, WORKER_PROFILES
+
+
+def worker_argv(profile: str, extra: list[str] | None = None) -> list[str]:
+    p = WORKER_PROFILES[profile]
+    return [
+        "worker",
+        "--queues", ",".join(p["queues"]),
+        "--pool", p["pool"],
+        "--concurrency", str(p["concurrency"]),
+        "--prefetch-multiplier", str(p["prefetch"]),
+        "--hostname", f"{profile}@%h",
+        *(extra or []),
+    ]
+
+
+def main(argv: list[str]):
+    if not argv or argv[0] not in WORKER_PROFILES:
+        sys.exit(f"usage: python -m services.worker {{{'|'.join(WORKER_PROFILES)}}} [celery args]")
+    celery.worker_main(worker_argv(argv[0], argv[1:]))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,75 @@
+import os
+import tempfile
+
+# settings are read at import time, so point the app at a throwaway database first
+_tmp = tempfile.mkdtemp(prefix="fastapi-ip-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+os.environ.setdefault("SECRET_KEY", "test-secret-key-0123456789abcdef0123")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("UPLOAD_DIR", f"{_tmp}/uploads")
+os.environ.setdefault("CHUNKED_UPLOAD_MIN_CHUNK_SIZE", "1")
+# every request in the suite runs under its query budget; an N+1 fails the test
+os.environ.setdefault("SQL_QUERY_BUDGET_MODE", "raise")
+
+import pytest
+from sqlalchemy import text
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session")
+def app():
+    from main import app
+    return app
+
+
+@pytest.fixture()
+def client(app):
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(autouse=True)
+def _clean_tables(app):
+    yield
+    from database.connection import Base, engine
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+    from core import auth_cache
+    from services import interview_cache, session_report
+    auth_cache._local.clear()
+    interview_cache._local.clear()
+    session_report._local.clear()
+    session_report._generations.clear()
+
+
+def auth_headers(client, username: str, role: str) -> dict:
+    client.post("/register", json={
+        "username": username, "password": "pw", "email": f"{username}@example.com", "userrole": role,
+    })
+    r = client.post("/login", data={"username": username, "password": "pw"})
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+@pytest.fixture()
+def recruiter(client):
+    return auth_headers(client, "recruiter", "recruiter")
+
+
+@pytest.fixture()
+def candidate(client):
+    return auth_headers(client, "candidate", "candidate")
+
+
+@pytest.fixture()
+def interview(client, recruiter):
+    r = client.post("/interviews/", headers=recruiter, json={
+        "title": "Backend", "job_description": "Python", "created_by": 0,
+    })
+    assert r.status_code == 200, r.text
+    interview = r.json()
+    for i in range(3):
+        client.post(f"/interviews/{interview['id']}/questions", headers=recruiter, json={
+            "question_text": f"Question {i}", "interview_id": interview["id"],
+        })
+    return interview
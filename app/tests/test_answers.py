@@ -0,0 +1,121 @@
+def _start(client, candidate, interview):
+    r = client.post(f"/sessions/start/{interview['id']}", headers=candidate)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_video_key_rejected_on_local_storage(client, candidate, interview):
+    started = _start(client, candidate, interview)
+    sid, qid = started["session_id"], started["questions"][0]["id"]
+    r = client.post("/answers/", headers=candidate, data={
+        "session_id": sid, "question_id": qid, "video_key": f"answers/{sid}/../../../etc/passwd",
+    })
+    assert r.status_code == 400
+
+
+class _ClientKeyStorage:
+    accepts_client_keys = True
+
+    def exists(self, key):
+        return True
+
+
+def test_video_key_must_be_normalised_and_in_session(client, candidate, interview, monkeypatch):
+    from services import storage
+    monkeypatch.setattr(storage, "_backend", _ClientKeyStorage())
+    started = _start(client, candidate, interview)
+    sid, qid = started["session_id"], started["questions"][0]["id"]
+
+    for bad in (f"answers/{sid}/../../../etc/x", f"answers/{sid}//x", f"answers/{sid + 1}/x"):
+        r = client.post("/answers/", headers=candidate, data={"session_id": sid, "question_id": qid, "video_key": bad})
+        assert r.status_code == 400, bad
+
+    r = client.post("/answers/", headers=candidate, data={
+        "session_id": sid, "question_id": qid, "video_key": f"answers/{sid}/clip.mp4",
+    })
+    assert r.status_code == 200, r.text
+
+
+def test_concurrent_completes_insert_one_answer(app, client, candidate, interview, monkeypatch):
+    import asyncio
+    import httpx
+    from database.connection import SessionLocal
+    from database.models import Answers
+    import threading
+    from routes import answers as answer_routes
+    from services import storage
+
+    started = _start(client, candidate, interview)
+    sid, qid = started["session_id"], started["questions"][0]["id"]
+    r = client.post("/answers/uploads", headers=candidate, json={
+        "session_id": sid, "question_id": qid, "filename": "clip.mp4", "total_size": 10, "chunk_size": 5,
+    })
+    upload_id = r.json()["upload_id"]
+    for i in range(2):
+        assert client.put(f"/answers/uploads/{upload_id}/chunks/{i}", headers=candidate, content=b"x" * 5).status_code == 200
+
+    # every request reads the upload as pending before any of them claims it
+    get_own_upload = answer_routes._get_own_upload
+
+    async def get_upload_then_wait(*args):
+        upload = await get_own_upload(*args)
+        await barrier.wait()
+        return upload
+
+    monkeypatch.setattr(answer_routes, "_get_own_upload", get_upload_then_wait)
+
+    # and anyone reading the parts after the first reader only gets to once
+    # the parts have been assembled (and the staging area removed)
+    backend = storage.get_storage()
+    list_parts, complete_multipart = backend.list_parts, backend.complete_multipart
+    assembled, readers = threading.Event(), []
+
+    def gated_list_parts(*args):
+        readers.append(1)
+        if len(readers) > 1:
+            assembled.wait(timeout=5)
+        return list_parts(*args)
+
+    def signalling_complete(*args):
+        try:
+            return complete_multipart(*args)
+        finally:
+            assembled.set()
+
+    monkeypatch.setattr(backend, "list_parts", gated_list_parts)
+    monkeypatch.setattr(backend, "complete_multipart", signalling_complete)
+
+    async def race():
+        nonlocal barrier
+        barrier = asyncio.Barrier(4)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            return await asyncio.gather(*(
+                ac.post(f"/answers/uploads/{upload_id}/complete", headers=candidate) for _ in range(4)
+            ))
+
+    barrier = None
+    responses = asyncio.run(race())
+    monkeypatch.undo()
+    assert {r.status_code for r in responses} <= {200, 409}
+    with SessionLocal() as db:
+        assert db.query(Answers).filter(Answers.session_id == sid).count() == 1
+    assert client.get(f"/answers/uploads/{upload_id}", headers=candidate).json()["status"] == "completed"
+
+
+def test_complete_with_missing_chunks_leaves_upload_pending(client, candidate, interview):
+    started = _start(client, candidate, interview)
+    r = client.post("/answers/uploads", headers=candidate, json={
+        "session_id": started["session_id"], "question_id": started["questions"][0]["id"],
+        "filename": "clip.mp4", "total_size": 10, "chunk_size": 5,
+    })
+    upload_id = r.json()["upload_id"]
+    client.put(f"/answers/uploads/{upload_id}/chunks/0", headers=candidate, content=b"x" * 5)
+
+    r = client.post(f"/answers/uploads/{upload_id}/complete", headers=candidate)
+    assert r.status_code == 400
+    assert r.json()["detail"]["missing"] == [1]
+    assert client.get(f"/answers/uploads/{upload_id}", headers=candidate).json()["status"] == "pending"
+
+    client.put(f"/answers/uploads/{upload_id}/chunks/1", headers=candidate, content=b"x" * 5)
+    assert client.post(f"/answers/uploads/{upload_id}/complete", headers=candidate).status_code == 200
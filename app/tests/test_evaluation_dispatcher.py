@@ -0,0 +1,108 @@
+import asyncio
+import json
+import fakeredis
+import pytest
+from fastapi import HTTPException
+from services import evaluation_dispatcher as dispatcher
+
+
+class _MLClient:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.batches = []
+
+    async def evaluate_sessions(self, sessions, webhook_url):
+        self.batches.append([s["session_id"] for s in sessions])
+        if self.fail:
+            raise RuntimeError("ML down")
+        return {"accepted": len(sessions)}
+
+    async def aclose(self):
+        pass
+
+    def metrics(self):
+        return {"requests_total": len(self.batches)}
+
+
+@pytest.fixture()
+def redis(monkeypatch):
+    server = fakeredis.FakeServer()
+    sync = fakeredis.FakeRedis(server=server, decode_responses=True)
+    monkeypatch.setattr(dispatcher, "get_sync_redis", lambda: sync)
+    monkeypatch.setattr(dispatcher, "get_async_redis",
+                        lambda: fakeredis.aioredis.FakeRedis(server=server, decode_responses=True))
+    monkeypatch.setattr(dispatcher, "ML_SERVICE_URL", "http://ml")
+    monkeypatch.setattr(dispatcher, "ML_WEBHOOK_URL", "http://api/evaluation/webhook")
+    monkeypatch.setattr(dispatcher.celery, "send_task", lambda *a, **kw: None)
+    return sync
+
+
+@pytest.fixture()
+def ml(monkeypatch):
+    client = _MLClient()
+    loop = asyncio.new_event_loop()
+    monkeypatch.setattr(dispatcher, "_worker_ml_client", lambda: (client, loop))
+    yield client
+    loop.close()
+
+
+def test_enqueue_rejects_when_full_without_pushing(redis, monkeypatch):
+    monkeypatch.setattr(dispatcher, "EVAL_MAX_PENDING", 3)
+    asyncio.run(dispatcher.enqueue([1, 2]))
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(dispatcher.enqueue([3, 4]))
+    assert exc.value.status_code == 503
+    assert redis.llen(dispatcher.PENDING_KEY) == 2
+
+
+def test_dispatch_acknowledges_after_ml_accepts(redis, ml):
+    job = asyncio.run(dispatcher.enqueue([1, 2, 3]))
+    result = dispatcher.dispatch_pending()
+
+    assert result == {"dispatched": 3, "pending": 0}
+    assert ml.batches == [[1, 2, 3]]
+    assert redis.llen(dispatcher.PROCESSING_KEY) == 0
+    assert asyncio.run(dispatcher.job_status(job["job_id"]))["state"] == "dispatched"
+    assert not redis.exists(dispatcher.LOCK_KEY)
+
+
+def test_failed_batch_goes_back_to_pending(redis, ml):
+    ml.fail = True
+    asyncio.run(dispatcher.enqueue([1, 2]))
+    dispatcher.dispatch_pending()
+
+    pending = [json.loads(i) for i in redis.lrange(dispatcher.PENDING_KEY, 0, -1)]
+    assert [(i["session_id"], i["attempt"]) for i in pending] == [(1, 1), (2, 1)]
+    assert redis.llen(dispatcher.PROCESSING_KEY) == 0
+
+
+def test_batch_left_by_a_crashed_dispatcher_is_redelivered(redis, ml):
+    asyncio.run(dispatcher.enqueue([1, 2, 3]))
+    dispatcher._claim_batch(redis, 2)  # claimed, then the worker died
+
+    dispatcher.dispatch_pending()
+    assert ml.batches == [[1, 2, 3]]
+    assert redis.llen(dispatcher.PROCESSING_KEY) == 0
+
+
+def test_lock_is_only_released_by_its_holder(redis, ml):
+    redis.set(dispatcher.LOCK_KEY, "someone-else")
+    assert dispatcher.dispatch_pending()["reason"] == "locked"
+    assert redis.get(dispatcher.LOCK_KEY) == "someone-else"
+
+    redis.eval(dispatcher.RELEASE_LOCK_SCRIPT, 1, dispatcher.LOCK_KEY, "not-the-token")
+    assert redis.get(dispatcher.LOCK_KEY) == "someone-else"
+
+
+def test_dispatcher_publishes_client_metrics(redis, ml):
+    asyncio.run(dispatcher.enqueue([1]))
+    dispatcher.dispatch_pending()
+    workers = asyncio.run(dispatcher.worker_metrics())
+    assert [m["requests_total"] for m in workers.values()] == [1]
+
+
+def test_dispatch_stops_at_its_own_time_limit(redis, ml):
+    asyncio.run(dispatcher.enqueue([1, 2]))
+    assert dispatcher.dispatch_pending(time_limit=0)["dispatched"] == 0
+    assert ml.batches == []
+    assert redis.llen(dispatcher.PENDING_KEY) == 2
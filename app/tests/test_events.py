@@ -0,0 +1,76 @@
+import asyncio
+from contextlib import asynccontextmanager
+import fakeredis
+from starlette.requests import Request
+from database.connection import async_engine
+from services import events
+
+
+def test_stream_releases_db_connections_before_streaming(client, candidate, interview, monkeypatch):
+    r = client.post(f"/sessions/start/{interview['id']}", headers=candidate)
+    assert r.status_code == 200, r.text
+    session_id = r.json()["session_id"]
+
+    checked_out = []
+
+    @asynccontextmanager
+    async def subscribe(channels):
+        checked_out.append(async_engine.pool.checkedout())
+        queue = events.asyncio.Queue()
+        await queue.put('{"type": "evaluation.completed", "session_id": %d}' % session_id)
+        yield queue
+
+    polls = []
+
+    async def is_disconnected(self):
+        polls.append(1)
+        return len(polls) > 1  # one event, then the client goes away
+
+    monkeypatch.setattr(events.hub, "subscribe", subscribe)
+    monkeypatch.setattr(Request, "is_disconnected", is_disconnected)
+
+    r = client.get(f"/events/stream?session_ids={session_id}", headers=candidate)
+    assert r.status_code == 200
+    assert r.text.startswith("event: evaluation.completed")
+    assert checked_out == [0]
+
+
+def test_stream_rejects_sessions_owned_by_someone_else(client, candidate, recruiter, interview):
+    from tests.conftest import auth_headers
+
+    other = auth_headers(client, "other-candidate", "candidate")
+    session_id = client.post(f"/sessions/start/{interview['id']}", headers=other).json()["session_id"]
+    r = client.get(f"/events/stream?session_ids={session_id}", headers=candidate)
+    assert r.status_code == 403
+
+
+def test_subscribe_returns_after_redis_confirms(monkeypatch):
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    pubsub = redis.pubsub
+
+    def slow_pubsub():
+        ps = pubsub()
+        psubscribe = ps.psubscribe
+
+        async def delayed(*patterns):
+            await asyncio.sleep(0.05)
+            return await psubscribe(*patterns)
+
+        ps.psubscribe = delayed
+        return ps
+
+    monkeypatch.setattr(redis, "pubsub", slow_pubsub)
+    monkeypatch.setattr(events, "get_async_redis", lambda: redis)
+
+    async def run():
+        hub = events.EventHub()
+        channel = events.session_channel(1)
+        try:
+            async with hub.subscribe([channel]) as queue:
+                # published straight after subscribe(), where the replay would run
+                await redis.publish(channel, '{"type": "evaluation.completed"}')
+                return await asyncio.wait_for(queue.get(), 1)
+        finally:
+            await hub.close()
+
+    assert asyncio.run(run()) == '{"type": "evaluation.completed"}'
@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import event
+from core import auth_cache
+from database.connection import Base, async_engine, engine
+from services import interview_cache
+
+TABLES = [t.name for t in Base.metadata.sorted_tables]
+
+
+def _route_plan(client, headers, url) -> str:
+    """EXPLAIN QUERY PLAN of every SELECT the route actually emits, cold caches."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and not executemany:
+            statements.append((statement, tuple(parameters)))
+
+    auth_cache._local.clear()
+    interview_cache._local.clear()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        r = client.get(url, headers=headers)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+    assert r.status_code == 200, r.text
+
+    with engine.connect() as conn:
+        return "\n".join(
+            row[-1]
+            for sql, params in statements
+            for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params).all()
+        )
+
+
+@pytest.mark.parametrize("path, indexes", [
+    # the auth lookup (get_current_user on a cache miss) runs on every one of these
+    ("/interviews/{id}", ["ix_users_username"]),
+    ("/interviews/{id}/questions", ["ix_interview_questions_interview_id"]),
+    ("/interviews/{id}/results", [
+        "ix_interview_session_interview_id", "ix_answers_session_id", "ix_performance_review_session_id",
+    ]),
+    ("/interviews/{id}/export/answers", ["ix_interview_questions_interview_id", "ix_answers_question_id"]),
+    ("/interviews/{id}/export/reviews", ["ix_interview_session_interview_id", "ix_performance_review_session_id"]),
+])
+def test_route_queries_use_indexes(client, recruiter, candidate, interview, path, indexes):
+    client.post(f"/sessions/start/{interview['id']}", headers=candidate)
+
+    plan = _route_plan(client, recruiter, path.format(id=interview["id"]))
+    for line in plan.splitlines():
+        assert not any(line == f"SCAN {t}" or line.startswith(f"SCAN {t} ") for t in TABLES), plan
+    for index in indexes:
+        assert index in plan, plan
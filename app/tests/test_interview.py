@@ -0,0 +1,103 @@
+import json
+import os
+import pytest
+from sqlalchemy import event
+from core import auth_cache
+from database.connection import async_engine
+
+
+def test_empty_resume_is_not_left_in_storage(client, candidate, interview):
+    from core.config import UPLOAD_DIR
+
+    r = client.post(
+        f"/interviews/{interview['link_token']}/upload-resume",
+        headers=candidate,
+        files={"file": ("resume.pdf", b"", "application/pdf")},
+    )
+    assert r.status_code == 400
+    resumes = os.path.join(UPLOAD_DIR, "resumes")
+    assert not os.path.isdir(resumes) or not os.listdir(resumes)
+
+
+def test_results_include_sessions_without_answers(client, recruiter, candidate, interview):
+    answered = client.post(f"/sessions/start/{interview['id']}", headers=candidate).json()
+    client.post("/answers/", headers=candidate, data={
+        "session_id": answered["session_id"], "question_id": answered["questions"][0]["id"], "answer_text": "a",
+    })
+    idle = client.post(f"/sessions/start/{interview['id']}", headers=candidate).json()
+
+    r = client.get(f"/interviews/{interview['id']}/results", headers=recruiter)
+    assert r.status_code == 200, r.text
+    counts = {item["session_id"]: item["answer_count"] for item in r.json()["items"]}
+    assert counts == {answered["session_id"]: 1, idle["session_id"]: 0}
+    assert r.json()["summary"]["sessions"] == 2
+
+
+def test_reviews_export_covers_the_whole_cohort(client, recruiter, candidate, interview, monkeypatch):
+    from database.connection import async_engine
+    from services import exports
+
+    sessions = [client.post(f"/sessions/start/{interview['id']}", headers=candidate).json()["session_id"]
+                for _ in range(2)]
+
+    stream_rows, checked_out = exports.stream_rows, []
+
+    def recording_stream_rows(*args):
+        checked_out.append(async_engine.pool.checkedout())
+        return stream_rows(*args)
+
+    monkeypatch.setattr(exports, "stream_rows", recording_stream_rows)
+    r = client.get(f"/interviews/{interview['id']}/export/reviews?format=ndjson", headers=recruiter)
+    assert r.status_code == 200, r.text
+    assert [json.loads(line)["session_id"] for line in r.text.splitlines()] == sessions
+    assert checked_out == [0]  # the authorising session is closed before streaming
+
+
+@pytest.mark.parametrize("method, path, body", [
+    ("post", "/interviews/{id}/questions", {"question_text": "Extra"}),
+    ("get", "/interviews/{id}", None),
+])
+def test_auth_lookup_shares_the_route_session(client, recruiter, interview, method, path, body):
+    held, peak = [0], [0]
+
+    def checkout(*args):
+        held[0] += 1
+        peak[0] = max(peak[0], held[0])
+
+    def checkin(*args):
+        held[0] -= 1
+
+    auth_cache._local.clear()  # force get_current_user to hit the database
+    event.listen(async_engine.sync_engine, "checkout", checkout)
+    event.listen(async_engine.sync_engine, "checkin", checkin)
+    try:
+        url = path.format(id=interview["id"])
+        r = client.request(method, url, headers=recruiter, json=body and {**body, "interview_id": interview["id"]})
+    finally:
+        event.remove(async_engine.sync_engine, "checkout", checkout)
+        event.remove(async_engine.sync_engine, "checkin", checkin)
+    assert r.status_code == 200, r.text
+    assert peak[0] == 1
+
+
+def test_results_percentiles_and_cache_generation(client, recruiter, candidate, interview, monkeypatch):
+    from database.connection import engine
+    from database.models import PerformanceReview
+    from services import session_report
+
+    sessions = [client.post(f"/sessions/start/{interview['id']}", headers=candidate).json()["session_id"]
+                for _ in range(5)]
+    with engine.begin() as conn:
+        conn.execute(PerformanceReview.__table__.insert(), [
+            {"session_id": sid, "overall_score": score} for sid, score in zip(sessions, [40, 10, 30, 50])
+        ])  # the fifth session is not evaluated yet
+
+    url = f"/interviews/{interview['id']}/results"
+    summary = client.get(url, headers=recruiter).json()["summary"]
+    assert summary["score_percentiles"] == {"p25": 10, "p50": 30, "p75": 40, "p90": 40}
+
+    # an evicted generation must not bring back the page cached under it
+    session_report._generations.clear()
+    with engine.begin() as conn:
+        conn.execute(PerformanceReview.__table__.insert(), [{"session_id": sessions[4], "overall_score": 20}])
+    assert client.get(url, headers=recruiter).json()["summary"]["evaluated"] == 5
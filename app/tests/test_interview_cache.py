@@ -0,0 +1,43 @@
+import asyncio
+from services import interview_cache
+
+
+class _Pipeline:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def delete(self, *keys):
+        self.calls.append(("delete", keys))
+
+    def set(self, key, value, px=None):
+        self.calls.append(("set", key, px))
+
+    async def execute(self):
+        self.calls.append(("execute",))
+
+
+class _AsyncRedis:
+    def __init__(self):
+        self.calls = []
+
+    def pipeline(self):
+        return _Pipeline(self.calls)
+
+
+def test_forget_invalidates_through_async_redis_with_hold(monkeypatch):
+    redis = _AsyncRedis()
+    monkeypatch.setattr(interview_cache, "_use_redis", lambda: True)
+    monkeypatch.setattr(interview_cache, "REPLICA_ENABLED", True)
+    monkeypatch.setattr(interview_cache, "get_async_redis", lambda: redis)
+
+    def sync_redis():
+        raise AssertionError("forget() must not use the blocking client")
+
+    monkeypatch.setattr(interview_cache, "get_sync_redis", sync_redis)
+
+    asyncio.run(interview_cache.forget(7))
+
+    assert redis.calls[0] == ("delete", ("itv:7", "itv:7:snapshot"))
+    assert redis.calls[1][:2] == ("set", "itv:7:hold")
+    assert redis.calls[-1] == ("execute",)
+    assert interview_cache._local.get("itv:7:hold")
@@ -0,0 +1,48 @@
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+
+def _alembic(db_path, *args):
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{db_path}"}
+    subprocess.run(
+        [sys.executable, "-m", "alembic", *args],
+        cwd=APP_DIR, env=env, check=True, capture_output=True,
+    )
+
+
+def test_username_index_migration_renames_duplicates(tmp_path):
+    db_path = tmp_path / "migrate.db"
+    _alembic(db_path, "upgrade", "153bdc32d4a8")
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO users (id, username, email, userrole, password_hash) VALUES (?, ?, ?, 'candidate', 'x')",
+            [(1, "alice", "a1@example.com"), (2, "alice", "a2@example.com"), (3, "bob", "b@example.com")],
+        )
+
+    _alembic(db_path, "upgrade", "7c2e9a41d5f3")
+
+    with sqlite3.connect(db_path) as conn:
+        names = dict(conn.execute("SELECT id, username FROM users ORDER BY id").fetchall())
+    assert names == {1: "alice", 2: "alice__dup2", 3: "bob"}
+
+
+def test_session_interview_id_backfilled_from_answers(tmp_path):
+    db_path = tmp_path / "migrate.db"
+    _alembic(db_path, "upgrade", "f19a7c3d20b4")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("INSERT INTO users (id, username, email, userrole, password_hash) VALUES (1, 'r', 'r@example.com', 'recruiter', 'x')")
+        conn.execute("INSERT INTO interviews (id, title, job_description, created_by, link_token, version) VALUES (7, 't', 'jd', 1, 'tok', 1)")
+        conn.execute("INSERT INTO interview_questions (id, interview_id, question_text, created_by) VALUES (3, 7, 'q', 1)")
+        conn.executemany("INSERT INTO interview_session (id, user_id) VALUES (?, 1)", [(1,), (2,)])
+        conn.execute("INSERT INTO answers (id, question_id, session_id, answer_text) VALUES (1, 3, 1, 'a')")
+
+    _alembic(db_path, "upgrade", "head")
+
+    with sqlite3.connect(db_path) as conn:
+        sessions = dict(conn.execute("SELECT id, interview_id FROM interview_session ORDER BY id").fetchall())
+    assert sessions == {1: 7, 2: None}
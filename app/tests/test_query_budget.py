@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import select
+from database.models import InterviewQuestions
+from database.query_budget import QueryBudgetExceeded
+from routes import interview as interview_routes, sessions as session_routes
+
+
+def _add_questions(client, recruiter, interview, n):
+    for i in range(n):
+        client.post(f"/interviews/{interview['id']}/questions", headers=recruiter, json={
+            "question_text": f"Extra {i}", "interview_id": interview["id"],
+        })
+
+
+def test_interview_detail_stays_within_budget(client, recruiter, interview):
+    _add_questions(client, recruiter, interview, 10)
+    r = client.get(f"/interviews/{interview['id']}/detail", headers=recruiter)
+    assert r.status_code == 200, r.text
+    assert len(r.json()["questions"]) == 13
+    assert int(r.headers["x-sql-queries"]) <= 5
+
+
+def test_interview_detail_n_plus_one_fails(client, recruiter, interview, monkeypatch):
+    load = interview_routes.load_interview_with_questions
+
+    async def per_question_loader(db, interview_id):
+        # the regression: one query per question instead of one IN query
+        interview = await load(db, interview_id)
+        for q in interview.questions:
+            await db.scalar(select(InterviewQuestions).where(InterviewQuestions.id == q.id))
+        return interview
+
+    monkeypatch.setattr(interview_routes, "load_interview_with_questions", per_question_loader)
+    _add_questions(client, recruiter, interview, 10)
+    with pytest.raises(QueryBudgetExceeded):
+        client.get(f"/interviews/{interview['id']}/detail", headers=recruiter)
+
+
+def _answered_session(client, recruiter, candidate, interview, extra_questions):
+    _add_questions(client, recruiter, interview, extra_questions)
+    started = client.post(f"/sessions/start/{interview['id']}", headers=candidate).json()
+    for q in started["questions"]:
+        r = client.post("/answers/", headers=candidate, data={
+            "session_id": started["session_id"], "question_id": q["id"], "answer_text": "answer",
+        })
+        assert r.status_code == 200, r.text
+    return started["session_id"]
+
+
+def test_session_detail_stays_within_budget(client, recruiter, candidate, interview):
+    session_id = _answered_session(client, recruiter, candidate, interview, 5)
+    r = client.get(f"/sessions/{session_id}", headers=candidate)
+    assert r.status_code == 200, r.text
+    assert len(r.json()["answers"]) == 8
+    assert int(r.headers["x-sql-queries"]) <= 5
+
+
+def test_session_detail_n_plus_one_fails(client, recruiter, candidate, interview, monkeypatch):
+    load = session_routes.load_session_detail
+
+    async def per_answer_loader(db, session_id):
+        # the regression: each answer's question fetched on its own
+        sess = await load(db, session_id)
+        for a in sess.answers:
+            await db.scalar(select(InterviewQuestions).where(InterviewQuestions.id == a.question_id))
+        return sess
+
+    monkeypatch.setattr(session_routes, "load_session_detail", per_answer_loader)
+    session_id = _answered_session(client, recruiter, candidate, interview, 5)
+    with pytest.raises(QueryBudgetExceeded):
+        client.get(f"/sessions/{session_id}", headers=candidate)
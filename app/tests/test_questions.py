@@ -0,0 +1,30 @@
+from sqlalchemy import event
+from database.connection import async_engine
+from routes import question as question_routes
+
+
+def test_bulk_import_returns_questions_in_payload_order(client, recruiter, interview):
+    inserts = []
+
+    def count(conn, cursor, statement, *args):
+        if statement.startswith("INSERT INTO interview_questions"):
+            inserts.append(statement)
+
+    payload = [{"question_text": f"Imported {i}"} for i in range(25)]
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    try:
+        r = client.post(f"/interviews/{interview['id']}/questions/bulk", headers=recruiter, json=payload)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+    assert r.status_code == 200, r.text
+    assert [q["question_text"] for q in r.json()] == [q["question_text"] for q in payload]
+    assert len(inserts) == 1
+
+
+def test_bulk_import_rejects_oversized_body(client, recruiter, interview, monkeypatch):
+    monkeypatch.setattr(question_routes, "BULK_IMPORT_MAX_BYTES", 64)
+
+    payload = [{"question_text": "x" * 100}]
+    r = client.post(f"/interviews/{interview['id']}/questions/bulk", headers=recruiter, json=payload)
+    assert r.status_code == 413
+    assert "bytes" in r.json()["detail"]
@@ -0,0 +1,46 @@
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from benchmarks.resume_extraction import synthetic_pdf
+from services import resume_service
+
+
+class _StuckFuture(Future):
+    def result(self, timeout=None):
+        raise FutureTimeoutError()
+
+
+class _FakePool:
+    """Runs the first chunk inline; every later chunk never finishes."""
+
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fn, *args):
+        if self.futures:
+            f = _StuckFuture()
+        else:
+            f = Future()
+            f.set_result(fn(*args))
+        self.futures.append(f)
+        return f
+
+
+def test_extract_pdf_text_reads_every_page(tmp_path):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(synthetic_pdf(3, lines_per_page=2))
+    text = resume_service.extract_pdf_text(str(path))
+    assert "#0" in text and "#5" in text
+
+
+def test_extract_pdf_text_truncates_when_a_chunk_times_out(tmp_path, monkeypatch):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(synthetic_pdf(4, lines_per_page=1))
+    pool = _FakePool()
+    monkeypatch.setattr(resume_service, "_get_pool", lambda: pool)
+    monkeypatch.setattr(resume_service, "RESUME_PARSE_WORKERS", 2)
+    monkeypatch.setattr(resume_service, "RESUME_PARSE_PARALLEL_MIN_PAGES", 1)
+
+    text = resume_service.extract_pdf_text(str(path))
+
+    assert "#0" in text and "#1" in text
+    assert "#2" not in text
+    assert pool.futures[1].cancelled()
@@ -0,0 +1,70 @@
+import pytest
+from fastapi import HTTPException
+from services.storage import LocalStorage, normalize_key
+
+
+@pytest.mark.parametrize("key", [
+    "answers/1/../../../etc/passwd",
+    "answers/1/./x",
+    "answers//x",
+    "/etc/passwd",
+    "answers/1/",
+    "answers\\\\1\\\\x",
+    "",
+])
+def test_normalize_key_rejects_traversal_and_empty_segments(key):
+    with pytest.raises(HTTPException) as exc:
+        normalize_key(key)
+    assert exc.value.status_code == 400
+
+
+def test_local_path_stays_under_root(tmp_path):
+    backend = LocalStorage(root=str(tmp_path))
+    assert backend.path("answers/1/a.mp4") == str(tmp_path / "answers" / "1" / "a.mp4")
+    with pytest.raises(HTTPException):
+        backend.path("answers/1/../../../etc/passwd")
+
+
+def test_local_path_rejects_symlink_escape(tmp_path):
+    root = tmp_path / "uploads"
+    root.mkdir()
+    (root / "answers").symlink_to(tmp_path)
+    with pytest.raises(HTTPException):
+        LocalStorage(root=str(root)).path("answers/secret")
+
+
+def test_write_part_uses_unique_temp_files(tmp_path):
+    import asyncio
+
+    backend = LocalStorage(root=str(tmp_path))
+    token = backend.create_multipart("answers/1/a.mp4")
+
+    async def body(byte):
+        for _ in range(50):
+            yield byte * 10
+            await asyncio.sleep(0)
+
+    async def run():
+        await asyncio.gather(*(
+            backend.write_part("answers/1/a.mp4", token, 0, body(b), max_bytes=500) for b in (b"a", b"b", b"c")
+        ))
+
+    asyncio.run(run())
+    data = (tmp_path / ".parts" / token / "0.part").read_bytes()
+    assert len(data) == 500 and len(set(data)) == 1  # one writer's bytes, not interleaved
+    assert backend.list_parts("answers/1/a.mp4", token) == {0: 500}
+    assert not [p for p in (tmp_path / ".parts" / token).iterdir() if p.suffix == ".tmp"]
+
+
+def test_expire_parts_removes_stale_dirs(tmp_path):
+    import os
+    import time
+
+    backend = LocalStorage(root=str(tmp_path))
+    old = backend.create_multipart("k")
+    fresh = backend.create_multipart("k")
+    past = time.time() - 7200
+    os.utime(tmp_path / ".parts" / old, (past, past))
+    assert backend.expire_parts(3600) == 1
+    assert not (tmp_path / ".parts" / old).exists()
+    assert (tmp_path / ".parts" / fresh).exists()
@@ -0,0 +1,42 @@
+import json
+import fakeredis
+import pytest
+from services import tasks
+from services.celery_app import _limits
+
+
+@pytest.fixture()
+def redis(monkeypatch):
+    r = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(tasks, "get_sync_redis", lambda: r)
+    monkeypatch.setattr(tasks.events, "publish", lambda *a, **kw: None)
+    return r
+
+
+def test_time_limits_only_on_pools_that_enforce_them():
+    assert _limits(120, None, "prefork")["time_limit"] == 120
+    assert "time_limit" not in _limits(120, None, "threads")
+    assert "soft_time_limit" not in _limits(120, None, "threads")
+
+
+def test_parse_resume_counts_deliveries(redis):
+    result = tasks.parse_resume.apply(args=(999, 1), task_id="first")
+    assert isinstance(result.result, ValueError)  # resume missing, parsed as usual
+    assert redis.get(tasks.DELIVERIES_KEY.format("first")) == "1"
+    assert not redis.llen(tasks.DEAD_LETTER_KEY)
+
+
+def test_parse_resume_dead_letters_a_poison_message(redis, monkeypatch):
+    redis.set(tasks.DELIVERIES_KEY.format("poison"), tasks.CELERY_MAX_DELIVERIES)
+
+    def extract(*args, **kwargs):
+        raise AssertionError("a dead-lettered resume must not be parsed again")
+
+    monkeypatch.setattr(tasks, "extract_text", extract)
+    result = tasks.parse_resume.apply(args=(5, 7), task_id="poison")
+
+    assert result.state == "REJECTED"
+    [entry] = [json.loads(e) for e in redis.lrange(tasks.DEAD_LETTER_KEY, 0, -1)]
+    assert entry["task_id"] == "poison"
+    assert entry["resume_id"] == 5 and entry["interview_id"] == 7
+    assert entry["deliveries"] == tasks.CELERY_MAX_DELIVERIES